@@ -0,0 +1,57 @@
+"""POS report registry and transaction row hashes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('pos_reports',
+    sa.Column('pos_report_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_id', sa.Integer(), nullable=True),
+    sa.Column('file_name', sa.String(length=255), nullable=True),
+    sa.Column('file_sha256', sa.String(length=64), nullable=True),
+    sa.Column('row_count', sa.Integer(), nullable=True),
+    sa.Column('uploaded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.vendor_id'], name=op.f('fk_pos_reports_vendor_id_vendors')),
+    sa.PrimaryKeyConstraint('pos_report_id', name=op.f('pk_pos_reports'))
+    )
+    op.create_index('uq_pos_reports_file_sha256', 'pos_reports', ['file_sha256'], unique=True)
+
+    # Register reports ingested before this table existed so the foreign key holds
+    op.execute("""
+        INSERT INTO pos_reports (pos_report_id, vendor_id, row_count)
+        SELECT pos_report_id, MIN(vendor_id), COUNT(*)
+        FROM transactions
+        WHERE pos_report_id IS NOT NULL
+        GROUP BY pos_report_id
+    """)
+    op.execute("""
+        SELECT setval(pg_get_serial_sequence('pos_reports', 'pos_report_id'),
+                      COALESCE((SELECT MAX(pos_report_id) FROM pos_reports), 0) + 1, false)
+    """)
+    op.create_foreign_key(op.f('fk_transactions_pos_report_id_pos_reports'), 'transactions', 'pos_reports', ['pos_report_id'], ['pos_report_id'])
+
+    op.add_column('transactions', sa.Column('row_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_transactions_pos_report_id', 'transactions', ['pos_report_id'])
+    op.create_index('ix_transactions_row_hash', 'transactions', ['row_hash'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_row_hash', table_name='transactions')
+    op.drop_index('ix_transactions_pos_report_id', table_name='transactions')
+    op.drop_column('transactions', 'row_hash')
+    op.drop_constraint(op.f('fk_transactions_pos_report_id_pos_reports'), 'transactions', type_='foreignkey')
+    op.drop_index('uq_pos_reports_file_sha256', table_name='pos_reports')
+    op.drop_table('pos_reports')
@@ -0,0 +1,40 @@
+"""Alias provenance, exact-key lookup indexes and per-report hit counts
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('customer_name_aliases', sa.Column('source', sa.String(length=50), server_default='manual', nullable=False))
+    op.add_column('customer_name_aliases', sa.Column('confidence', sa.Float(), nullable=True))
+    op.add_column('customer_name_aliases', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+    # Case-insensitive exact-key lookups
+    op.create_index('ix_customer_name_aliases_raw_name_lower', 'customer_name_aliases', [sa.text('lower(raw_name)')])
+    op.create_index('ix_accounts_account_name_lower', 'accounts', [sa.text('lower(account_name)')])
+
+    op.add_column('pos_reports', sa.Column('exact_hits', sa.Integer(), nullable=True))
+    op.add_column('pos_reports', sa.Column('fuzzy_hits', sa.Integer(), nullable=True))
+    op.add_column('pos_reports', sa.Column('unresolved_names', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pos_reports', 'unresolved_names')
+    op.drop_column('pos_reports', 'fuzzy_hits')
+    op.drop_column('pos_reports', 'exact_hits')
+    op.drop_index('ix_accounts_account_name_lower', table_name='accounts')
+    op.drop_index('ix_customer_name_aliases_raw_name_lower', table_name='customer_name_aliases')
+    op.drop_column('customer_name_aliases', 'created_at')
+    op.drop_column('customer_name_aliases', 'confidence')
+    op.drop_column('customer_name_aliases', 'source')
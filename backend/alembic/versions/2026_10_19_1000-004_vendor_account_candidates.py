@@ -0,0 +1,43 @@
+"""Per-vendor candidate account index for scoped fuzzy matching
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('vendor_account_candidates',
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_seen', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.vendor_id'], name=op.f('fk_vendor_account_candidates_vendor_id_vendors'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.account_id'], name=op.f('fk_vendor_account_candidates_account_id_accounts'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('vendor_id', 'account_id', name=op.f('pk_vendor_account_candidates'))
+    )
+
+    # Scoped alias search joins aliases by account
+    op.create_index('ix_customer_name_aliases_account_id', 'customer_name_aliases', ['account_id'])
+
+    op.execute("""
+        INSERT INTO vendor_account_candidates (vendor_id, account_id, transaction_count, last_seen)
+        SELECT vendor_id, account_id, COUNT(*), MAX(transaction_date)
+        FROM transactions
+        WHERE vendor_id IS NOT NULL AND account_id IS NOT NULL
+        GROUP BY vendor_id, account_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customer_name_aliases_account_id', table_name='customer_name_aliases')
+    op.drop_table('vendor_account_candidates')
@@ -0,0 +1,23 @@
+"""Per-report vector-index hit counts
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('pos_reports', sa.Column('vector_hits', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pos_reports', 'vector_hits')
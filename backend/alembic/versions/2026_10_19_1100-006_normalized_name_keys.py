@@ -0,0 +1,221 @@
+"""Canonical normalized_name keys on accounts and aliases
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+import hashlib
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+# The normalization rules and row hash below are frozen copies of the ones
+# this revision introduced (app.services.normalization and
+# app.services.ingestion), so the migration keeps producing the same keys
+# however the application code changes later.
+
+_STATES = (
+    "AL|AK|AZ|AR|CA|CO|CT|DE|DC|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|"
+    "NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY|PR|GU|VI"
+)
+
+_WORD_RULES = {
+    "united states of america": "us",
+    "united states": "us",
+    "usa": "us",
+    "the": "",
+    "dept": "department",
+    "dep": "department",
+    "cmd": "command",
+    "comd": "command",
+    "admin": "administration",
+    "corp": "corporation",
+    "incorporated": "inc",
+    "co": "company",
+    "ltd": "limited",
+    "intl": "international",
+    "natl": "national",
+    "univ": "university",
+    "eng": "engineering",
+    "engr": "engineering",
+    "comms": "communications",
+    "info": "information",
+    "med": "medical",
+    "govt": "government",
+    "gov": "government",
+    "assn": "association",
+    "assoc": "association",
+    "ctr": "center",
+    "centre": "center",
+    "hq": "headquarters",
+    "svc": "services",
+    "svcs": "services",
+    "sys": "systems",
+    "mgmt": "management",
+    "tech": "technology",
+    "technologies": "technology",
+}
+
+_STATE_CODES = "|".join(code for code in _STATES.split("|") if code.lower() not in _WORD_RULES)
+_CITY = r"[A-Z][\w.'’]*(?:\s+[A-Z][\w.'’]*){0,3}"
+_ZIP = r"\d{5}(?:-\d{4})?"
+
+_LOCATION = re.compile(
+    rf"(?:\s*[-–,]\s*(?:{_CITY},?\s+(?:{_STATE_CODES})(?:\s+{_ZIP})?|(?:{_STATE_CODES})\s+{_ZIP})"
+    rf"|\s*\((?:{_STATE_CODES}|\d+)\)|\s*#\s*\d+)+\s*$"
+)
+
+_RULES = [
+    (re.compile(r"['’`]"), ""),
+    (re.compile(r"\b(?:[a-z]\.\s?){2,}"), lambda match: match.group(0).replace(".", "").replace(" ", "") + " "),
+    (re.compile(r"&"), " and "),
+    (re.compile(r"[^\w\s]|_"), " "),
+]
+
+_WORD_RULE_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(key) for key in sorted(_WORD_RULES, key=len, reverse=True)) + r")\b"
+)
+
+_COMBINING_MARKS = re.compile(r"[\u0300-\u036f]")
+
+_WHITESPACE = re.compile(r"\s+")
+
+_BATCH_SIZE = 10000
+
+
+def _normalized_key(raw_name):
+    """Canonical name key, as normalize_name built it at this revision"""
+    value = unicodedata.normalize("NFKD", raw_name or "")
+    value = _LOCATION.sub("", _COMBINING_MARKS.sub("", value)).casefold()
+    for pattern, replacement in _RULES:
+        value = pattern.sub(replacement, value)
+    value = _WHITESPACE.sub(" ", _WORD_RULE_RE.sub(lambda match: _WORD_RULES[match.group(0)], value)).strip()
+    return value or _WHITESPACE.sub(" ", (raw_name or "").casefold()).strip()
+
+
+def _casefolded_key(raw_name):
+    """Name key as built before normalized_name existed"""
+    return re.sub(r"\s+", " ", raw_name or "").strip().casefold()
+
+
+def _backfill_normalized_names(bind):
+    for table_name, id_column, name_column in (
+        ("accounts", "account_id", "account_name"),
+        ("customer_name_aliases", "alias_id", "raw_name"),
+    ):
+        last_id = 0
+        while True:
+            rows = bind.execute(sa.text(f"""
+                SELECT {id_column} AS row_id, {name_column} AS name
+                FROM {table_name}
+                WHERE {id_column} > :last_id
+                ORDER BY {id_column}
+                LIMIT :batch_size
+            """), {"last_id": last_id, "batch_size": _BATCH_SIZE}).fetchall()
+            if not rows:
+                break
+            bind.execute(sa.text(f"""
+                UPDATE {table_name} t
+                SET normalized_name = v.normalized_name
+                FROM unnest(CAST(:ids AS integer[]), CAST(:keys AS varchar[])) AS v(row_id, normalized_name)
+                WHERE t.{id_column} = v.row_id
+            """), {
+                "ids": [row.row_id for row in rows],
+                "keys": [_normalized_key(row.name)[:255] for row in rows],
+            })
+            last_id = rows[-1].row_id
+
+
+def _rehash_transactions(bind, name_key):
+    """Rebuild row hashes report by report, numbering repeats in transaction_id order"""
+    report_ids = bind.execute(sa.text("""
+        SELECT DISTINCT pos_report_id
+        FROM transactions
+        WHERE row_hash IS NOT NULL AND pos_report_id IS NOT NULL
+        ORDER BY pos_report_id
+    """)).scalars().all()
+
+    for pos_report_id in report_ids:
+        rows = bind.execute(sa.text("""
+            SELECT transaction_id, vendor_id, transaction_date, product_sku, quantity,
+                   sale_amount, original_customer_name
+            FROM transactions
+            WHERE pos_report_id = :pos_report_id AND row_hash IS NOT NULL
+            ORDER BY transaction_id
+        """), {"pos_report_id": pos_report_id}).fetchall()
+
+        seen = {}
+        hashes = []
+        for row in rows:
+            content = "\x1f".join(
+                "" if value is None else str(value)
+                for value in (row.vendor_id, row.transaction_date, row.product_sku, row.quantity,
+                              row.sale_amount, name_key(row.original_customer_name))
+            )
+            row_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            occurrence = seen.get(row_hash, 0)
+            seen[row_hash] = occurrence + 1
+            if occurrence:
+                row_hash = hashlib.sha256(f"{row_hash}:{occurrence}".encode("utf-8")).hexdigest()
+            hashes.append(row_hash)
+
+        for start in range(0, len(rows), _BATCH_SIZE):
+            bind.execute(sa.text("""
+                UPDATE transactions t
+                SET row_hash = v.row_hash
+                FROM unnest(CAST(:ids AS integer[]), CAST(:hashes AS varchar[])) AS v(transaction_id, row_hash)
+                WHERE t.transaction_id = v.transaction_id
+                  AND t.row_hash IS DISTINCT FROM v.row_hash
+            """), {
+                "ids": [row.transaction_id for row in rows[start:start + _BATCH_SIZE]],
+                "hashes": hashes[start:start + _BATCH_SIZE],
+            })
+
+
+def upgrade() -> None:
+    op.add_column('accounts', sa.Column('normalized_name', sa.String(length=255), nullable=True))
+    op.add_column('customer_name_aliases', sa.Column('normalized_name', sa.String(length=255), nullable=True))
+
+    # Keys are computed by the rule table, not in SQL
+    _backfill_normalized_names(op.get_bind())
+
+    # Row hashes include the name key; rebuild them so re-uploads of earlier
+    # reports are still recognized as corrections
+    _rehash_transactions(op.get_bind(), _normalized_key)
+
+    op.create_index('ix_accounts_normalized_name', 'accounts', ['normalized_name'])
+    op.create_index('ix_customer_name_aliases_normalized_name', 'customer_name_aliases', ['normalized_name'])
+
+    # Trigram search compares normalized search terms with the stored keys
+    op.create_index('ix_accounts_normalized_name_trgm', 'accounts', ['normalized_name'], postgresql_using='gin', postgresql_ops={'normalized_name': 'gin_trgm_ops'})
+    op.create_index('ix_customer_name_aliases_normalized_name_trgm', 'customer_name_aliases', ['normalized_name'], postgresql_using='gin', postgresql_ops={'normalized_name': 'gin_trgm_ops'})
+
+    # Exact-key lookups no longer compare lower() of the raw names, and
+    # trigram search no longer reads the raw-name indexes
+    op.drop_index('ix_accounts_account_name_lower', table_name='accounts')
+    op.drop_index('ix_customer_name_aliases_raw_name_lower', table_name='customer_name_aliases')
+    op.drop_index('ix_accounts_account_name_trgm', table_name='accounts')
+    op.drop_index('ix_customer_name_aliases_raw_name_trgm', table_name='customer_name_aliases')
+
+
+def downgrade() -> None:
+    _rehash_transactions(op.get_bind(), _casefolded_key)
+    op.create_index('ix_accounts_account_name_trgm', 'accounts', ['account_name'], postgresql_using='gin', postgresql_ops={'account_name': 'gin_trgm_ops'})
+    op.create_index('ix_customer_name_aliases_raw_name_trgm', 'customer_name_aliases', ['raw_name'], postgresql_using='gin', postgresql_ops={'raw_name': 'gin_trgm_ops'})
+    op.create_index('ix_customer_name_aliases_raw_name_lower', 'customer_name_aliases', [sa.text('lower(raw_name)')])
+    op.create_index('ix_accounts_account_name_lower', 'accounts', [sa.text('lower(account_name)')])
+    op.drop_index('ix_customer_name_aliases_normalized_name_trgm', table_name='customer_name_aliases')
+    op.drop_index('ix_accounts_normalized_name_trgm', table_name='accounts')
+    op.drop_index('ix_customer_name_aliases_normalized_name', table_name='customer_name_aliases')
+    op.drop_index('ix_accounts_normalized_name', table_name='accounts')
+    op.drop_column('customer_name_aliases', 'normalized_name')
+    op.drop_column('accounts', 'normalized_name')
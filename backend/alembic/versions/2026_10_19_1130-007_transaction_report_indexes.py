@@ -0,0 +1,26 @@
+"""Indexes for account- and vendor-scoped report queries
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Account Team and Partner Team views filter transactions by these foreign keys
+    op.create_index('ix_transactions_account_id', 'transactions', ['account_id'])
+    op.create_index('ix_transactions_vendor_id', 'transactions', ['vendor_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_vendor_id', table_name='transactions')
+    op.drop_index('ix_transactions_account_id', table_name='transactions')
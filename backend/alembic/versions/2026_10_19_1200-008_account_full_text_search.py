@@ -0,0 +1,41 @@
+"""Full-text search vector and industry index on accounts
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Names and industry weigh most, then what the account sells and does, then use cases
+    op.add_column('accounts', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(account_name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(primary_industry, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(products, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(capabilities, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(use_cases, '')), 'C')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index('ix_accounts_search_vector', 'accounts', ['search_vector'], postgresql_using='gin')
+    op.create_index('ix_accounts_industries_served', 'accounts', ['industries_served'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_accounts_industries_served', table_name='accounts')
+    op.drop_index('ix_accounts_search_vector', table_name='accounts')
+    op.drop_column('accounts', 'search_vector')
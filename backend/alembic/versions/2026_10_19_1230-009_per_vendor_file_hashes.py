@@ -0,0 +1,35 @@
+"""Scope duplicate-file detection to the uploading vendor
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The same file uploaded by two vendors is two reports
+    op.drop_index('uq_pos_reports_file_sha256', table_name='pos_reports')
+    op.create_index('uq_pos_reports_vendor_id_file_sha256', 'pos_reports', ['vendor_id', 'file_sha256'], unique=True)
+
+
+def downgrade() -> None:
+    # Keep the hash only on the first report of each file so the global index can be rebuilt
+    op.execute("""
+        UPDATE pos_reports p
+        SET file_sha256 = NULL
+        WHERE EXISTS (
+            SELECT 1 FROM pos_reports earlier
+            WHERE earlier.file_sha256 = p.file_sha256 AND earlier.pos_report_id < p.pos_report_id
+        )
+    """)
+    op.drop_index('uq_pos_reports_vendor_id_file_sha256', table_name='pos_reports')
+    op.create_index('uq_pos_reports_file_sha256', 'pos_reports', ['file_sha256'], unique=True)
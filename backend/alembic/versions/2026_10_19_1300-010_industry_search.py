@@ -0,0 +1,84 @@
+"""Industries served in account full-text search and case-insensitive industry filters
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+# array_to_string and array casts are only STABLE, so generated columns need
+# IMMUTABLE wrappers; both only touch text values
+INDUSTRY_FUNCTIONS = """
+    CREATE OR REPLACE FUNCTION industries_text(industries varchar[]) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT array_to_string(industries, ' ') $$;
+
+    CREATE OR REPLACE FUNCTION lower_industries(industries varchar[]) RETURNS varchar[]
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT array_agg(lower(industry) ORDER BY position)::varchar[]
+          FROM unnest(industries) WITH ORDINALITY AS i(industry, position) $$;
+"""
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(account_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(primary_industry, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(industries_text(industries_served), '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(products, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(capabilities, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(use_cases, '')), 'C')"
+)
+
+PREVIOUS_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(account_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(primary_industry, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(products, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(capabilities, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(use_cases, '')), 'C')"
+)
+
+
+def _replace_search_vector(expression: str) -> None:
+    # A generated column's expression can't be altered in place
+    op.drop_index('ix_accounts_search_vector', table_name='accounts')
+    op.drop_column('accounts', 'search_vector')
+    op.add_column('accounts', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(expression, persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_accounts_search_vector', 'accounts', ['search_vector'], postgresql_using='gin')
+
+
+def upgrade() -> None:
+    op.execute(INDUSTRY_FUNCTIONS)
+
+    # Industries served weigh with products and capabilities
+    _replace_search_vector(SEARCH_VECTOR)
+
+    # Industry filters compare lower-cased values on both sides
+    op.add_column('accounts', sa.Column(
+        'industries_served_lower',
+        postgresql.ARRAY(sa.String()),
+        sa.Computed('lower_industries(industries_served)', persisted=True),
+        nullable=True
+    ))
+    op.drop_index('ix_accounts_industries_served', table_name='accounts')
+    op.create_index('ix_accounts_industries_served_lower', 'accounts', ['industries_served_lower'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_accounts_industries_served_lower', table_name='accounts')
+    op.create_index('ix_accounts_industries_served', 'accounts', ['industries_served'], postgresql_using='gin')
+    op.drop_column('accounts', 'industries_served_lower')
+    _replace_search_vector(PREVIOUS_SEARCH_VECTOR)
+    op.execute("DROP FUNCTION IF EXISTS lower_industries(varchar[]); DROP FUNCTION IF EXISTS industries_text(varchar[]);")
@@ -0,0 +1,39 @@
+"""
+API endpoints for searching accounts by their researched attributes
+"""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db_session
+from app.services.account_search import AccountSearchService
+
+
+# Create router
+router = APIRouter(prefix="/accounts", tags=["accounts"])
+
+
+@router.get("/search")
+def search_accounts(
+    q: Optional[str] = Query(default=None, description='Free-text query, e.g. "cyber security" or "aerospace -defense"', max_length=500),
+    industry: Optional[List[str]] = Query(default=None, description="Only accounts serving this industry, any case (repeatable; all must match)"),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=25, ge=1, le=100),
+    db: Session = Depends(get_db_session)
+):
+    """
+    Ranked search over account names, primary industry, industries served,
+    products, capabilities and use cases.
+
+    Queries use web-search syntax (quoted phrases, `or`, `-term`). Results
+    are ranked by match density with name and industry matches weighted
+    highest; `industry` filters on industries served.
+    """
+    try:
+        result = AccountSearchService(db).search(q, industry, page, page_size)
+        return result.__dict__
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Account search failed: {str(e)}")
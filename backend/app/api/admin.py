@@ -0,0 +1,155 @@
+"""
+Administrative endpoints for diagnosing performance
+"""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import engine, get_db_session, sql_profiler
+from app.database.query_plans import run_plan_checks
+from app.services.report_snapshots import report_snapshots
+from app.services.vector_index import add_accounts_to_index, get_vector_index, rebuild_vector_index
+
+
+# Create router
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/sql-profile")
+async def get_sql_profile(
+    limit: int = Query(default=20, description="Number of statements to return", ge=1, le=200),
+    order_by: str = Query(default="total_ms", description="Ranking field, e.g. total_ms, p95_ms, count")
+):
+    """
+    Top-N hottest SQL statements, aggregated by normalized fingerprint.
+
+    Each entry has call count, latency percentiles, rows returned and the
+    endpoints/services that issued it. Counts cover sampled statements only.
+    """
+    try:
+        statements = sql_profiler.top(limit, order_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "enabled": sql_profiler.enabled,
+        "sample_rate": sql_profiler.sample_rate,
+        "started_at": sql_profiler.started_at,
+        "statements": statements
+    }
+
+
+@router.post("/sql-profile/enable")
+async def enable_sql_profile(
+    sample_rate: Optional[float] = Query(default=None, description="Fraction of statements to time", gt=0, le=1)
+):
+    """Start profiling SQL statements on the application engine"""
+    if sample_rate is not None:
+        sql_profiler.sample_rate = sample_rate
+    sql_profiler.install(engine)
+    return {"enabled": True, "sample_rate": sql_profiler.sample_rate}
+
+
+@router.post("/sql-profile/disable")
+async def disable_sql_profile():
+    """Stop profiling; collected statistics are kept until reset"""
+    sql_profiler.uninstall(engine)
+    return {"enabled": False}
+
+
+@router.delete("/sql-profile")
+async def reset_sql_profile():
+    """Discard collected statistics"""
+    sql_profiler.reset()
+    return {"message": "SQL profile reset"}
+
+
+@router.get("/query-plans")
+def get_query_plans(
+    check: Optional[List[str]] = Query(default=None, description="Checks to run (all when omitted)"),
+    analyze: bool = Query(default=False, description="Execute the statements for actual timings"),
+    include_plan: bool = Query(default=False, description="Include the full JSON plans"),
+    db: Session = Depends(get_db_session)
+):
+    """
+    EXPLAIN the hot fuzzy search and reporting queries against this database.
+
+    Each result reports the indexes used, sequential scans and estimated cost,
+    and lists the expectations the plan violates.
+    """
+    try:
+        results = run_plan_checks(db, check, analyze=analyze, include_plan=include_plan)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to check query plans: {str(e)}")
+
+    return {
+        "passed": all(result.passed for result in results),
+        "checks": [result.__dict__ for result in results]
+    }
+
+
+@router.get("/report-snapshots")
+async def get_report_snapshots():
+    """Cached report views and the data version they belong to"""
+    return report_snapshots.stats()
+
+
+@router.delete("/report-snapshots")
+async def clear_report_snapshots():
+    """Evict cached report views, e.g. after editing transactions outside ingestion"""
+    report_snapshots.invalidate()
+    return {"message": "Report snapshots cleared"}
+
+
+@router.get("/vector-index")
+def get_vector_index_status():
+    """Size and location of the account vector-similarity index"""
+    index = get_vector_index()
+    if index is None:
+        return {"built": False}
+    return {
+        "built": True,
+        "path": str(index.path),
+        "dim": index.dim,
+        "rows": len(index),
+        "pending_rows": len(index.delta_texts),
+    }
+
+
+@router.post("/vector-index/rebuild")
+def rebuild_vector_index_endpoint(db: Session = Depends(get_db_session)):
+    """Re-embed every account name, profile and alias into a fresh index"""
+    try:
+        index = rebuild_vector_index(db)
+        return {"message": "Vector index rebuilt", "rows": len(index)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild vector index: {str(e)}")
+
+
+@router.post("/vector-index/accounts")
+def add_accounts_to_vector_index(
+    account_ids: List[int],
+    db: Session = Depends(get_db_session)
+):
+    """Add new accounts to the index without a rebuild"""
+    if get_vector_index() is None:
+        raise HTTPException(status_code=409, detail="Vector index has not been built")
+    try:
+        return {"rows_added": add_accounts_to_index(db, account_ids)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update vector index: {str(e)}")
+
+
+@router.get("/vector-index/search")
+def search_vector_index(
+    query: str = Query(..., description="Customer name to look up", min_length=1),
+    limit: int = Query(default=5, ge=1, le=50)
+):
+    """Nearest accounts for a name, for tuning the vector match threshold"""
+    index = get_vector_index()
+    if index is None:
+        raise HTTPException(status_code=409, detail="Vector index has not been built")
+    return {"query": query, "matches": [match.__dict__ for match in index.search([query], limit)[0]]}
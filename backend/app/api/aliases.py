@@ -0,0 +1,131 @@
+"""
+API endpoints for customer name alias management
+"""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from pydantic import BaseModel, Field
+
+from app.database import get_db_session
+from app.services.alias_learning import AliasLearningService, LearnedAlias, SOURCE_IMPORT
+from app.services.vector_index import add_aliases_to_index
+
+
+# Pydantic models for API requests
+class AliasImportItem(BaseModel):
+    raw_name: str = Field(..., min_length=1, max_length=255)
+    account_id: Optional[int] = None
+    account_name: Optional[str] = None
+    confidence: Optional[float] = Field(default=None, ge=0, le=1)
+
+
+class AliasImportRequest(BaseModel):
+    aliases: List[AliasImportItem]
+    overwrite: bool = False
+
+
+# Create router
+router = APIRouter(prefix="/aliases", tags=["aliases"])
+
+
+@router.post("/import")
+def import_aliases(
+    request: AliasImportRequest,
+    db: Session = Depends(get_db_session)
+):
+    """
+    Bulk import customer name aliases.
+
+    Each alias references its account by `account_id` or exact `account_name`.
+    Existing aliases are kept unless `overwrite` is set. Aliases whose account
+    doesn't exist are reported in `unknown_accounts` and not imported.
+    """
+    if len(request.aliases) > 50000:
+        raise HTTPException(status_code=400, detail="Maximum 50000 aliases allowed per import")
+
+    try:
+        requested_ids = {item.account_id for item in request.aliases if item.account_id is not None}
+        known_ids = set()
+        if requested_ids:
+            known_ids = set(db.execute(text("""
+                SELECT account_id FROM accounts WHERE account_id = ANY(:ids)
+            """), {"ids": list(requested_ids)}).scalars())
+
+        account_names = {item.account_name for item in request.aliases if item.account_id is None and item.account_name}
+        account_ids = {}
+        if account_names:
+            rows = db.execute(text("""
+                SELECT account_id, account_name FROM accounts WHERE account_name = ANY(:names)
+            """), {"names": list(account_names)}).fetchall()
+            account_ids = {row.account_name: row.account_id for row in rows}
+
+        aliases = []
+        rejected = []
+        for item in request.aliases:
+            if item.account_id is not None:
+                account_id = item.account_id if item.account_id in known_ids else None
+            else:
+                account_id = account_ids.get(item.account_name)
+            if account_id is None:
+                rejected.append(item.raw_name)
+                continue
+            aliases.append(LearnedAlias(
+                raw_name=item.raw_name,
+                account_id=account_id,
+                source=SOURCE_IMPORT,
+                confidence=item.confidence
+            ))
+
+        written = AliasLearningService(db).write_aliases(aliases, overwrite=request.overwrite)
+        db.commit()
+
+        try:
+            # Only what the table now holds; kept aliases keep their existing account
+            add_aliases_to_index([alias.account_id for alias in written], [alias.raw_name for alias in written])
+        except Exception as e:
+            print(f"Error adding imported aliases to vector index: {e}")
+
+        return {
+            "message": "Aliases imported successfully",
+            "aliases_received": len(request.aliases),
+            "aliases_written": len(written),
+            "aliases_skipped": len(aliases) - len(written),
+            "unknown_accounts": rejected
+        }
+
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to import aliases: {str(e)}")
+
+
+@router.get("/hit-ratio")
+async def alias_hit_ratio(
+    limit: int = Query(default=12, description="Number of recent reports to include", ge=1, le=120),
+    db: Session = Depends(get_db_session)
+):
+    """
+    Trend of how customer names were resolved per ingested report.
+
+    A rising exact-hit ratio means learned aliases are replacing trigram searches.
+    """
+    try:
+        trend = AliasLearningService(db).hit_ratio_trend(limit)
+        totals = {
+            key: sum(report[key] for report in trend)
+            for key in ("exact_hits", "fuzzy_hits", "vector_hits", "unresolved_names")
+        }
+        total_names = sum(totals.values())
+
+        return {
+            "reports": trend,
+            **totals,
+            "exact_hit_ratio": round(totals["exact_hits"] / total_names, 4) if total_names else None
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get hit ratio: {str(e)}")
@@ -38,6 +38,7 @@ async def test_fuzzy_search(
     query: str = Query(..., description="Customer name to search for", min_length=1),
     show_all: bool = Query(default=False, description="Show all matches, not just best match"),
     limit: int = Query(default=10, description="Maximum number of matches to return", ge=1, le=50),
+    vendor_id: Optional[int] = Query(default=None, description="Search this vendor's historical accounts first"),
     db: Session = Depends(get_db_session)
 ):
     """
@@ -50,7 +51,7 @@ async def test_fuzzy_search(
         fuzzy_service = FuzzySearchService(db)
         
         # Get the best match (high-confidence only)
-        best_match = fuzzy_service.find_best_match(query)
+        best_match = fuzzy_service.find_best_match(query, vendor_id=vendor_id)
         
         # Get all matches for analysis (if requested)
         all_matches = fuzzy_service.find_all_matches(query, limit) if show_all else []
@@ -0,0 +1,188 @@
+"""
+API endpoints for Account Team, Partner Team and Executive Roll-up reports
+"""
+
+import json
+import os
+from datetime import date
+from typing import Callable, Optional
+from urllib.parse import urlencode
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+
+from app.database import get_db_session
+from app.models import Account, Vendor
+from app.services.report_snapshots import report_snapshots
+from app.services.reporting import ReportScope, ReportService
+
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+# Create router
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+def _get_account(db: Session, account_id: int) -> Account:
+    account = db.query(Account).filter(Account.account_id == account_id).first()
+    if account is None:
+        raise HTTPException(status_code=404, detail="Account not found")
+    return account
+
+
+def _get_vendor(db: Session, vendor_id: int) -> Vendor:
+    vendor = db.query(Vendor).filter(Vendor.vendor_id == vendor_id).first()
+    if vendor is None:
+        raise HTTPException(status_code=404, detail="Vendor not found")
+    return vendor
+
+
+def _snapshot_response(request: Request, render: Callable[[], dict]) -> Response:
+    """
+    Serve a JSON view from its snapshot for the current data version.
+
+    A request whose If-None-Match carries the current ETag gets a 304 before
+    any query runs; the database session is only used if the view has to be
+    rendered.
+    """
+    key = f"{request.url.path}?{urlencode(sorted(request.query_params.multi_items()))}"
+    data_version = report_snapshots.data_version
+    etag = report_snapshots.etag(key, data_version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    snapshot = report_snapshots.get(key, data_version)
+    if snapshot is None:
+        body = json.dumps(jsonable_encoder(render())).encode("utf-8")
+        snapshot = report_snapshots.put(key, data_version, body)
+
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+def _xlsx_download(db: Session, scope: ReportScope, filename: str) -> FileResponse:
+    """Build the workbook, then send it in chunks; the file is deleted once the response ends, even if aborted"""
+    try:
+        path = ReportService(db).write_workbook(scope)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Report export failed: {str(e)}")
+
+    return FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        filename=filename,
+        background=BackgroundTask(os.unlink, path)
+    )
+
+
+@router.get("/account/{account_id}")
+def account_report(
+    request: Request,
+    account_id: int,
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    limit: int = Query(default=100, description="Maximum rows per breakdown", ge=1, le=1000),
+    db: Session = Depends(get_db_session)
+):
+    """Account Team View: sales into an account by vendor, month and raw customer name"""
+    def render() -> dict:
+        account = _get_account(db, account_id)
+        try:
+            report = ReportService(db).account_view(account_id, start_date, end_date, limit)
+            return {"account_id": account.account_id, "account_name": account.account_name, **report}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Account report failed: {str(e)}")
+
+    return _snapshot_response(request, render)
+
+
+@router.get("/account/{account_id}/export.xlsx")
+def export_account_report(
+    account_id: int,
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    db: Session = Depends(get_db_session)
+):
+    """Download the Account Team View as an Excel workbook"""
+    _get_account(db, account_id)
+    return _xlsx_download(
+        db, ReportScope.for_account(account_id, start_date, end_date), f"account_{account_id}_report.xlsx"
+    )
+
+
+@router.get("/vendor/{vendor_id}")
+def vendor_report(
+    request: Request,
+    vendor_id: int,
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    limit: int = Query(default=100, description="Maximum rows per breakdown", ge=1, le=1000),
+    db: Session = Depends(get_db_session)
+):
+    """Partner Team View: a vendor's sales by account and hierarchy"""
+    def render() -> dict:
+        vendor = _get_vendor(db, vendor_id)
+        try:
+            report = ReportService(db).vendor_view(vendor_id, start_date, end_date, limit)
+            return {"vendor_id": vendor.vendor_id, "vendor_name": vendor.vendor_name, **report}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Vendor report failed: {str(e)}")
+
+    return _snapshot_response(request, render)
+
+
+@router.get("/vendor/{vendor_id}/export.xlsx")
+def export_vendor_report(
+    vendor_id: int,
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    db: Session = Depends(get_db_session)
+):
+    """Download the Partner Team View as an Excel workbook"""
+    _get_vendor(db, vendor_id)
+    return _xlsx_download(
+        db, ReportScope.for_vendor(vendor_id, start_date, end_date), f"vendor_{vendor_id}_report.xlsx"
+    )
+
+
+@router.get("/hierarchy/{level}")
+def hierarchy_report(
+    request: Request,
+    level: int,
+    value: Optional[str] = Query(default=None, description="Restrict to this node, e.g. 'US Federal Government'"),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    limit: int = Query(default=100, description="Maximum rows per breakdown", ge=1, le=1000),
+    db: Session = Depends(get_db_session)
+):
+    """Executive Roll-up View: sales grouped by a hierarchy level, or one node broken down by the next level"""
+    def render() -> dict:
+        try:
+            return ReportService(db).hierarchy_view(level, value, start_date, end_date, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Hierarchy report failed: {str(e)}")
+
+    return _snapshot_response(request, render)
+
+
+@router.get("/hierarchy/{level}/export.xlsx")
+def export_hierarchy_report(
+    level: int,
+    value: Optional[str] = Query(default=None, description="Restrict to this node"),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    db: Session = Depends(get_db_session)
+):
+    """Download the Executive Roll-up View as an Excel workbook"""
+    try:
+        scope = ReportScope.for_hierarchy(level, value, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _xlsx_download(db, scope, f"hierarchy_level_{level}_report.xlsx")
@@ -2,12 +2,17 @@
 API endpoints for managing sample data for testing and development
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import text
 from datetime import date
 
 from app.database import get_db_session
 from app.models import Account, Hierarchy, CustomerNameAlias, Vendor, Transaction
+from app.services.data_seeder import SeedConfig, SyntheticDataSeeder, reset_all_data
+from app.services.normalization import backfill_normalized_names
+from app.services.report_snapshots import report_snapshots
+from app.services.vector_index import clear_vector_index, rebuild_vector_index
 
 
 # Create router
@@ -143,6 +148,10 @@ async def create_sample_accounts(db: Session = Depends(get_db_session)):
         ]
         
         db.add_all(aliases)
+        db.flush()
+        
+        # Fuzzy search matches on normalized_name, which the ORM inserts don't set
+        backfill_normalized_names(db)
         db.commit()
         
         return {
@@ -158,6 +167,58 @@ async def create_sample_accounts(db: Session = Depends(get_db_session)):
         raise HTTPException(status_code=500, detail=f"Failed to create sample data: {str(e)}")
 
 
+@router.post("/seed")
+def seed_synthetic_data(
+    seed: int = Query(default=42, description="Random seed; the same seed always produces the same data"),
+    accounts: int = Query(default=10000, ge=1, le=2000000),
+    aliases_per_account: int = Query(default=3, ge=0, le=20),
+    vendors: int = Query(default=100, ge=1, le=10000),
+    transactions: int = Query(default=1000000, ge=0, le=50000000),
+    reset: bool = Query(default=False, description="Clear all data before seeding"),
+    db: Session = Depends(get_db_session)
+):
+    """
+    Generate a deterministic synthetic data set for load testing.
+
+    Builds hierarchies, accounts with noisy alias variants, vendors and
+    transactions, bulk loaded with COPY, then rebuilds the vector index.
+    """
+    try:
+        if reset:
+            reset_all_data(db)
+
+        counts = SyntheticDataSeeder(db, SeedConfig(
+            seed=seed,
+            accounts=accounts,
+            aliases_per_account=aliases_per_account,
+            vendors=vendors,
+            transactions=transactions
+        )).run()
+        db.commit()
+        report_snapshots.invalidate()
+
+        # Refresh planner statistics for the freshly loaded tables
+        db.execute(text("ANALYZE"))
+        db.commit()
+
+        # Index the committed accounts; a reset left the old index pointing at deleted ids
+        counts["vector_index_rows"] = len(rebuild_vector_index(db))
+
+        return {
+            "message": "Synthetic data created successfully",
+            "seed": seed,
+            **counts,
+            "action": "created"
+        }
+
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to seed data: {str(e)}")
+
+
 @router.delete("/clear-all-data")
 async def clear_all_data(db: Session = Depends(get_db_session)):
     """
@@ -165,14 +226,10 @@ async def clear_all_data(db: Session = Depends(get_db_session)):
     WARNING: This will delete ALL data in the database!
     """
     try:
-        # Delete in correct order due to foreign key constraints
-        db.query(Transaction).delete()
-        db.query(CustomerNameAlias).delete() 
-        db.query(Account).delete()
-        db.query(Hierarchy).delete()
-        db.query(Vendor).delete()
-        
+        reset_all_data(db)
         db.commit()
+        report_snapshots.invalidate()
+        clear_vector_index()
         
         return {
             "message": "All data cleared successfully",
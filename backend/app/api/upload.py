@@ -0,0 +1,161 @@
+"""
+API endpoints for uploading and ingesting POS reports
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db_session, SessionLocal
+from app.services.ingestion import IngestionService
+from app.services.progress import IngestionProgressTracker, progress_bus
+
+
+ALLOWED_EXTENSIONS = {".xlsx", ".csv"}
+
+
+# Create router
+router = APIRouter(prefix="/upload", tags=["upload"])
+
+
+def _result_payload(result) -> dict:
+    return {
+        "message": "POS report already ingested" if result.status == "duplicate" else "POS report ingested successfully",
+        **result.__dict__
+    }
+
+
+def _run_ingestion(db: Session, tracker: IngestionProgressTracker, tmp_path: str, vendor_name: str,
+                   file_name: Optional[str], replaces_report_id: Optional[int]) -> dict:
+    try:
+        result = IngestionService(db, progress=tracker).ingest_file(
+            tmp_path,
+            vendor_name,
+            file_name=file_name,
+            replaces_report_id=replaces_report_id
+        )
+        payload = _result_payload(result)
+        tracker.complete(payload)
+        return payload
+
+    except Exception as e:
+        db.rollback()
+        tracker.fail(str(e))
+        raise
+    finally:
+        os.unlink(tmp_path)
+
+
+def _run_ingestion_job(job_id: str, tmp_path: str, vendor_name: str,
+                       file_name: Optional[str], replaces_report_id: Optional[int]):
+    """Background job: the request's session is gone by now, so open a fresh one"""
+    db = SessionLocal()
+    try:
+        _run_ingestion(db, IngestionProgressTracker(job_id, progress_bus), tmp_path,
+                       vendor_name, file_name, replaces_report_id)
+    except Exception as e:
+        print(f"Ingestion job {job_id} failed: {e}")
+    finally:
+        db.close()
+
+
+@router.post("/pos", status_code=202)
+def upload_pos_report(
+    background_tasks: BackgroundTasks,
+    response: Response,
+    file: UploadFile = File(..., description="POS report (.xlsx or .csv)"),
+    vendor_name: str = Form(..., description="Distribution partner that submitted the report"),
+    replaces_report_id: Optional[int] = Form(default=None, description="Report this file corrects (detected automatically from a report covering the same dates when omitted)"),
+    wait: bool = Form(default=False, description="Ingest before responding instead of as a background job"),
+    db: Session = Depends(get_db_session)
+):
+    """
+    Upload a POS report and ingest its transactions.
+
+    Every distinct End Customer Name is resolved against existing accounts
+    with fuzzy search; names without a confident match are returned as
+    unresolved for the AI Classification Agent.
+
+    Re-uploading an identical file is a no-op. A corrected file is diffed
+    against the report it replaces: unchanged rows are kept, new rows are
+    inserted and rows no longer present are removed.
+
+    Ingestion runs as a background job by default (202); follow it with
+    `GET /upload/jobs/{job_id}/events`. With `wait` the finished result is
+    returned with 200.
+    """
+    suffix = Path(file.filename or "").suffix.lower()
+    if suffix not in ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {suffix or 'unknown'}")
+
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        shutil.copyfileobj(file.file, tmp)
+        tmp_path = tmp.name
+
+    job_id = uuid.uuid4().hex
+
+    if wait:
+        response.status_code = 200
+        try:
+            return _run_ingestion(db, IngestionProgressTracker(job_id, progress_bus), tmp_path,
+                                  vendor_name.strip(), file.filename, replaces_report_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to ingest POS report: {str(e)}")
+
+    # Register the job before responding so an immediate subscribe finds it
+    IngestionProgressTracker(job_id, progress_bus)
+    background_tasks.add_task(
+        _run_ingestion_job, job_id, tmp_path, vendor_name.strip(), file.filename, replaces_report_id
+    )
+
+    return {
+        "message": "POS report accepted for ingestion",
+        "job_id": job_id,
+        "status_url": f"/upload/jobs/{job_id}",
+        "events_url": f"/upload/jobs/{job_id}/events"
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_ingestion_job(job_id: str):
+    """Latest progress snapshot for an ingestion job (served from memory)"""
+    progress = progress_bus.latest(job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return progress.to_dict()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_ingestion_job(job_id: str):
+    """
+    Stream ingestion progress as Server-Sent Events.
+
+    Sends `progress` events with rows processed, names resolved per tier,
+    throughput and ETA, and closes after the job completes or fails. Updates
+    are coalesced, so a slow client only ever receives the newest snapshot.
+    """
+    if progress_bus.latest(job_id) is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+    async def events():
+        async for progress in progress_bus.subscribe(job_id):
+            if progress is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {progress.version}\nevent: progress\ndata: {json.dumps(progress.to_dict(), default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
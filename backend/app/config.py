@@ -49,6 +49,54 @@ class Settings(BaseSettings):
         description="Enable agent action logging"
     )
 
+    # Vector Index
+    vector_index_path: str = Field(
+        default="data/vector_index",
+        description="Directory holding the account vector-similarity index"
+    )
+    vector_index_dim: int = Field(
+        default=512,
+        description="Width of hashed n-gram vectors (a power of two)"
+    )
+    vector_match_threshold: float = Field(
+        default=0.6,
+        description="Minimum cosine similarity for a vector-index match"
+    )
+    vector_match_margin: float = Field(
+        default=0.1,
+        description="Minimum lead of the best vector match over the runner-up account"
+    )
+
+    # Report Snapshots
+    report_snapshot_max_entries: int = Field(
+        default=500,
+        description="Rendered report views kept in memory"
+    )
+    report_snapshot_revalidate_seconds: float = Field(
+        default=30.0,
+        description="How long a process trusts its cached data version before re-reading it"
+    )
+
+    # SQL Profiler
+    sql_profiler_enabled: bool = Field(
+        default=False,
+        description="Record per-statement SQL latency aggregated by fingerprint"
+    )
+    sql_profiler_sample_rate: float = Field(
+        default=0.1,
+        description="Fraction of SQL statements timed by the profiler"
+    )
+
+    # Ingestion Configuration
+    ingestion_workers: Optional[int] = Field(
+        default=None,
+        description="Worker processes for POS ingestion (defaults to CPU count, 1 disables the pool)"
+    )
+    ingestion_chunk_size: int = Field(
+        default=5000,
+        description="Number of POS rows parsed and inserted per chunk"
+    )
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
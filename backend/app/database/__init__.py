@@ -2,6 +2,6 @@
 Database configuration and connection management
 """
 
-from .connection import get_db_session, engine, SessionLocal, test_connection
+from .connection import get_db_session, engine, SessionLocal, test_connection, sql_profiler
 
-__all__ = ["get_db_session", "engine", "SessionLocal", "test_connection"]
+__all__ = ["get_db_session", "engine", "SessionLocal", "test_connection", "sql_profiler"]
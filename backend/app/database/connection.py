@@ -6,6 +6,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from app.config import settings
+from app.database.profiler import SQLProfiler
 
 
 # Create database engine
@@ -20,6 +21,11 @@ engine = create_engine(
     echo=settings.debug,  # Log SQL queries in debug mode
 )
 
+# Opt-in statement profiler; can also be toggled at runtime via /admin/sql-profile
+sql_profiler = SQLProfiler(sample_rate=settings.sql_profiler_sample_rate)
+if settings.sql_profiler_enabled:
+    sql_profiler.install(engine)
+
 # Create session factory
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -0,0 +1,276 @@
+"""
+Opt-in per-statement SQL profiler built on SQLAlchemy engine events.
+
+Statements are grouped by a normalized fingerprint (literals and bind
+parameters replaced by ``?``) and aggregated with latency percentiles, rows
+returned and the endpoint/service that issued them. Only a sampled fraction
+of statements is timed, so the profiler can stay enabled in production.
+
+Other processes (the ingestion workers) profile their own engines and hand
+their statistics to the API process with ``drain`` and ``merge``.
+"""
+
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# ASGI scope of the request being served, set by middleware in app.main
+current_request_scope: ContextVar[Optional[dict]] = ContextVar("current_request_scope", default=None)
+
+# Latency samples kept per fingerprint for percentile estimates
+RESERVOIR_SIZE = 1024
+
+# Distinct fingerprints tracked; the least recently seen are dropped beyond this
+MAX_FINGERPRINTS = 2000
+
+_FINGERPRINT_RULES = [
+    (re.compile(r"--[^\n]*"), ""),
+    (re.compile(r"/\*.*?\*/", re.S), ""),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\s+"), " "),
+    (re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I), "IN (?)"),
+    (re.compile(r"\bVALUES\s*\([?,\s]+\)(?:\s*,\s*\([?,\s]+\))*", re.I), "VALUES (...)"),
+]
+
+
+def fingerprint_statement(statement: str) -> str:
+    """Normalize a SQL statement so executions differing only in values group together"""
+    for pattern, replacement in _FINGERPRINT_RULES:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def _calling_code() -> Optional[str]:
+    """First application frame outside the database package that issued the statement"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.") and not module.startswith("app.database"):
+            return f"{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _calling_endpoint() -> Optional[str]:
+    scope = current_request_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return f"{scope.get('method', '')} {route.path}"
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        return f"{scope.get('method', '')} {endpoint.__module__}.{endpoint.__name__}"
+    return f"{scope.get('method', '')} {scope.get('path', '')}"
+
+
+class _StatementStats:
+    """Aggregated timings for one statement fingerprint"""
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.samples: List[float] = []
+        self.callers: Counter = Counter()
+
+    def record(self, elapsed_ms: float, rows: int, caller: str, rng: random.Random):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += max(rows, 0)
+        self.callers[caller] += 1
+
+        # Reservoir sampling keeps a uniform sample of all latencies in bounded memory
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(elapsed_ms)
+        else:
+            slot = rng.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = elapsed_ms
+
+    def merge(self, record: dict, caller_prefix: Optional[str], rng: random.Random):
+        """Fold in statistics drained from another process"""
+        self.count += record["count"]
+        self.total_ms += record["total_ms"]
+        self.max_ms = max(self.max_ms, record["max_ms"])
+        self.rows += record["rows"]
+        for caller, count in record["callers"].items():
+            self.callers[f"{caller_prefix} > {caller}" if caller_prefix else caller] += count
+
+        # Combined reservoir; approximate once both sides were already sampled
+        self.samples.extend(record["samples"])
+        if len(self.samples) > RESERVOIR_SIZE:
+            self.samples = rng.sample(self.samples, RESERVOIR_SIZE)
+
+    def to_record(self) -> dict:
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+            "rows": self.rows,
+            "samples": list(self.samples),
+            "callers": dict(self.callers),
+        }
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+
+        def percentile(fraction: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "rows_total": self.rows,
+            "rows_mean": round(self.rows / self.count, 2) if self.count else 0.0,
+            "top_callers": [
+                {"caller": caller, "count": count}
+                for caller, count in self.callers.most_common(5)
+            ],
+        }
+
+
+class SQLProfiler:
+    """Samples statement executions on an engine and aggregates them by fingerprint"""
+
+    ORDER_KEYS = ("total_ms", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "rows_total")
+
+    def __init__(self, sample_rate: float = 0.1):
+        """
+        Initialize the profiler
+
+        Args:
+            sample_rate: Fraction of statements to time (0-1)
+        """
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._stats: "OrderedDict[str, _StatementStats]" = OrderedDict()
+        self._fingerprints: "OrderedDict[str, str]" = OrderedDict()
+        self._random = random.Random()
+        self._engines: List[Engine] = []
+        self.started_at: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._engines)
+
+    def install(self, engine: Engine):
+        """Start listening to an engine's cursor executions"""
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(engine)
+        self.started_at = self.started_at or time.time()
+
+    def uninstall(self, engine: Engine):
+        if engine not in self._engines:
+            return
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.remove(engine)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time() if self.enabled else None
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> List[dict]:
+        """
+        Hottest statements.
+
+        Args:
+            limit: Number of fingerprints to return
+            order_by: Summary field to rank by (see ORDER_KEYS)
+
+        Returns:
+            Statement summaries, hottest first
+        """
+        if order_by not in self.ORDER_KEYS:
+            raise ValueError(f"order_by must be one of: {', '.join(self.ORDER_KEYS)}")
+        with self._lock:
+            summaries = [stats.summary() for stats in self._stats.values()]
+        summaries.sort(key=lambda summary: summary[order_by], reverse=True)
+        return summaries[:limit]
+
+    def drain(self) -> List[dict]:
+        """Take the collected statistics as plain records (for sending to another process) and reset"""
+        with self._lock:
+            records = [stats.to_record() for stats in self._stats.values()]
+            self._stats.clear()
+        return records
+
+    def merge(self, records: List[dict], caller_prefix: Optional[str] = None):
+        """
+        Add statistics drained from another process's profiler.
+
+        Args:
+            records: Output of ``drain``
+            caller_prefix: Prepended to the callers, e.g. the process they ran in
+        """
+        with self._lock:
+            for record in records:
+                fingerprint = record["fingerprint"]
+                stats = self._stats.get(fingerprint)
+                if stats is None:
+                    stats = self._stats[fingerprint] = _StatementStats(fingerprint)
+                    if len(self._stats) > MAX_FINGERPRINTS:
+                        self._stats.popitem(last=False)
+                else:
+                    self._stats.move_to_end(fingerprint)
+                stats.merge(record, caller_prefix, self._random)
+            self.started_at = self.started_at or time.time()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None and self._random.random() < self.sample_rate:
+            context._profiler_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Taken off the context so a later unsampled execution on it is not timed from this start
+        started = context.__dict__.pop("_profiler_started", None) if context is not None else None
+        if started is None:
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        rows = cursor.rowcount if cursor.rowcount is not None else 0
+        caller = " > ".join(filter(None, (_calling_endpoint(), _calling_code()))) or "unknown"
+
+        with self._lock:
+            fingerprint = self._fingerprints.get(statement)
+            if fingerprint is None:
+                fingerprint = fingerprint_statement(statement)
+                self._fingerprints[statement] = fingerprint
+                if len(self._fingerprints) > MAX_FINGERPRINTS:
+                    self._fingerprints.popitem(last=False)
+
+            stats = self._stats.get(fingerprint)
+            if stats is None:
+                stats = self._stats[fingerprint] = _StatementStats(fingerprint)
+                if len(self._stats) > MAX_FINGERPRINTS:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(fingerprint)
+            stats.record(elapsed_ms, rows, caller, self._random)
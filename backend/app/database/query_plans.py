@@ -0,0 +1,342 @@
+"""
+Query-plan regression checks for the hot SQL.
+
+Each registered check EXPLAINs a statement the application actually runs
+(the SQL constants of the services, not copies) and asserts which indexes the
+planner uses, which tables it must not sequentially scan and an upper bound
+on the estimated cost. A small change to a query, such as wrapping the
+trigram column in a function, otherwise turns an index scan into a
+sequential scan without failing anything.
+
+Run against a seeded local database:
+
+    python -m app.database.query_plans --seed
+
+or inspect production plans through ``GET /admin/query-plans``. ``--seed``
+wipes every table, so it refuses to run unless the connected database's name
+marks it as a test database (``pos_data_test``, ``test_pos``) or
+``--yes-wipe-database`` is given. The same checks run under pytest
+(``tests/test_query_plans.py``) when ``TEST_DATABASE_URL`` points at a
+migrated test database.
+"""
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+# Database names --seed may wipe without --yes-wipe-database
+TEST_DATABASE_PATTERN = re.compile(r"(?:^|_)test(?:_|$)", re.IGNORECASE)
+
+# An expected index, or a tuple of alternatives of which any one satisfies the check
+ExpectedIndex = Union[str, Tuple[str, ...]]
+
+
+@dataclass
+class PlanCheck:
+    """A statement whose plan is checked"""
+    name: str
+    sql: str
+    params: Dict[str, object]
+    expected_indexes: Sequence[ExpectedIndex] = ()
+    no_seq_scan_on: Sequence[str] = ()
+    max_total_cost: Optional[float] = None
+    description: str = ""
+
+
+@dataclass
+class PlanCheckResult:
+    """Outcome of one plan check"""
+    name: str
+    passed: bool
+    total_cost: float
+    indexes_used: List[str]
+    seq_scans: List[str]
+    failures: List[str] = field(default_factory=list)
+    execution_ms: Optional[float] = None
+    plan: Optional[dict] = None
+
+
+PLAN_CHECKS: Dict[str, PlanCheck] = {}
+
+
+def register_plan_check(check: PlanCheck) -> PlanCheck:
+    """Add a statement to the set checked by run_plan_checks"""
+    PLAN_CHECKS[check.name] = check
+    return check
+
+
+def explain(db: Session, sql: str, params: Dict[str, object], analyze: bool = False) -> dict:
+    """
+    Plan of a statement as returned by EXPLAIN (FORMAT JSON).
+
+    With ``analyze`` the statement is executed, inside a transaction that is
+    rolled back afterwards.
+    """
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    try:
+        result = db.execute(text(f"EXPLAIN ({options}) {sql}"), params).scalar()
+    finally:
+        db.rollback()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]
+
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+def check_plan(db: Session, check: PlanCheck, analyze: bool = False, include_plan: bool = False) -> PlanCheckResult:
+    """
+    EXPLAIN a registered statement and compare its plan with the expectations.
+
+    Args:
+        db: Database session
+        check: Statement and expectations
+        analyze: Execute the statement to get actual timings
+        include_plan: Attach the full JSON plan to the result
+
+    Returns:
+        PlanCheckResult listing every failed expectation
+    """
+    explained = explain(db, check.sql, check.params, analyze)
+    root = explained["Plan"]
+    nodes = list(_plan_nodes(root))
+
+    indexes_used = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+    seq_scans = sorted({node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"})
+    total_cost = float(root["Total Cost"])
+
+    failures = []
+    for expected in check.expected_indexes:
+        alternatives = (expected,) if isinstance(expected, str) else tuple(expected)
+        if not set(alternatives) & set(indexes_used):
+            failures.append(f"expected index {' or '.join(alternatives)} is not used")
+    for table_name in check.no_seq_scan_on:
+        if table_name in seq_scans:
+            failures.append(f"sequential scan on {table_name}")
+    if check.max_total_cost is not None and total_cost > check.max_total_cost:
+        failures.append(f"estimated cost {total_cost:.1f} exceeds {check.max_total_cost:.1f}")
+
+    return PlanCheckResult(
+        name=check.name,
+        passed=not failures,
+        total_cost=total_cost,
+        indexes_used=indexes_used,
+        seq_scans=seq_scans,
+        failures=failures,
+        execution_ms=explained.get("Execution Time"),
+        plan=explained if include_plan else None,
+    )
+
+
+def run_plan_checks(db: Session, names: Sequence[str] = None, analyze: bool = False,
+                    include_plan: bool = False) -> List[PlanCheckResult]:
+    """
+    Check the plans of registered statements.
+
+    Args:
+        db: Database session
+        names: Checks to run (all when omitted)
+        analyze: Execute the statements to get actual timings
+        include_plan: Attach full JSON plans to the results
+
+    Returns:
+        One result per check, in registration order
+    """
+    _register_default_checks()
+    unknown = [name for name in names or () if name not in PLAN_CHECKS]
+    if unknown:
+        raise ValueError(f"Unknown plan checks: {', '.join(unknown)}")
+
+    return [
+        check_plan(db, check, analyze, include_plan)
+        for name, check in PLAN_CHECKS.items()
+        if not names or name in names
+    ]
+
+
+_defaults_registered = False
+
+
+def _register_default_checks():
+    """Register the service queries; imported lazily to keep app.database free of service imports"""
+    global _defaults_registered
+    if _defaults_registered:
+        return
+    _defaults_registered = True
+
+    from app.services.fuzzy_search import (
+        ACCOUNT_NAME_SEARCH_SQL, ALIAS_SEARCH_SQL, EXACT_MATCH_SQL,
+        VENDOR_ACCOUNT_NAME_SEARCH_SQL, VENDOR_ALIAS_SEARCH_SQL,
+    )
+    from app.services.account_search import account_search_sql
+    from app.services.reporting import ReportScope, ReportService
+
+    # Search terms are canonical keys, as FuzzySearchService passes them
+    search = {"search_term": "naval sea systems command", "limit": 5}
+
+    register_plan_check(PlanCheck(
+        name="fuzzy_account_names",
+        sql=ACCOUNT_NAME_SEARCH_SQL,
+        params=search,
+        expected_indexes=("ix_accounts_normalized_name_trgm",),
+        no_seq_scan_on=("accounts",),
+        max_total_cost=2000.0,
+        description="Step A trigram search over account names",
+    ))
+    register_plan_check(PlanCheck(
+        name="fuzzy_aliases",
+        sql=ALIAS_SEARCH_SQL,
+        params=search,
+        expected_indexes=("ix_customer_name_aliases_normalized_name_trgm",),
+        no_seq_scan_on=("customer_name_aliases",),
+        max_total_cost=2000.0,
+        description="Step A trigram search over aliases",
+    ))
+    register_plan_check(PlanCheck(
+        name="fuzzy_vendor_account_names",
+        sql=VENDOR_ACCOUNT_NAME_SEARCH_SQL,
+        params={**search, "vendor_id": 1},
+        expected_indexes=(("pk_vendor_account_candidates", "ix_accounts_normalized_name_trgm"),),
+        no_seq_scan_on=("accounts", "vendor_account_candidates"),
+        max_total_cost=2000.0,
+        description="Trigram search scoped to a vendor's historical accounts",
+    ))
+    register_plan_check(PlanCheck(
+        name="fuzzy_vendor_aliases",
+        sql=VENDOR_ALIAS_SEARCH_SQL,
+        params={**search, "vendor_id": 1},
+        expected_indexes=(("pk_vendor_account_candidates", "ix_customer_name_aliases_normalized_name_trgm"),),
+        no_seq_scan_on=("customer_name_aliases", "vendor_account_candidates"),
+        max_total_cost=2000.0,
+        description="Trigram search over aliases scoped to a vendor's historical accounts",
+    ))
+    register_plan_check(PlanCheck(
+        name="exact_name_keys",
+        sql=EXACT_MATCH_SQL,
+        params={"name_keys": [f"account {n}" for n in range(1000)]},
+        expected_indexes=("ix_accounts_normalized_name", "ix_customer_name_aliases_normalized_name"),
+        no_seq_scan_on=("accounts", "customer_name_aliases"),
+        max_total_cost=20000.0,
+        description="Batched exact-key lookup of a 1000-name ingestion batch",
+    ))
+
+    sql, params = account_search_sql("cyber security", None)
+    register_plan_check(PlanCheck(
+        name="account_search_text",
+        sql=f"{sql} LIMIT 25",
+        params=params,
+        expected_indexes=("ix_accounts_search_vector",),
+        no_seq_scan_on=("accounts",),
+        description="Ranked full-text search over account attributes",
+    ))
+    sql, params = account_search_sql(None, ["Aerospace"])
+    register_plan_check(PlanCheck(
+        name="account_search_industry",
+        sql=f"{sql} LIMIT 25",
+        params=params,
+        expected_indexes=("ix_accounts_industries_served_lower",),
+        description="Accounts serving an industry, matched case-insensitively",
+    ))
+
+    # The builders don't touch the session; they only render SQL for a scope
+    reports = ReportService(None)
+    account_scope = ReportScope.for_account(1)
+    vendor_scope = ReportScope.for_vendor(1)
+    register_plan_check(PlanCheck(
+        name="report_account_by_vendor",
+        sql=reports._by_vendor_sql(account_scope)[1],
+        params=account_scope.params,
+        expected_indexes=("ix_transactions_account_id",),
+        no_seq_scan_on=("transactions",),
+        description="Account Team View breakdown",
+    ))
+    register_plan_check(PlanCheck(
+        name="report_vendor_by_account",
+        sql=reports._by_account_sql(vendor_scope)[1],
+        params=vendor_scope.params,
+        expected_indexes=("ix_transactions_vendor_id",),
+        no_seq_scan_on=("transactions",),
+        description="Partner Team View breakdown",
+    ))
+    register_plan_check(PlanCheck(
+        name="report_hierarchy_level_1",
+        sql=reports._by_level_sql(ReportScope.for_hierarchy(1), 1)[1],
+        params={},
+        description="Executive Roll-up; aggregates every transaction, so only the cost is reported",
+    ))
+
+
+def is_test_database(name: str) -> bool:
+    """Whether a database name marks it as disposable test data"""
+    return bool(TEST_DATABASE_PATTERN.search(name or ""))
+
+
+def seed_database(db: Session, accounts: int, transactions: int):
+    """Replace ALL data with a synthetic data set sized for meaningful plans"""
+    from app.services.data_seeder import SeedConfig, SyntheticDataSeeder, reset_all_data
+    from app.services.vector_index import rebuild_vector_index
+
+    reset_all_data(db)
+    SyntheticDataSeeder(db, SeedConfig(accounts=accounts, transactions=transactions)).run()
+    db.commit()
+    db.execute(text("ANALYZE"))
+    db.commit()
+    rebuild_vector_index(db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the query plans of the hot SQL statements")
+    parser.add_argument("--check", action="append", dest="checks", help="Run only this check (repeatable)")
+    parser.add_argument("--analyze", action="store_true", help="Execute the statements for actual timings")
+    parser.add_argument("--seed", action="store_true",
+                        help="Reset ALL data and load a synthetic data set first (test databases only)")
+    parser.add_argument("--yes-wipe-database", action="store_true",
+                        help="Allow --seed on a database whose name does not mark it as a test database")
+    parser.add_argument("--accounts", type=int, default=50000, help="Accounts to seed")
+    parser.add_argument("--transactions", type=int, default=1000000, help="Transactions to seed")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    from app.database.connection import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if args.seed:
+            database = db.execute(text("SELECT current_database()")).scalar()
+            if not (args.yes_wipe_database or is_test_database(database)):
+                parser.error(
+                    f"--seed deletes all data in database '{database}'; use a database named like "
+                    f"'pos_data_test' or pass --yes-wipe-database"
+                )
+            seed_database(db, args.accounts, args.transactions)
+
+        results = run_plan_checks(db, args.checks, analyze=args.analyze)
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps([result.__dict__ for result in results], indent=2, default=str))
+    else:
+        for result in results:
+            status = "PASS" if result.passed else "FAIL"
+            print(f"{status} {result.name}: cost={result.total_cost:.1f} "
+                  f"indexes={','.join(result.indexes_used) or '-'} seq_scans={','.join(result.seq_scans) or '-'}")
+            for failure in result.failures:
+                print(f"    {failure}")
+
+    sys.exit(0 if all(result.passed for result in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,22 @@
 FastAPI main application entry point for AI-Powered POS Account Hierarchy Tool
 """
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from app.database import get_db_session
+from app.database.profiler import current_request_scope
 from app.models import Account, Hierarchy, Vendor
 from app.api.fuzzy_search import router as fuzzy_search_router
 from app.api.sample_data import router as sample_data_router
+from app.api.upload import router as upload_router
+from app.api.aliases import router as aliases_router
+from app.api.admin import router as admin_router
+from app.api.reports import router as reports_router
+from app.api.accounts import router as accounts_router
+from app.services.ingestion import shutdown_worker_pool
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -31,6 +38,28 @@ app.add_middleware(
 # Include API routers
 app.include_router(fuzzy_search_router)
 app.include_router(sample_data_router)
+app.include_router(upload_router)
+app.include_router(aliases_router)
+app.include_router(admin_router)
+app.include_router(reports_router)
+app.include_router(accounts_router)
+
+
+@app.middleware("http")
+async def track_sql_caller(request: Request, call_next):
+    """Expose the current request to the SQL profiler so statements are attributed to endpoints"""
+    token = current_request_scope.set(request.scope)
+    try:
+        return await call_next(request)
+    finally:
+        current_request_scope.reset(token)
+
+
+@app.on_event("shutdown")
+def stop_ingestion_workers():
+    """Stop ingestion worker processes"""
+    shutdown_worker_pool()
+
 
 @app.get("/")
 async def root():
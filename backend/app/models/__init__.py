@@ -0,0 +1,20 @@
+"""
+SQLAlchemy database models
+"""
+
+from .base import Base
+from .accounts import Account, CustomerNameAlias, Hierarchy, Vendor, VendorAccountCandidate
+from .transactions import PosReport, Transaction
+from .agents import AgentLog
+
+__all__ = [
+    "Base",
+    "Account",
+    "CustomerNameAlias",
+    "Hierarchy",
+    "Vendor",
+    "VendorAccountCandidate",
+    "PosReport",
+    "Transaction",
+    "AgentLog",
+]
@@ -0,0 +1,101 @@
+"""
+Account, hierarchy, vendor and alias models
+"""
+
+from sqlalchemy import (
+    ARRAY, DDL, Column, Computed, Date, DateTime, Float, ForeignKey, Integer, String, Text, event, func
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.models.base import Base
+
+
+class Hierarchy(Base):
+    """Four-level organizational hierarchy an account rolls up into"""
+
+    __tablename__ = "hierarchies"
+
+    hierarchy_id = Column(Integer, primary_key=True)
+    level_1 = Column(String(255))
+    level_2 = Column(String(255))
+    level_3 = Column(String(255))
+    level_4 = Column(String(255))
+
+
+class Vendor(Base):
+    """Partner whose POS reports are ingested"""
+
+    __tablename__ = "vendors"
+
+    vendor_id = Column(Integer, primary_key=True)
+    vendor_name = Column(String(255), nullable=False, unique=True)
+    partner_business_manager = Column(String(255))
+    salesforce_link = Column(Text)
+
+
+class Account(Base):
+    """Canonical customer account that raw POS customer names resolve to"""
+
+    __tablename__ = "accounts"
+
+    account_id = Column(Integer, primary_key=True)
+    account_name = Column(String(255), nullable=False, unique=True)
+    normalized_name = Column(String(255), index=True)
+    hierarchy_id = Column(Integer, ForeignKey("hierarchies.hierarchy_id"))
+    account_type = Column(String(100))
+    url = Column(Text)
+    products = Column(Text)
+    capabilities = Column(Text)
+    use_cases = Column(Text)
+    primary_industry = Column(String(255))
+    industries_served = Column(ARRAY(String))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Maintained by Postgres; never written by the application
+    industries_served_lower = Column(ARRAY(String), Computed("lower_industries(industries_served)", persisted=True))
+    search_vector = Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('english', coalesce(account_name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(primary_industry, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(industries_text(industries_served), '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(products, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(capabilities, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(use_cases, '')), 'C')",
+        persisted=True
+    ))
+
+
+# IMMUTABLE wrappers the generated columns call (array_to_string and array casts are only STABLE)
+event.listen(Account.__table__, "before_create", DDL("""
+    CREATE OR REPLACE FUNCTION industries_text(industries varchar[]) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT array_to_string(industries, ' ') $$;
+
+    CREATE OR REPLACE FUNCTION lower_industries(industries varchar[]) RETURNS varchar[]
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT array_agg(lower(industry) ORDER BY position)::varchar[]
+          FROM unnest(industries) WITH ORDINALITY AS i(industry, position) $$;
+"""))
+
+
+class CustomerNameAlias(Base):
+    """Raw customer name known to belong to an account"""
+
+    __tablename__ = "customer_name_aliases"
+
+    alias_id = Column(Integer, primary_key=True)
+    raw_name = Column(String(255), nullable=False, unique=True)
+    normalized_name = Column(String(255), index=True)
+    account_id = Column(Integer, ForeignKey("accounts.account_id"), nullable=False, index=True)
+    source = Column(String(50), nullable=False, server_default="manual")
+    confidence = Column(Float)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class VendorAccountCandidate(Base):
+    """Accounts a vendor has sold to, used to scope fuzzy matching"""
+
+    __tablename__ = "vendor_account_candidates"
+
+    vendor_id = Column(Integer, ForeignKey("vendors.vendor_id", ondelete="CASCADE"), primary_key=True)
+    account_id = Column(Integer, ForeignKey("accounts.account_id", ondelete="CASCADE"), primary_key=True)
+    transaction_count = Column(Integer, nullable=False, server_default="0")
+    last_seen = Column(Date)
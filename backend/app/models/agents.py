@@ -0,0 +1,23 @@
+"""
+AI agent audit log model
+"""
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.base import Base
+
+
+class AgentLog(Base):
+    """Decision the classification agent made for one raw customer name"""
+
+    __tablename__ = "agent_logs"
+
+    log_id = Column(Integer, primary_key=True)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    raw_name_processed = Column(String(255))
+    action_taken = Column(String(100))
+    resulting_account_id = Column(Integer, ForeignKey("accounts.account_id"))
+    confidence_score = Column(Float)
+    llm_output = Column(JSONB(astext_type=Text()))
+    perplexity_data = Column(JSONB(astext_type=Text()))
@@ -0,0 +1,45 @@
+"""
+POS report and transaction models
+"""
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, func
+
+from app.models.base import Base
+
+
+class PosReport(Base):
+    """One uploaded POS file and its ingestion statistics"""
+
+    __tablename__ = "pos_reports"
+    __table_args__ = (
+        Index("uq_pos_reports_vendor_id_file_sha256", "vendor_id", "file_sha256", unique=True),
+    )
+
+    pos_report_id = Column(Integer, primary_key=True)
+    vendor_id = Column(Integer, ForeignKey("vendors.vendor_id"))
+    file_name = Column(String(255))
+    file_sha256 = Column(String(64))
+    row_count = Column(Integer)
+    exact_hits = Column(Integer)
+    fuzzy_hits = Column(Integer)
+    vector_hits = Column(Integer)
+    unresolved_names = Column(Integer)
+    uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class Transaction(Base):
+    """Single POS line item"""
+
+    __tablename__ = "transactions"
+
+    transaction_id = Column(Integer, primary_key=True)
+    pos_report_id = Column(Integer, ForeignKey("pos_reports.pos_report_id"), index=True)
+    transaction_date = Column(Date)
+    product_sku = Column(String(100))
+    quantity = Column(Integer)
+    sale_amount = Column(Numeric(12, 2))
+    account_id = Column(Integer, ForeignKey("accounts.account_id"), index=True)
+    vendor_id = Column(Integer, ForeignKey("vendors.vendor_id"), index=True)
+    original_customer_name = Column(String(255))
+    row_hash = Column(String(64), index=True)
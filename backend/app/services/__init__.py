@@ -3,5 +3,7 @@ Business logic and AI agent services
 """
 
 from .fuzzy_search import FuzzySearchService
+from .alias_learning import AliasLearningService
+from .ingestion import IngestionService
 
-__all__ = ["FuzzySearchService"]
+__all__ = ["FuzzySearchService", "AliasLearningService", "IngestionService"]
@@ -0,0 +1,138 @@
+"""
+Full-text search over enriched account attributes.
+
+Accounts carry a generated, weighted ``search_vector`` (name and primary
+industry, then industries served, products and capabilities, then use cases)
+with a GIN index. Industry filters match a generated, lower-cased copy of
+``industries_served`` with its own GIN index, so "aerospace" finds accounts
+serving "Aerospace". Attribute searches such as "who does cyber security"
+are index lookups plus ranking of the matches rather than ILIKE scans.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+# Must match the configuration the accounts.search_vector column is generated with
+TEXT_SEARCH_CONFIG = "english"
+
+_SELECT = """
+    SELECT a.account_id, a.account_name, a.account_type, a.url,
+           a.primary_industry, a.industries_served,
+"""
+
+
+@dataclass
+class AccountSearchResult:
+    """A page of account search results"""
+    total: int
+    page: int
+    page_size: int
+    accounts: List[dict] = field(default_factory=list)
+
+
+def account_search_sql(query: Optional[str], industries: Optional[Sequence[str]]) -> Tuple[str, dict]:
+    """
+    SQL and parameters (without paging) for an attribute search.
+
+    Args:
+        query: Free-text query over names, industries, products, capabilities and use cases
+        industries: Industries the account must serve (all of them, case-insensitively)
+
+    Returns:
+        (SQL, bind parameters)
+    """
+    conditions = []
+    params = {}
+
+    if query:
+        conditions.append("a.search_vector @@ q.query")
+        params["query"] = query
+    if industries:
+        conditions.append("a.industries_served_lower @> lower_industries(CAST(:industries AS varchar[]))")
+        params["industries"] = list(industries)
+
+    if query:
+        sql = f"""
+            {_SELECT}
+                   ts_rank_cd(a.search_vector, q.query) AS rank,
+                   COUNT(*) OVER () AS total_count
+            FROM accounts a, websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', :query) AS q(query)
+            WHERE {' AND '.join(conditions)}
+            ORDER BY rank DESC, a.account_id
+        """
+    else:
+        sql = f"""
+            {_SELECT}
+                   NULL::real AS rank,
+                   COUNT(*) OVER () AS total_count
+            FROM accounts a
+            WHERE {' AND '.join(conditions)}
+            ORDER BY a.account_name
+        """
+    return sql, params
+
+
+class AccountSearchService:
+    """Service for ranked attribute search over accounts"""
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize account search service
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db = db_session
+
+    def search(self, query: Optional[str] = None, industries: Optional[Sequence[str]] = None,
+               page: int = 1, page_size: int = 25) -> AccountSearchResult:
+        """
+        Rank accounts by how well their attributes match a query.
+
+        Args:
+            query: Free-text query, e.g. "cyber security" or "aerospace -defense"
+            industries: Restrict to accounts serving all of these industries
+            page: 1-based page number
+            page_size: Accounts per page
+
+        Returns:
+            AccountSearchResult with the total match count and the requested page
+        """
+        query = (query or "").strip() or None
+        industries = [industry.strip() for industry in industries or () if industry.strip()]
+        if query is None and not industries:
+            raise ValueError("Provide a search query or at least one industry")
+
+        sql, params = account_search_sql(query, industries)
+        rows = self.db.execute(
+            text(f"{sql} LIMIT :limit OFFSET :offset"),
+            {**params, "limit": page_size, "offset": (page - 1) * page_size}
+        ).fetchall()
+
+        # Past the last page there are no rows to carry the window count
+        total = rows[0].total_count if rows else self._count(sql, params) if page > 1 else 0
+
+        return AccountSearchResult(
+            total=total,
+            page=page,
+            page_size=page_size,
+            accounts=[
+                {
+                    "account_id": row.account_id,
+                    "account_name": row.account_name,
+                    "account_type": row.account_type,
+                    "url": row.url,
+                    "primary_industry": row.primary_industry,
+                    "industries_served": row.industries_served,
+                    "rank": round(float(row.rank), 6) if row.rank is not None else None,
+                }
+                for row in rows
+            ],
+        )
+
+    def _count(self, sql: str, params: dict) -> int:
+        return self.db.execute(text(f"SELECT COUNT(*) FROM ({sql}) matches"), params).scalar()
@@ -0,0 +1,179 @@
+"""
+Alias learning service.
+
+Every raw customer name that is confidently resolved, whether by fuzzy search
+or by the AI Classification Agent, is written back as a CustomerNameAlias.
+The next report containing that spelling then resolves with a single
+exact-key lookup instead of another trigram search or web research call.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import column, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.services.normalization import normalize_names
+
+
+# Alias provenance values
+SOURCE_FUZZY = "fuzzy"
+SOURCE_AGENT = "agent"
+SOURCE_IMPORT = "import"
+SOURCE_MANUAL = "manual"
+
+ALIAS_SOURCES = (SOURCE_FUZZY, SOURCE_AGENT, SOURCE_IMPORT, SOURCE_MANUAL)
+
+customer_name_aliases_table = table(
+    "customer_name_aliases",
+    column("raw_name"),
+    column("normalized_name"),
+    column("account_id"),
+    column("source"),
+    column("confidence"),
+)
+
+
+@dataclass
+class LearnedAlias:
+    """A raw customer name resolved to an account"""
+    raw_name: str
+    account_id: int
+    source: str
+    confidence: Optional[float] = None
+
+
+class AliasLearningService:
+    """Service for recording resolved customer names as aliases"""
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize alias learning service
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db = db_session
+
+    def record_aliases(self, aliases: List[LearnedAlias], overwrite: bool = False) -> int:
+        """
+        Bulk insert aliases with ON CONFLICT on the unique raw_name.
+
+        The caller owns the transaction; nothing is committed here.
+
+        Args:
+            aliases: Aliases to record
+            overwrite: Re-point existing aliases instead of keeping them
+
+        Returns:
+            Number of aliases inserted or updated
+        """
+        return len(self.write_aliases(aliases, overwrite))
+
+    def write_aliases(self, aliases: List[LearnedAlias], overwrite: bool = False) -> List[LearnedAlias]:
+        """
+        Same as ``record_aliases``, returning the aliases actually written.
+
+        Aliases kept because the raw name already exists (or, with
+        ``overwrite``, already has the same account, source and confidence)
+        are left out, so callers can propagate exactly what the table now
+        holds.
+
+        Args:
+            aliases: Aliases to record
+            overwrite: Re-point existing aliases instead of keeping them
+
+        Returns:
+            Inserted or updated aliases, with their stored raw names
+        """
+        rows: Dict[str, dict] = {}
+        for alias in aliases:
+            raw_name = alias.raw_name.strip()[:255]
+            if not raw_name:
+                continue
+            if alias.source not in ALIAS_SOURCES:
+                raise ValueError(f"Unknown alias source: {alias.source}")
+            # One row per raw_name: Postgres rejects a statement that touches the same key twice
+            rows[raw_name] = {
+                "raw_name": raw_name,
+                "account_id": alias.account_id,
+                "source": alias.source,
+                "confidence": alias.confidence,
+            }
+
+        if not rows:
+            return []
+
+        for row, normalized_name in zip(rows.values(), normalize_names(list(rows))):
+            row["normalized_name"] = normalized_name[:255]
+
+        columns = customer_name_aliases_table.c
+        statement = insert(customer_name_aliases_table)
+        if overwrite:
+            statement = statement.on_conflict_do_update(
+                index_elements=["raw_name"],
+                set_={
+                    "account_id": statement.excluded.account_id,
+                    "source": statement.excluded.source,
+                    "confidence": statement.excluded.confidence,
+                },
+                where=(
+                    columns.account_id.is_distinct_from(statement.excluded.account_id)
+                    | columns.source.is_distinct_from(statement.excluded.source)
+                    | columns.confidence.is_distinct_from(statement.excluded.confidence)
+                ),
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=["raw_name"])
+
+        written = self.db.execute(
+            statement.returning(columns.raw_name, columns.account_id),
+            list(rows.values())
+        ).fetchall()
+        return [
+            LearnedAlias(
+                raw_name=row.raw_name,
+                account_id=row.account_id,
+                source=rows[row.raw_name]["source"],
+                confidence=rows[row.raw_name]["confidence"],
+            )
+            for row in written
+        ]
+
+    def hit_ratio_trend(self, limit: int = 12) -> List[dict]:
+        """
+        Per-report name resolution tiers, oldest first.
+
+        Args:
+            limit: Number of most recent reports to include
+
+        Returns:
+            List of dicts with exact, fuzzy, vector and unresolved counts and the exact-hit ratio
+        """
+        results = self.db.execute(text("""
+            SELECT * FROM (
+                SELECT pos_report_id, vendor_id, uploaded_at,
+                       exact_hits, fuzzy_hits, COALESCE(vector_hits, 0) AS vector_hits, unresolved_names
+                FROM pos_reports
+                WHERE exact_hits IS NOT NULL
+                ORDER BY uploaded_at DESC, pos_report_id DESC
+                LIMIT :limit
+            ) recent
+            ORDER BY uploaded_at, pos_report_id
+        """), {"limit": limit}).fetchall()
+
+        trend = []
+        for row in results:
+            total = row.exact_hits + row.fuzzy_hits + row.vector_hits + row.unresolved_names
+            trend.append({
+                "pos_report_id": row.pos_report_id,
+                "vendor_id": row.vendor_id,
+                "uploaded_at": row.uploaded_at,
+                "exact_hits": row.exact_hits,
+                "fuzzy_hits": row.fuzzy_hits,
+                "vector_hits": row.vector_hits,
+                "unresolved_names": row.unresolved_names,
+                "exact_hit_ratio": round(row.exact_hits / total, 4) if total else None,
+            })
+        return trend
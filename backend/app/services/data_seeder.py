@@ -0,0 +1,439 @@
+"""
+Synthetic data seeder for load testing.
+
+Generates realistic account hierarchies, accounts with noisy customer name
+aliases, vendors and transactions at production scale, and bulk loads them
+with PostgreSQL COPY. Output is fully determined by the seed, so a load test
+database can be torn down with ``reset_all_data`` and rebuilt identically.
+
+Usage:
+    python -m app.services.data_seeder --accounts 200000 --transactions 5000000 --reset
+"""
+
+import argparse
+import csv
+import io
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.normalization import normalize_names
+from app.services.vector_index import rebuild_vector_index
+from app.services.vendor_candidates import rebuild_vendor_candidates
+
+
+# Hierarchy templates: level_1 -> level_2 -> level_3 options
+HIERARCHY_TEMPLATES = {
+    "US Public Sector": {
+        "US Federal Government": [
+            "Department of Defense", "Department of Homeland Security", "Department of Energy",
+            "Department of Veterans Affairs", "Department of Health and Human Services",
+        ],
+        "State and Local Government": ["State Agencies", "County Government", "City Government"],
+    },
+    "Commercial": {
+        "Defense Contractors": ["Prime Contractors", "Subcontractors"],
+        "Financial Services": ["Banking", "Insurance", "Capital Markets"],
+        "Manufacturing": ["Automotive", "Industrial Equipment", "Electronics"],
+    },
+    "Education": {
+        "Higher Education": ["Public Universities", "Private Universities"],
+        "K-12": ["School Districts"],
+    },
+    "Healthcare": {
+        "Providers": ["Hospital Systems", "Clinics"],
+        "Life Sciences": ["Pharmaceuticals", "Medical Devices"],
+    },
+}
+
+ACCOUNT_TYPES = {
+    "US Public Sector": "Government",
+    "Commercial": "Enterprise",
+    "Education": "Education",
+    "Healthcare": "Healthcare",
+}
+
+NAME_PREFIXES = [
+    "Naval", "Air", "Joint", "Regional", "National", "Advanced", "Global", "Pacific", "Atlantic",
+    "Central", "Northern", "Southern", "Eastern", "Western", "Strategic", "Integrated", "Allied",
+    "United", "Federal", "Coastal", "Mountain", "Metropolitan", "Tactical", "Applied",
+]
+NAME_DOMAINS = [
+    "Sea Systems", "Logistics", "Research", "Cyber", "Space", "Medical", "Energy", "Information",
+    "Communications", "Supply", "Engineering", "Intelligence", "Transportation", "Financial",
+    "Data", "Security", "Aerospace", "Materials", "Health", "Defense",
+]
+NAME_SUFFIXES = {
+    "US Public Sector": ["Command", "Agency", "Center", "Administration", "Office", "Directorate"],
+    "Commercial": ["Corporation", "Inc", "Group", "Holdings", "Technologies", "Partners"],
+    "Education": ["University", "College", "Institute", "School District"],
+    "Healthcare": ["Health System", "Hospital", "Medical Center", "Laboratories"],
+}
+LOCATIONS = [
+    "San Diego CA", "Norfolk VA", "Arlington VA", "Colorado Springs CO", "Huntsville AL",
+    "Dayton OH", "Austin TX", "Seattle WA", "Boston MA", "Denver CO", "Tampa FL", "Chicago IL",
+]
+INDUSTRIES = [
+    "Defense", "Aerospace", "Cyber Security", "Maritime Security", "Government Services",
+    "Technology", "Healthcare", "Education", "Financial Services", "Manufacturing",
+    "Transportation", "Energy", "Research",
+]
+CAPABILITY_TERMS = [
+    "mission planning", "threat detection", "supply chain management", "data analytics",
+    "satellite communications", "network operations", "clinical research", "fleet maintenance",
+    "cloud infrastructure", "identity management", "predictive maintenance", "signal processing",
+]
+
+# Word-level abbreviations applied when generating noisy alias variants
+ABBREVIATIONS = {
+    "Department": "Dept", "Command": "Cmd", "Corporation": "Corp", "Administration": "Admin",
+    "Technologies": "Tech", "International": "Intl", "University": "Univ", "Engineering": "Eng",
+    "Communications": "Comms", "National": "Natl", "Information": "Info", "Medical": "Med",
+}
+
+VENDOR_WORDS = [
+    "Apex", "Summit", "Vertex", "Keystone", "Pinnacle", "Meridian", "Frontier", "Liberty",
+    "Sentinel", "Horizon", "Cardinal", "Beacon", "Ironclad", "Northstar", "Evergreen", "Patriot",
+]
+VENDOR_SUFFIXES = ["Technology", "Solutions", "Systems", "Integrators", "Distribution", "Partners"]
+
+
+@dataclass
+class SeedConfig:
+    """Parameters for a synthetic data set"""
+    seed: int = 42
+    accounts: int = 10000
+    aliases_per_account: int = 3
+    vendors: int = 100
+    transactions: int = 1000000
+    skus: int = 5000
+    start_date: date = date(2025, 1, 1)
+    months: int = 12
+    territory_factor: float = 5.0  # accounts per vendor territory, relative to an even split
+    batch_size: int = 250000
+
+
+def reset_all_data(db: Session):
+    """
+    Empty every data table and restart its id sequence with a single TRUNCATE.
+
+    The caller commits, then rebuilds or clears the vector index (it would
+    otherwise resolve names to deleted account ids). Touching the index only
+    after the commit keeps it intact when the reset is rolled back.
+    """
+    db.execute(text("""
+        TRUNCATE TABLE transactions, vendor_account_candidates, customer_name_aliases,
+                       agent_logs, pos_reports, accounts, hierarchies, vendors
+        RESTART IDENTITY CASCADE
+    """))
+
+
+class SyntheticDataSeeder:
+    """Generates and bulk loads a deterministic synthetic data set"""
+
+    def __init__(self, db_session: Session, config: SeedConfig):
+        """
+        Initialize the seeder
+
+        Args:
+            db_session: SQLAlchemy database session; the caller commits
+            config: Size and shape of the data set
+        """
+        self.db = db_session
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.rng = np.random.default_rng(config.seed)
+
+    def run(self) -> Dict[str, int]:
+        """
+        Generate and load the data set into empty tables.
+
+        Returns:
+            Row counts per table plus elapsed seconds
+        """
+        if self.db.execute(text("SELECT EXISTS (SELECT 1 FROM accounts)")).scalar():
+            raise ValueError("Database already contains accounts; reset it before seeding")
+
+        started = time.perf_counter()
+
+        hierarchies = self._generate_hierarchies()
+        self._copy("hierarchies", ("hierarchy_id", "level_1", "level_2", "level_3", "level_4"), hierarchies)
+
+        accounts = self._generate_accounts(hierarchies)
+        self._copy("accounts", (
+            "account_id", "account_name", "hierarchy_id", "account_type", "url", "products",
+            "capabilities", "use_cases", "primary_industry", "industries_served", "normalized_name",
+        ), self._with_normalized_names(accounts, 1))
+
+        aliases, name_options = self._generate_aliases(accounts)
+        self._copy("customer_name_aliases", (
+            "alias_id", "raw_name", "account_id", "source", "normalized_name",
+        ), self._with_normalized_names(aliases, 1))
+
+        vendors = self._generate_vendors()
+        self._copy("vendors", ("vendor_id", "vendor_name"), vendors)
+
+        report_count, transaction_count = self._load_transactions(name_options)
+        rebuild_vendor_candidates(self.db)
+
+        for table_name, id_column in (
+            ("hierarchies", "hierarchy_id"),
+            ("accounts", "account_id"),
+            ("customer_name_aliases", "alias_id"),
+            ("vendors", "vendor_id"),
+            ("pos_reports", "pos_report_id"),
+        ):
+            self.db.execute(text(f"""
+                SELECT setval(pg_get_serial_sequence('{table_name}', '{id_column}'),
+                              COALESCE((SELECT MAX({id_column}) FROM {table_name}), 0) + 1, false)
+            """))
+
+        return {
+            "hierarchies": len(hierarchies),
+            "accounts": len(accounts),
+            "aliases": len(aliases),
+            "vendors": len(vendors),
+            "pos_reports": report_count,
+            "transactions": transaction_count,
+            "elapsed_seconds": round(time.perf_counter() - started, 2),
+        }
+
+    @staticmethod
+    def _with_normalized_names(rows: List[tuple], name_position: int) -> List[tuple]:
+        """Append the canonical key of each row's name, as exact-key lookups expect"""
+        keys = normalize_names([row[name_position] for row in rows])
+        return [row + (key[:255],) for row, key in zip(rows, keys)]
+
+    def _copy(self, table_name: str, columns: Sequence[str], rows: List[tuple]):
+        """Bulk load rows with COPY, one CSV buffer per batch"""
+        for start in range(0, len(rows), self.config.batch_size):
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows[start:start + self.config.batch_size])
+            self._copy_buffer(table_name, columns, buffer)
+
+    def _copy_buffer(self, table_name: str, columns: Sequence[str], buffer: io.StringIO):
+        buffer.seek(0)
+        # Use the session's own connection so the load shares its transaction
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+    def _generate_hierarchies(self) -> List[tuple]:
+        count = max(1, self.config.accounts // 10)
+        hierarchies = []
+        for hierarchy_id in range(1, count + 1):
+            level_1 = self.random.choice(list(HIERARCHY_TEMPLATES))
+            level_2 = self.random.choice(list(HIERARCHY_TEMPLATES[level_1]))
+            level_3 = self.random.choice(HIERARCHY_TEMPLATES[level_1][level_2])
+            level_4 = f"{self.random.choice(NAME_PREFIXES)} {self.random.choice(NAME_DOMAINS)} {hierarchy_id}"
+            hierarchies.append((hierarchy_id, level_1, level_2, level_3, level_4))
+        return hierarchies
+
+    def _generate_accounts(self, hierarchies: List[tuple]) -> List[tuple]:
+        accounts = []
+        used_names = set()
+        for account_id in range(1, self.config.accounts + 1):
+            hierarchy = self.random.choice(hierarchies)
+            sector = hierarchy[1]
+            name = " ".join((
+                self.random.choice(NAME_PREFIXES),
+                self.random.choice(NAME_DOMAINS),
+                self.random.choice(NAME_SUFFIXES[sector]),
+            ))
+            if name in used_names:
+                name = f"{name} {self.random.choice(LOCATIONS).rsplit(' ', 1)[0]}"
+            if name in used_names:
+                name = f"{name} {account_id}"
+            used_names.add(name)
+
+            industries = self.random.sample(INDUSTRIES, self.random.randint(1, 4))
+            capabilities = self.random.sample(CAPABILITY_TERMS, 3)
+            accounts.append((
+                account_id,
+                name,
+                hierarchy[0],
+                ACCOUNT_TYPES[sector],
+                f"https://www.{name.lower().replace(' ', '')[:40]}.example",
+                f"{capabilities[0].capitalize()} and {capabilities[1]} products",
+                f"{capabilities[1].capitalize()}, {capabilities[2]}",
+                f"{industries[0]} {capabilities[0]}",
+                industries[0],
+                "{" + ",".join(f'"{industry}"' for industry in industries) + "}",
+            ))
+        return accounts
+
+    def _noisy_variant(self, name: str) -> str:
+        """Produce one realistic POS spelling of an account name"""
+        words = name.split()
+        style = self.random.randrange(7)
+        if style == 0:
+            return "".join(word[0] for word in words if word[0].isalpha()).upper()
+        if style == 1:
+            return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+        if style == 2:
+            return name.upper()
+        if style == 3:
+            return f"{name} - {self.random.choice(LOCATIONS)}"
+        if style == 4 and len(words) > 2:
+            del words[self.random.randrange(len(words))]
+            return " ".join(words)
+        if style == 5 and len(name) > 4:
+            position = self.random.randrange(1, len(name) - 2)
+            return name[:position] + name[position + 1] + name[position] + name[position + 2:]
+        return f"{' '.join(ABBREVIATIONS.get(word, word) for word in words).upper()} {self.random.randint(1, 99)}"
+
+    def _generate_aliases(self, accounts: List[tuple]) -> Tuple[List[tuple], List[List[str]]]:
+        aliases = []
+        name_options = []
+        used = {account[1] for account in accounts}
+        for account in accounts:
+            options = [account[1]]
+            for _ in range(self.config.aliases_per_account):
+                variant = self._noisy_variant(account[1])[:255]
+                if variant in used:
+                    continue
+                used.add(variant)
+                aliases.append((len(aliases) + 1, variant, account[0], "import"))
+                options.append(variant)
+            name_options.append(options)
+        return aliases, name_options
+
+    def _generate_vendors(self) -> List[tuple]:
+        vendors = []
+        used = set()
+        for vendor_id in range(1, self.config.vendors + 1):
+            name = f"{self.random.choice(VENDOR_WORDS)} {self.random.choice(VENDOR_WORDS)} {self.random.choice(VENDOR_SUFFIXES)}"
+            if name in used:
+                name = f"{name} {vendor_id}"
+            used.add(name)
+            vendors.append((vendor_id, name))
+        return vendors
+
+    def _load_transactions(self, name_options: List[List[str]]) -> Tuple[int, int]:
+        """
+        Generate transactions with NumPy and COPY them in batches.
+
+        Vendors follow a Zipf-like volume distribution and each sells into its
+        own territory of accounts, mirroring how partners keep selling into
+        the same customers.
+        """
+        config = self.config
+        account_count = len(name_options)
+        rng = self.rng
+
+        # Flattened customer spellings per account: account name followed by its aliases
+        option_counts = np.array([len(options) for options in name_options])
+        option_starts = np.concatenate(([0], np.cumsum(option_counts)[:-1]))
+        flat_options = np.array([name for options in name_options for name in options], dtype=object)
+
+        vendor_weights = 1.0 / np.arange(1, config.vendors + 1)
+        vendor_weights /= vendor_weights.sum()
+        territory_offsets = rng.integers(0, account_count, size=config.vendors)
+        territory_width = int(max(1, min(account_count, account_count * config.territory_factor / config.vendors)))
+
+        sku_prices = np.round(rng.uniform(20, 20000, size=config.skus), 2)
+        end_date = config.start_date + timedelta(days=int(config.months * 30.4375))
+        span_days = (end_date - config.start_date).days
+        start = np.datetime64(config.start_date, "D")
+
+        # Reports are referenced by transactions, so register every vendor/month up front
+        self._copy("pos_reports", ("pos_report_id", "vendor_id"), [
+            (vendor * config.months + month + 1, vendor + 1)
+            for vendor in range(config.vendors)
+            for month in range(config.months)
+        ])
+
+        used_report_ids = set()
+        loaded = 0
+        while loaded < config.transactions:
+            size = min(config.batch_size, config.transactions - loaded)
+
+            vendor_idx = rng.choice(config.vendors, size=size, p=vendor_weights)
+            account_idx = (territory_offsets[vendor_idx] + rng.integers(0, territory_width, size=size)) % account_count
+            option_idx = option_starts[account_idx] + (rng.random(size) * option_counts[account_idx]).astype(np.int64)
+            dates = start + rng.integers(0, span_days, size=size).astype("timedelta64[D]")
+            months = (dates.astype("datetime64[M]") - start.astype("datetime64[M]")).astype(np.int64)
+            report_ids = vendor_idx * config.months + np.minimum(months, config.months - 1) + 1
+            sku_idx = rng.integers(0, config.skus, size=size)
+            quantities = rng.integers(1, 51, size=size)
+
+            used_report_ids.update(np.unique(report_ids).tolist())
+            frame = pd.DataFrame({
+                "pos_report_id": report_ids,
+                "transaction_date": dates,
+                "product_sku": np.char.add("SKU-", np.char.zfill(sku_idx.astype(str), 6)),
+                "quantity": quantities,
+                "sale_amount": np.round(quantities * sku_prices[sku_idx], 2),
+                "account_id": account_idx + 1,
+                "vendor_id": vendor_idx + 1,
+                "original_customer_name": flat_options[option_idx],
+            })
+
+            buffer = io.StringIO()
+            frame.to_csv(buffer, index=False, header=False, float_format="%.2f")
+            self._copy_buffer("transactions", tuple(frame.columns), buffer)
+            loaded += size
+
+        # Drop reports that received no transactions
+        self.db.execute(text("""
+            DELETE FROM pos_reports WHERE NOT (pos_report_id = ANY(:used))
+        """), {"used": sorted(used_report_ids)})
+        self.db.execute(text("""
+            UPDATE pos_reports r
+            SET row_count = t.row_count
+            FROM (SELECT pos_report_id, COUNT(*) AS row_count FROM transactions GROUP BY pos_report_id) t
+            WHERE r.pos_report_id = t.pos_report_id
+        """))
+
+        return len(used_report_ids), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic load test data")
+    parser.add_argument("--seed", type=int, default=SeedConfig.seed)
+    parser.add_argument("--accounts", type=int, default=SeedConfig.accounts)
+    parser.add_argument("--aliases-per-account", type=int, default=SeedConfig.aliases_per_account)
+    parser.add_argument("--vendors", type=int, default=SeedConfig.vendors)
+    parser.add_argument("--transactions", type=int, default=SeedConfig.transactions)
+    parser.add_argument("--reset", action="store_true", help="TRUNCATE all data tables first")
+    args = parser.parse_args()
+
+    from app.database.connection import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if args.reset:
+            reset_all_data(db)
+        counts = SyntheticDataSeeder(db, SeedConfig(
+            seed=args.seed,
+            accounts=args.accounts,
+            aliases_per_account=args.aliases_per_account,
+            vendors=args.vendors,
+            transactions=args.transactions,
+        )).run()
+        db.commit()
+        db.execute(text("ANALYZE"))
+        db.commit()
+        counts["vector_index_rows"] = len(rebuild_vector_index(db))
+        print(counts)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
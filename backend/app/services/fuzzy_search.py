@@ -3,14 +3,97 @@ Fuzzy search service for matching customer names using PostgreSQL trigram simila
 
 This is Step A of the AI Classification Agent workflow - internal fuzzy search
 to avoid expensive API calls when we already have the account in our database.
+
+When the reporting vendor is known, the search is first scoped to the accounts
+that vendor has historically sold into (see ``vendor_candidates``) and only
+widened to the full corpus when the scoped search falls below the threshold.
 """
 
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from sqlalchemy import text, func
 from app.models import Account, CustomerNameAlias
 from app.config import settings
+from app.services.normalization import normalize_name
+
+
+# Hot queries, kept as module constants so app.database.query_plans can
+# EXPLAIN exactly the SQL the service runs
+
+EXACT_MATCH_SQL = """
+    SELECT DISTINCT ON (m.name_key)
+        m.name_key, m.account_id, m.account_name, m.matched_text, m.match_type
+    FROM (
+        SELECT a.normalized_name AS name_key, a.account_id, a.account_name,
+               a.account_name AS matched_text, 'exact_account' AS match_type,
+               0 AS priority, a.account_id AS tiebreak
+        FROM accounts a
+        WHERE a.normalized_name = ANY(:name_keys)
+        UNION ALL
+        SELECT c.normalized_name, a.account_id, a.account_name,
+               c.raw_name, 'exact_alias', 1, c.alias_id
+        FROM customer_name_aliases c
+        JOIN accounts a ON c.account_id = a.account_id
+        WHERE c.normalized_name = ANY(:name_keys)
+    ) m
+    ORDER BY m.name_key, m.priority, m.tiebreak
+"""
+
+# Use PostgreSQL trigram similarity with GIN index. The search term is a
+# canonical key, so it is compared with the stored keys, not the raw names
+ACCOUNT_NAME_SEARCH_SQL = """
+    SELECT 
+        a.account_id,
+        a.account_name,
+        similarity(a.normalized_name, :search_term) as sim_score
+    FROM accounts a
+    WHERE a.normalized_name % :search_term
+    ORDER BY sim_score DESC
+    LIMIT :limit
+"""
+
+# Search aliases and join with accounts to get account info
+ALIAS_SEARCH_SQL = """
+    SELECT 
+        a.account_id,
+        a.account_name,
+        c.raw_name as matched_alias,
+        similarity(c.normalized_name, :search_term) as sim_score
+    FROM customer_name_aliases c
+    JOIN accounts a ON c.account_id = a.account_id
+    WHERE c.normalized_name % :search_term
+    ORDER BY sim_score DESC
+    LIMIT :limit
+"""
+
+VENDOR_ACCOUNT_NAME_SEARCH_SQL = """
+    SELECT 
+        a.account_id,
+        a.account_name,
+        similarity(a.normalized_name, :search_term) as sim_score
+    FROM vendor_account_candidates v
+    JOIN accounts a ON a.account_id = v.account_id
+    WHERE v.vendor_id = :vendor_id
+      AND a.normalized_name % :search_term
+    ORDER BY sim_score DESC
+    LIMIT :limit
+"""
+
+VENDOR_ALIAS_SEARCH_SQL = """
+    SELECT 
+        a.account_id,
+        a.account_name,
+        c.raw_name as matched_alias,
+        similarity(c.normalized_name, :search_term) as sim_score
+    FROM vendor_account_candidates v
+    JOIN customer_name_aliases c ON c.account_id = v.account_id
+    JOIN accounts a ON a.account_id = v.account_id
+    WHERE v.vendor_id = :vendor_id
+      AND c.normalized_name % :search_term
+    ORDER BY sim_score DESC
+    LIMIT :limit
+"""
 
 
 @dataclass
@@ -20,7 +103,7 @@ class FuzzyMatchResult:
     account_name: str
     matched_text: str  # The text that was matched (account name or alias)
     similarity_score: float
-    match_type: str  # 'account_name' or 'alias'
+    match_type: str  # 'account_name', 'alias', 'exact_account' or 'exact_alias'
     confidence_level: str  # 'high', 'medium', 'low'
 
 
@@ -38,7 +121,7 @@ class FuzzySearchService:
         self.db = db_session
         self.confidence_threshold = confidence_threshold or settings.fuzzy_match_threshold
     
-    def find_best_match(self, raw_customer_name: str) -> Optional[FuzzyMatchResult]:
+    def find_best_match(self, raw_customer_name: str, vendor_id: Optional[int] = None) -> Optional[FuzzyMatchResult]:
         """
         Find the best matching account for a raw customer name.
         
@@ -46,7 +129,9 @@ class FuzzySearchService:
         already exists before doing web research.
         
         Args:
-            raw_customer_name: The raw customer name from POS data (e.g., "USN", "CVN74")
+            raw_customer_name: The raw customer name from POS data (e.g., "USN", "CVN74"),
+                or its canonical key (normalizing a key returns it unchanged)
+            vendor_id: Vendor that reported the name; searches its historical accounts first
             
         Returns:
             FuzzyMatchResult if a high-confidence match is found, None otherwise
@@ -54,15 +139,26 @@ class FuzzySearchService:
         if not raw_customer_name or len(raw_customer_name.strip()) < 2:
             return None
             
-        # Clean the input
-        cleaned_name = raw_customer_name.strip()
+        # Clean the input into the same key space as accounts/aliases.normalized_name
+        cleaned_name = normalize_name(raw_customer_name)
+        
+        if vendor_id is not None:
+            # Search the vendor's candidate accounts first
+            scoped_match = self._best_of(
+                self._search_vendor_account_names(cleaned_name, vendor_id)
+                + self._search_vendor_aliases(cleaned_name, vendor_id)
+            )
+            if scoped_match is not None:
+                return scoped_match
         
         # Search both account names and aliases
         account_matches = self._search_account_names(cleaned_name)
         alias_matches = self._search_aliases(cleaned_name)
         
-        # Combine and find the best match
-        all_matches = account_matches + alias_matches
+        return self._best_of(account_matches + alias_matches)
+
+    def _best_of(self, all_matches: List[FuzzyMatchResult]) -> Optional[FuzzyMatchResult]:
+        """Highest-scoring match, if it meets the confidence threshold"""
         if not all_matches:
             return None
             
@@ -75,6 +171,43 @@ class FuzzySearchService:
             
         return None
     
+    def find_exact_matches(self, name_keys: List[str]) -> Dict[str, FuzzyMatchResult]:
+        """
+        Resolve names whose canonical key equals an account's or alias's key.
+
+        Exact-key hits skip the trigram search entirely. Account names win
+        over aliases when a name matches both.
+
+        Args:
+            name_keys: Canonical keys from ``normalize_names``
+
+        Returns:
+            Mapping of name key to its exact match, for names that have one
+        """
+        if not name_keys:
+            return {}
+
+        try:
+            query = text(EXACT_MATCH_SQL)
+
+            results = self.db.execute(query, {'name_keys': list(name_keys)}).fetchall()
+
+            return {
+                row.name_key: FuzzyMatchResult(
+                    account_id=row.account_id,
+                    account_name=row.account_name,
+                    matched_text=row.matched_text,
+                    similarity_score=1.0,
+                    match_type=row.match_type,
+                    confidence_level='high'
+                )
+                for row in results
+            }
+
+        except Exception as e:
+            print(f"Error in exact name lookup: {e}")
+            return {}
+
     def find_all_matches(self, raw_customer_name: str, limit: int = 10) -> List[FuzzyMatchResult]:
         """
         Find all potential matches for debugging/admin purposes.
@@ -89,7 +222,7 @@ class FuzzySearchService:
         if not raw_customer_name or len(raw_customer_name.strip()) < 2:
             return []
             
-        cleaned_name = raw_customer_name.strip()
+        cleaned_name = normalize_name(raw_customer_name)
         
         # Search both account names and aliases
         account_matches = self._search_account_names(cleaned_name, limit)
@@ -104,17 +237,7 @@ class FuzzySearchService:
     def _search_account_names(self, search_term: str, limit: int = 5) -> List[FuzzyMatchResult]:
         """Search for matches in the accounts table using account names"""
         try:
-            # Use PostgreSQL trigram similarity with GIN index
-            query = text("""
-                SELECT 
-                    a.account_id,
-                    a.account_name,
-                    similarity(a.account_name, :search_term) as sim_score
-                FROM accounts a
-                WHERE a.account_name % :search_term
-                ORDER BY sim_score DESC
-                LIMIT :limit
-            """)
+            query = text(ACCOUNT_NAME_SEARCH_SQL)
             
             results = self.db.execute(query, {
                 'search_term': search_term,
@@ -143,19 +266,7 @@ class FuzzySearchService:
     def _search_aliases(self, search_term: str, limit: int = 5) -> List[FuzzyMatchResult]:
         """Search for matches in the customer name aliases table"""
         try:
-            # Search aliases and join with accounts to get account info
-            query = text("""
-                SELECT 
-                    a.account_id,
-                    a.account_name,
-                    c.raw_name as matched_alias,
-                    similarity(c.raw_name, :search_term) as sim_score
-                FROM customer_name_aliases c
-                JOIN accounts a ON c.account_id = a.account_id
-                WHERE c.raw_name % :search_term
-                ORDER BY sim_score DESC
-                LIMIT :limit
-            """)
+            query = text(ALIAS_SEARCH_SQL)
             
             results = self.db.execute(query, {
                 'search_term': search_term,
@@ -180,6 +291,60 @@ class FuzzySearchService:
             print(f"Error in alias fuzzy search: {e}")
             return []
     
+    def _search_vendor_account_names(self, search_term: str, vendor_id: int, limit: int = 5) -> List[FuzzyMatchResult]:
+        """Search account names among the accounts a vendor has sold into"""
+        try:
+            query = text(VENDOR_ACCOUNT_NAME_SEARCH_SQL)
+            
+            results = self.db.execute(query, {
+                'search_term': search_term,
+                'vendor_id': vendor_id,
+                'limit': limit
+            }).fetchall()
+            
+            return [
+                FuzzyMatchResult(
+                    account_id=row.account_id,
+                    account_name=row.account_name,
+                    matched_text=row.account_name,
+                    similarity_score=float(row.sim_score),
+                    match_type='account_name',
+                    confidence_level=self._determine_confidence_level(row.sim_score)
+                )
+                for row in results
+            ]
+            
+        except Exception as e:
+            print(f"Error in vendor-scoped account name search: {e}")
+            return []
+    
+    def _search_vendor_aliases(self, search_term: str, vendor_id: int, limit: int = 5) -> List[FuzzyMatchResult]:
+        """Search aliases of the accounts a vendor has sold into"""
+        try:
+            query = text(VENDOR_ALIAS_SEARCH_SQL)
+            
+            results = self.db.execute(query, {
+                'search_term': search_term,
+                'vendor_id': vendor_id,
+                'limit': limit
+            }).fetchall()
+            
+            return [
+                FuzzyMatchResult(
+                    account_id=row.account_id,
+                    account_name=row.account_name,
+                    matched_text=row.matched_alias,
+                    similarity_score=float(row.sim_score),
+                    match_type='alias',
+                    confidence_level=self._determine_confidence_level(row.sim_score)
+                )
+                for row in results
+            ]
+            
+        except Exception as e:
+            print(f"Error in vendor-scoped alias search: {e}")
+            return []
+    
     def _determine_confidence_level(self, similarity_score: float) -> str:
         """Determine confidence level based on similarity score"""
         if similarity_score >= 0.8:
@@ -0,0 +1,1164 @@
+"""
+POS report ingestion service.
+
+Parses uploaded POS files, resolves every distinct End Customer Name against the
+existing accounts (Step A of the AI Classification Agent workflow, backed by the
+local vector-similarity index for names fuzzy search misses) and inserts the
+transaction rows.
+
+Parsing and name matching are CPU-bound and would otherwise be serialized by
+the GIL, so they are fanned out to a pool of worker processes. Customer names
+are sharded by a stable hash of their normalized form: the same name always
+lands on the same worker, which keeps each worker's match cache effective
+for the duration of an ingestion. Every worker opens its own database
+session from ``SessionLocal``.
+
+A .csv file is split into byte ranges on record boundaries and each worker
+decodes and parses whole ranges itself, so the parse phase scales with the
+worker count. An .xlsx file is a zip of XML that cannot be split that way;
+it is decoded in the calling process, which bounds its parse phase at the
+decode rate. Database writes stay in the calling process.
+``python -m app.services.ingestion`` measures how parsing scales with the
+worker count.
+
+Re-uploads are idempotent. An identical file (same SHA-256) from the same
+vendor is skipped outright, and a corrected file is diffed against the report
+it replaces by per-row content hashes: unchanged rows are left alone, new rows
+are inserted and rows missing from the new file are removed. Database writes
+and name matching therefore scale with the size of the diff, not the file.
+A file only counts as a correction when the caller names the report it
+replaces, or when an earlier report covering exactly the same dates already
+holds most of its dated rows.
+
+Progress (rows parsed, names resolved per tier) is reported through an
+``IngestionProgressTracker`` so upload jobs can be followed live.
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import column, insert, table, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Vendor
+from app.services.alias_learning import SOURCE_FUZZY, AliasLearningService, LearnedAlias
+from app.services.fuzzy_search import FuzzySearchService
+from app.services.normalization import backfill_normalized_names, normalize_names
+from app.services.progress import IngestionProgressTracker
+from app.services.report_snapshots import report_snapshots
+from app.services.vector_index import get_vector_index
+from app.services.vendor_candidates import rebuild_vendor_candidates, record_vendor_accounts
+
+
+# Accepted header spellings for each POS field (compared case-insensitively)
+COLUMN_ALIASES = {
+    "transaction_date": ("transaction date", "date", "invoice date", "ship date", "sale date"),
+    "product_sku": ("product sku", "sku", "part number", "product"),
+    "quantity": ("quantity", "qty", "units"),
+    "sale_amount": ("sale amount", "amount", "extended price", "total", "revenue"),
+    "customer_name": ("end customer name", "end customer", "customer name", "customer"),
+}
+
+REQUIRED_COLUMNS = ("customer_name",)
+
+# Names sent to a shard worker per task
+NAME_BATCH_SIZE = 1000
+
+# Bytes of a .csv file a worker decodes and parses per task
+CSV_RANGE_BYTES = 8 * 1024 * 1024
+
+# Bytes scanned at a time when looking for the end of a CSV record
+_RECORD_SCAN_BYTES = 64 * 1024
+
+# Row hashes sampled from an upload to detect which earlier report it corrects
+REUPLOAD_SAMPLE_SIZE = 200
+
+# Fraction of sampled rows that must already exist in a report to treat the upload as its correction
+REUPLOAD_OVERLAP_THRESHOLD = 0.5
+
+# Overlapping reports checked for a matching date span, most overlap first
+REUPLOAD_CANDIDATES = 5
+
+# Lightweight table construct so bulk inserts use executemany "insertmanyvalues" batching
+transactions_table = table(
+    "transactions",
+    column("pos_report_id"),
+    column("transaction_date"),
+    column("product_sku"),
+    column("quantity"),
+    column("sale_amount"),
+    column("account_id"),
+    column("vendor_id"),
+    column("original_customer_name"),
+    column("row_hash"),
+)
+
+
+class ParsedRow(NamedTuple):
+    """A parsed POS row ready for insertion"""
+    transaction_date: Optional[date]
+    product_sku: Optional[str]
+    quantity: Optional[int]
+    sale_amount: Optional[Decimal]
+    original_customer_name: str
+    name_key: str
+    row_hash: str
+
+
+class ReportCandidate(NamedTuple):
+    """An earlier report holding some of an upload's sampled rows"""
+    pos_report_id: int
+    overlap: int
+    first_date: Optional[date]
+    last_date: Optional[date]
+
+
+# (account_id, match_type, similarity_score) for a resolved name, None when unresolved
+NameMatch = Optional[Tuple[int, str, float]]
+
+
+@dataclass
+class IngestionResult:
+    """Summary of a POS file ingestion"""
+    status: str  # 'created', 'updated' or 'duplicate'
+    pos_report_id: int
+    vendor_id: Optional[int]
+    file_sha256: str
+    rows_processed: int
+    rows_inserted: int
+    rows_unchanged: int
+    rows_removed: int
+    rows_skipped: int
+    distinct_names: int
+    names_exact: int
+    names_fuzzy: int
+    names_vector: int
+    aliases_learned: int
+    unresolved_names: List[str] = field(default_factory=list)
+
+
+def shard_for_name(name_key: str, shard_count: int) -> int:
+    """
+    Map a normalized name to a worker shard.
+
+    Uses a keyed digest rather than ``hash()`` because string hashing is
+    randomized per interpreter and would differ between processes.
+    """
+    digest = hashlib.blake2b(name_key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_row(vendor_id: int, transaction_date, sku, quantity, amount, name_key: str) -> str:
+    """Content hash identifying a transaction row across uploads"""
+    content = "\x1f".join(
+        "" if value is None else str(value)
+        for value in (vendor_id, transaction_date, sku, quantity, amount, name_key)
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def resolution_tier(match: NameMatch) -> str:
+    """Progress tier for a name match"""
+    if match is None:
+        return "unresolved"
+    if match[1].startswith("exact_"):
+        return "exact"
+    return "vector" if match[1].startswith("vector_") else "fuzzy"
+
+
+def estimate_row_count(file_path: str) -> Optional[int]:
+    """Data row count from the worksheet dimensions, when the file type records one"""
+    if Path(file_path).suffix.lower() != ".xlsx":
+        return None
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        max_row = workbook.active.max_row
+        return max(0, max_row - 1) if max_row else None
+    finally:
+        workbook.close()
+
+
+def read_pos_file(file_path: str) -> Tuple[Dict[str, int], Iterator[Sequence]]:
+    """
+    Open a POS report and return its column mapping and a row iterator.
+
+    Rows are streamed (openpyxl read-only mode for .xlsx) so the whole
+    workbook is never loaded into memory.
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix == ".csv":
+        handle = open(file_path, newline="", encoding="utf-8-sig")
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        rows = _close_after(reader, handle.close)
+    elif suffix == ".xlsx":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        reader = workbook.active.iter_rows(values_only=True)
+        header = next(reader, None)
+        rows = _close_after(reader, workbook.close)
+    else:
+        raise ValueError(f"Unsupported POS file type: {suffix or 'unknown'}")
+
+    if header is None:
+        raise ValueError("POS file is empty")
+
+    return _map_columns(header), rows
+
+
+def _record_end(data: np.ndarray, position: int, in_quotes: bool) -> int:
+    """
+    Offset just past the first record-ending newline at or after ``position``.
+
+    A newline ends a record only outside a quoted field. Quotes inside a
+    field are doubled, so the quote count's parity tells which side of a
+    quote a byte is on. Neither byte occurs inside a multi-byte UTF-8
+    sequence, so the raw bytes can be scanned without decoding.
+    """
+    while position < len(data):
+        block = data[position:position + _RECORD_SCAN_BYTES]
+        quoted = (np.cumsum(block == ord('"')) + in_quotes) % 2 == 1
+        ends = np.flatnonzero((block == ord("\n")) & ~quoted)
+        if len(ends):
+            return position + int(ends[0]) + 1
+        in_quotes = bool(quoted[-1])
+        position += len(block)
+    return len(data)
+
+
+def split_csv_records(file_path: str, range_bytes: int = CSV_RANGE_BYTES) -> Tuple[Dict[str, int], List[Tuple[int, int]]]:
+    """
+    Column mapping of a .csv POS report and byte ranges of its data records.
+
+    Each range holds whole records, so workers can decode and parse ranges
+    independently; read in order, the ranges yield the same rows as one
+    reader over the file.
+
+    Args:
+        file_path: Path to a .csv POS report
+        range_bytes: Approximate size of each range
+
+    Returns:
+        (column mapping, [(start, end) byte offsets])
+    """
+    if os.path.getsize(file_path) == 0:
+        raise ValueError("POS file is empty")
+
+    data = np.memmap(file_path, dtype=np.uint8, mode="r")
+    header_end = _record_end(data, 0, False)
+    header = next(csv.reader(io.StringIO(bytes(data[:header_end]).decode("utf-8-sig"), newline="")), None)
+    if header is None:
+        raise ValueError("POS file is empty")
+
+    # Every range starts on a record boundary, outside any quoted field
+    bounds = [header_end]
+    while bounds[-1] < len(data):
+        start = bounds[-1]
+        target = min(start + range_bytes, len(data))
+        in_quotes = np.count_nonzero(data[start:target] == ord('"')) % 2 == 1
+        bounds.append(_record_end(data, target, in_quotes))
+    del data
+
+    return _map_columns(header), list(zip(bounds, bounds[1:]))
+
+
+def parse_csv_range(file_path: str, start: int, end: int, columns: Dict[str, int],
+                    vendor_id: int) -> Tuple[int, List[ParsedRow]]:
+    """Decode and parse the records in one byte range of a .csv POS report (runs in a worker)"""
+    with open(file_path, "rb") as handle:
+        handle.seek(start)
+        content = handle.read(end - start).decode("utf-8")
+    rows = list(csv.reader(io.StringIO(content, newline="")))
+    return len(rows), parse_rows(columns, rows, vendor_id)
+
+
+def _close_after(rows: Iterator[Sequence], close) -> Iterator[Sequence]:
+    try:
+        yield from rows
+    finally:
+        close()
+
+
+def _map_columns(header: Sequence) -> Dict[str, int]:
+    """Map canonical field names to column positions in the header row"""
+    positions = {
+        str(name).strip().lower(): index
+        for index, name in enumerate(header)
+        if name is not None
+    }
+
+    columns = {}
+    for field_name, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in positions:
+                columns[field_name] = positions[alias]
+                break
+
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"POS file is missing required columns: {', '.join(missing)}")
+
+    return columns
+
+
+def _cell(row: Sequence, index: Optional[int]):
+    if index is None or index >= len(row):
+        return None
+    value = row[index]
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _parse_date(value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%d-%b-%Y"):
+        try:
+            return datetime.strptime(str(value), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_quantity(value) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(Decimal(str(value).replace(",", "")))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _parse_amount(value) -> Optional[Decimal]:
+    if value is None:
+        return None
+    try:
+        cleaned = str(value).replace(",", "").replace("$", "")
+        if cleaned.startswith("(") and cleaned.endswith(")"):
+            cleaned = "-" + cleaned[1:-1]
+        return Decimal(cleaned).quantize(Decimal("0.01"))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def parse_rows(columns: Dict[str, int], rows: List[Sequence], vendor_id: int) -> List[ParsedRow]:
+    """Parse, normalize and hash a chunk of raw POS rows, dropping rows without a customer name"""
+    named_rows = []
+    for row in rows:
+        raw_name = _cell(row, columns["customer_name"])
+        if raw_name is not None:
+            named_rows.append((row, str(raw_name)[:255]))
+
+    # Normalize the whole name column at once
+    name_keys = normalize_names([raw_name for _, raw_name in named_rows])
+
+    parsed = []
+    for (row, raw_name), name_key in zip(named_rows, name_keys):
+        sku = _cell(row, columns.get("product_sku"))
+        sku = str(sku)[:100] if sku is not None else None
+        transaction_date = _parse_date(_cell(row, columns.get("transaction_date")))
+        quantity = _parse_quantity(_cell(row, columns.get("quantity")))
+        amount = _parse_amount(_cell(row, columns.get("sale_amount")))
+        parsed.append(ParsedRow(
+            transaction_date, sku, quantity, amount, raw_name, name_key,
+            hash_row(vendor_id, transaction_date, sku, quantity, amount, name_key),
+        ))
+    return parsed
+
+
+def disambiguate_row_hashes(parsed: List[ParsedRow]) -> List[ParsedRow]:
+    """
+    Make row hashes unique within a file.
+
+    Identical line items legitimately repeat, so the n-th repeat of a hash is
+    re-hashed with its occurrence number. A repeat count that changes between
+    uploads then shows up as an insert or a removal like any other row.
+    """
+    hashes = disambiguate_hashes([row.row_hash for row in parsed])
+    return [
+        row if row.row_hash == row_hash else row._replace(row_hash=row_hash)
+        for row, row_hash in zip(parsed, hashes)
+    ]
+
+
+def disambiguate_hashes(row_hashes: Sequence[str]) -> List[str]:
+    """Re-hash the n-th repeat of each hash with its occurrence number, in order"""
+    seen: Dict[str, int] = {}
+    unique = []
+    for row_hash in row_hashes:
+        occurrence = seen.get(row_hash, 0)
+        seen[row_hash] = occurrence + 1
+        if occurrence:
+            row_hash = hashlib.sha256(f"{row_hash}:{occurrence}".encode("utf-8")).hexdigest()
+        unique.append(row_hash)
+    return unique
+
+
+def correction_sample(parsed: List[ParsedRow]) -> Tuple[List[str], Optional[Tuple[date, date]]]:
+    """
+    Row hashes sampled to find the report an upload corrects, and the upload's date span.
+
+    Undated rows are left out: a recurring line without a date hashes the
+    same in every period's report and would make a new period look like a
+    correction of the last one.
+    """
+    dated = [row for row in parsed if row.transaction_date is not None]
+    if not dated:
+        return [], None
+    step = max(1, len(dated) // REUPLOAD_SAMPLE_SIZE)
+    sample = [row.row_hash for row in dated[::step][:REUPLOAD_SAMPLE_SIZE]]
+    dates = [row.transaction_date for row in dated]
+    return sample, (min(dates), max(dates))
+
+
+def choose_replaced_report(candidates: Sequence[ReportCandidate], sample_size: int,
+                           date_span: Optional[Tuple[date, date]]) -> Optional[int]:
+    """
+    Pick the report an upload corrects, if any.
+
+    Overlap alone is not enough: the report must also cover exactly the
+    upload's date span, so next month's report repeating this month's lines
+    is never mistaken for a correction.
+    """
+    if not sample_size or date_span is None:
+        return None
+    for candidate in sorted(candidates, key=lambda candidate: candidate.overlap, reverse=True):
+        if candidate.overlap < sample_size * REUPLOAD_OVERLAP_THRESHOLD:
+            break
+        if (candidate.first_date, candidate.last_date) == date_span:
+            return candidate.pos_report_id
+    return None
+
+
+def rehash_transactions(db, name_keys: Callable[[List[str]], List[str]] = normalize_names,
+                        batch_size: int = 10000) -> int:
+    """
+    Recompute ``row_hash`` on stored transactions after the hash inputs change.
+
+    Every input of ``hash_row`` is stored on the transaction, so hashes are
+    rebuilt report by report. Repeats are numbered in ``transaction_id``
+    order, which is the file order they were inserted in (rows added by a
+    correction only ever extend a repeat count). The caller owns the
+    transaction.
+
+    Args:
+        db: Session or connection
+        name_keys: Name-key function the hashes are built with
+        batch_size: Rows updated per round trip
+
+    Returns:
+        Number of rows whose hash changed
+    """
+    report_ids = db.execute(text("""
+        SELECT DISTINCT pos_report_id
+        FROM transactions
+        WHERE row_hash IS NOT NULL AND pos_report_id IS NOT NULL
+        ORDER BY pos_report_id
+    """)).scalars().all()
+
+    updated = 0
+    for pos_report_id in report_ids:
+        rows = db.execute(text("""
+            SELECT transaction_id, vendor_id, transaction_date, product_sku, quantity,
+                   sale_amount, original_customer_name
+            FROM transactions
+            WHERE pos_report_id = :pos_report_id AND row_hash IS NOT NULL
+            ORDER BY transaction_id
+        """), {"pos_report_id": pos_report_id}).fetchall()
+
+        keys = name_keys([row.original_customer_name or "" for row in rows])
+        hashes = disambiguate_hashes([
+            hash_row(row.vendor_id, row.transaction_date, row.product_sku, row.quantity, row.sale_amount, key)
+            for row, key in zip(rows, keys)
+        ])
+
+        for start in range(0, len(rows), batch_size):
+            updated += db.execute(text("""
+                UPDATE transactions t
+                SET row_hash = v.row_hash
+                FROM unnest(CAST(:ids AS integer[]), CAST(:hashes AS varchar[])) AS v(transaction_id, row_hash)
+                WHERE t.transaction_id = v.transaction_id
+                  AND t.row_hash IS DISTINCT FROM v.row_hash
+            """), {
+                "ids": [row.transaction_id for row in rows[start:start + batch_size]],
+                "hashes": hashes[start:start + batch_size],
+            }).rowcount
+    return updated
+
+
+def match_names(db: Session, name_keys: List[str], cache: Dict[str, NameMatch],
+                vendor_id: Optional[int] = None) -> Dict[str, NameMatch]:
+    """
+    Resolve names with one batched exact-key lookup, then Step A fuzzy search,
+    then one batched vector-index query for the names fuzzy search missed.
+
+    Only exact hits are cached. Fuzzy hits are learned as aliases after the
+    ingestion commits, so the next report resolves them exactly; misses are
+    never cached because a later ingestion may create the account.
+    """
+    fuzzy_service = FuzzySearchService(db)
+    resolved = {}
+    misses = []
+    try:
+        exact_matches = fuzzy_service.find_exact_matches([key for key in name_keys if key not in cache])
+        for name_key in name_keys:
+            if name_key in cache:
+                resolved[name_key] = cache[name_key]
+                continue
+            match = exact_matches.get(name_key)
+            if match is not None:
+                cache[name_key] = (match.account_id, match.match_type, match.similarity_score)
+                resolved[name_key] = cache[name_key]
+                continue
+            match = fuzzy_service.find_best_match(name_key, vendor_id=vendor_id)
+            if match is None:
+                misses.append(name_key)
+            resolved[name_key] = (
+                (match.account_id, match.match_type, match.similarity_score) if match else None
+            )
+    finally:
+        # Read-only work; don't leave the worker's connection idle in a transaction
+        db.rollback()
+
+    resolved.update(match_vectors(misses))
+    return resolved
+
+
+def match_vectors(name_keys: List[str]) -> Dict[str, NameMatch]:
+    """
+    Look up names in the vector-similarity index.
+
+    A hit needs the configured similarity and a clear lead over the next
+    account, since hashed n-grams score every shared word.
+    """
+    index = get_vector_index()
+    if index is None or not name_keys:
+        return {}
+
+    resolved = {}
+    for name_key, candidates in zip(name_keys, index.search(name_keys, k=2)):
+        if not candidates or candidates[0].score < settings.vector_match_threshold:
+            continue
+        runner_up = candidates[1].score if len(candidates) > 1 else 0.0
+        if candidates[0].score - runner_up < settings.vector_match_margin:
+            continue
+        best = candidates[0]
+        resolved[name_key] = (best.account_id, f"vector_{best.kind}", best.score)
+    return resolved
+
+
+# Per-process state, populated by _init_worker in each pool process. The match
+# cache is scoped to one ingestion, like IngestionService._local_matches: a
+# data reset or alias import between ingestions can re-point any cached name
+_worker_session: Optional[Session] = None
+_worker_matches: Dict[str, NameMatch] = {}
+_worker_cache_owner: Optional[str] = None
+
+
+def _init_worker():
+    """Give each worker process its own database session"""
+    global _worker_session
+    from app.database.connection import SessionLocal
+
+    _worker_session = SessionLocal()
+
+
+def _worker_match_names(cache_owner: str, name_keys: List[str], vendor_id: Optional[int] = None,
+                        profile_sample_rate: Optional[float] = None) -> Tuple[Dict[str, NameMatch], List[dict]]:
+    """
+    Resolve a batch of names in a worker process.
+
+    The worker's SQL profiler follows the parent's (``profile_sample_rate``
+    is None when it is off) and the statistics it collected are returned
+    with the matches, since /admin/sql-profile only reads the parent process.
+    """
+    global _worker_cache_owner
+    from app.database.connection import engine, sql_profiler
+
+    if cache_owner != _worker_cache_owner:
+        _worker_matches.clear()
+        _worker_cache_owner = cache_owner
+
+    if profile_sample_rate is None:
+        sql_profiler.uninstall(engine)
+    else:
+        sql_profiler.sample_rate = profile_sample_rate
+        sql_profiler.install(engine)
+
+    matches = match_names(_worker_session, name_keys, _worker_matches, vendor_id)
+    return matches, sql_profiler.drain()
+
+
+class IngestionWorkerPool:
+    """
+    Pool of single-process executors, one per shard.
+
+    A plain ProcessPoolExecutor hands tasks to whichever process is free,
+    which would scatter a name across caches; pinning each shard to its own
+    executor keeps name affinity.
+    """
+
+    def __init__(self, workers: int):
+        context = multiprocessing.get_context("spawn")
+        self.executors = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_init_worker)
+            for _ in range(workers)
+        ]
+
+    @property
+    def size(self) -> int:
+        return len(self.executors)
+
+    def for_name(self, name_key: str) -> ProcessPoolExecutor:
+        return self.executors[shard_for_name(name_key, self.size)]
+
+    def shutdown(self):
+        for executor in self.executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: Optional[IngestionWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool(workers: int) -> IngestionWorkerPool:
+    """Return the process-wide worker pool, (re)creating it for the requested size"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.size != workers:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = IngestionWorkerPool(workers)
+        return _pool
+
+
+def shutdown_worker_pool():
+    """Stop the worker processes (called on application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+class IngestionService:
+    """Service for ingesting POS report files into transactions"""
+
+    def __init__(self, db_session: Session, workers: int = None, chunk_size: int = None,
+                 progress: IngestionProgressTracker = None):
+        """
+        Initialize ingestion service
+
+        Args:
+            db_session: SQLAlchemy database session used for writes
+            workers: Number of worker processes (1 runs everything in-process)
+            chunk_size: Number of rows per parse/insert chunk
+            progress: Tracker that receives progress updates
+        """
+        self.db = db_session
+        self.progress = progress or IngestionProgressTracker(job_id="")
+        self.workers = workers or settings.ingestion_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or settings.ingestion_chunk_size
+        self._local_matches: Dict[str, NameMatch] = {}
+        # Identifies this ingestion's share of the worker match caches
+        self._cache_owner = uuid.uuid4().hex
+
+    def ingest_file(self, file_path: str, vendor_name: str, file_name: str = None,
+                    replaces_report_id: int = None) -> IngestionResult:
+        """
+        Ingest a POS report file for a vendor.
+
+        Args:
+            file_path: Path to a .xlsx or .csv POS report
+            vendor_name: Distribution partner that submitted the report
+            file_name: Original file name, recorded on the report
+            replaces_report_id: Report this file corrects; when omitted, detected from row
+                overlap with a report covering the same dates
+
+        Returns:
+            IngestionResult summarizing the ingestion
+        """
+        file_sha256 = hash_file(file_path)
+        vendor_id = self._get_or_create_vendor(vendor_name)
+        duplicate = self.db.execute(text("""
+            SELECT pos_report_id, vendor_id, row_count
+            FROM pos_reports
+            WHERE file_sha256 = :file_sha256 AND vendor_id = :vendor_id
+        """), {"file_sha256": file_sha256, "vendor_id": vendor_id}).first()
+        if duplicate is not None:
+            return IngestionResult(
+                status="duplicate",
+                pos_report_id=duplicate.pos_report_id,
+                vendor_id=duplicate.vendor_id,
+                file_sha256=file_sha256,
+                rows_processed=0,
+                rows_inserted=0,
+                rows_unchanged=duplicate.row_count or 0,
+                rows_removed=0,
+                rows_skipped=0,
+                distinct_names=0,
+                names_exact=0,
+                names_fuzzy=0,
+                names_vector=0,
+                aliases_learned=0,
+            )
+
+        # Accounts and aliases written outside ingestion may not have keys yet;
+        # commit them so worker sessions see them too
+        if backfill_normalized_names(self.db):
+            self.db.commit()
+
+        pool = get_worker_pool(self.workers) if self.workers > 1 else None
+        self.progress.start(estimate_row_count(file_path))
+
+        rows_processed, parsed = self._parse_file(file_path, vendor_id, pool)
+        parsed = disambiguate_row_hashes(parsed)
+
+        if replaces_report_id is None:
+            replaces_report_id = self._find_replaced_report(vendor_id, parsed)
+        elif not self._report_belongs_to_vendor(replaces_report_id, vendor_id):
+            raise ValueError(f"POS report {replaces_report_id} does not exist for vendor {vendor_name}")
+
+        if replaces_report_id is None:
+            status = "created"
+            pos_report_id = self._create_report(vendor_id, file_name)
+            existing_hashes: Set[str] = set()
+        else:
+            status = "updated"
+            pos_report_id = replaces_report_id
+            existing_hashes = self._existing_row_hashes(pos_report_id)
+
+        file_hashes = {row.row_hash for row in parsed}
+        new_rows = [row for row in parsed if row.row_hash not in existing_hashes]
+        removed_hashes = existing_hashes - file_hashes
+
+        # Only names on new rows need resolving
+        name_keys = {row.name_key for row in new_rows}
+        self.progress.set_phase("resolving")
+        self.progress.names_queued(len(name_keys))
+        matches = self._resolve_names(name_keys, pool, vendor_id)
+        self.progress.set_phase("writing")
+
+        tiers = [resolution_tier(match) for match in matches.values()]
+        names_exact = tiers.count("exact")
+        names_fuzzy = tiers.count("fuzzy")
+        names_vector = tiers.count("vector")
+        names_unresolved = tiers.count("unresolved")
+
+        rows_inserted = self._insert_transactions(new_rows, matches, pos_report_id, vendor_id)
+        rows_removed = self._delete_transactions(pos_report_id, removed_hashes)
+        aliases_learned = self._learn_aliases(new_rows, matches)
+        if rows_removed:
+            # Removed rows can't be subtracted from last_seen; recount this vendor
+            rebuild_vendor_candidates(self.db, vendor_id)
+        else:
+            record_vendor_accounts(self.db, vendor_id, (
+                (matches[row.name_key][0], row.transaction_date)
+                for row in new_rows if matches.get(row.name_key) is not None
+            ))
+        self.db.execute(text("""
+            UPDATE pos_reports
+            SET file_sha256 = :file_sha256,
+                file_name = COALESCE(:file_name, file_name),
+                row_count = :row_count,
+                exact_hits = COALESCE(exact_hits, 0) + :exact_hits,
+                fuzzy_hits = COALESCE(fuzzy_hits, 0) + :fuzzy_hits,
+                vector_hits = COALESCE(vector_hits, 0) + :vector_hits,
+                unresolved_names = COALESCE(unresolved_names, 0) + :unresolved_names,
+                updated_at = now()
+            WHERE pos_report_id = :pos_report_id
+        """), {
+            "file_sha256": file_sha256,
+            "file_name": file_name,
+            "row_count": len(parsed),
+            "exact_hits": names_exact,
+            "fuzzy_hits": names_fuzzy,
+            "vector_hits": names_vector,
+            "unresolved_names": names_unresolved,
+            "pos_report_id": pos_report_id,
+        })
+        self.db.commit()
+        report_snapshots.invalidate()
+
+        unresolved = sorted({row.original_customer_name for row in new_rows if matches.get(row.name_key) is None})
+        return IngestionResult(
+            status=status,
+            pos_report_id=pos_report_id,
+            vendor_id=vendor_id,
+            file_sha256=file_sha256,
+            rows_processed=rows_processed,
+            rows_inserted=rows_inserted,
+            rows_unchanged=len(parsed) - len(new_rows),
+            rows_removed=rows_removed,
+            rows_skipped=rows_processed - len(parsed),
+            distinct_names=len(name_keys),
+            names_exact=names_exact,
+            names_fuzzy=names_fuzzy,
+            names_vector=names_vector,
+            aliases_learned=aliases_learned,
+            unresolved_names=unresolved,
+        )
+
+    def _chunks(self, rows: Iterator[Sequence]) -> Iterator[List[Sequence]]:
+        chunk = []
+        for row in rows:
+            chunk.append(tuple(row))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _parse_file(self, file_path: str, vendor_id: int,
+                    pool: Optional[IngestionWorkerPool]) -> Tuple[int, List[ParsedRow]]:
+        """Parse a POS file, letting workers decode .csv byte ranges themselves"""
+        if pool is not None and Path(file_path).suffix.lower() == ".csv":
+            columns, ranges = split_csv_records(file_path)
+            return self._parse_ranges(file_path, columns, ranges, vendor_id, pool)
+
+        columns, rows = read_pos_file(file_path)
+        return self._parse(columns, rows, vendor_id, pool)
+
+    def _parse_ranges(self, file_path: str, columns: Dict[str, int], ranges: List[Tuple[int, int]],
+                      vendor_id: int, pool: IngestionWorkerPool) -> Tuple[int, List[ParsedRow]]:
+        """Parse .csv byte ranges round-robin across workers, collecting results in file order"""
+        rows_processed = 0
+        parsed: List[ParsedRow] = []
+        in_flight: deque = deque()
+
+        def collect():
+            nonlocal rows_processed
+            range_rows, range_parsed = in_flight.popleft().result()
+            rows_processed += range_rows
+            parsed.extend(range_parsed)
+            self.progress.rows_parsed(range_rows)
+
+        for index, (start, end) in enumerate(ranges):
+            executor = pool.executors[index % pool.size]
+            in_flight.append(executor.submit(parse_csv_range, file_path, start, end, columns, vendor_id))
+            if len(in_flight) >= pool.size * 2:
+                collect()
+        while in_flight:
+            collect()
+
+        return rows_processed, parsed
+
+    def _parse(self, columns: Dict[str, int], rows: Iterator[Sequence], vendor_id: int,
+               pool: Optional[IngestionWorkerPool]) -> Tuple[int, List[ParsedRow]]:
+        """Parse row chunks, round-robin across workers with a bounded number in flight"""
+        rows_processed = 0
+        parsed: List[ParsedRow] = []
+
+        if pool is None:
+            for chunk in self._chunks(rows):
+                rows_processed += len(chunk)
+                parsed.extend(parse_rows(columns, chunk, vendor_id))
+                self.progress.rows_parsed(len(chunk))
+            return rows_processed, parsed
+
+        in_flight: deque = deque()
+
+        def collect():
+            chunk_size, future = in_flight.popleft()
+            parsed.extend(future.result())
+            self.progress.rows_parsed(chunk_size)
+
+        for index, chunk in enumerate(self._chunks(rows)):
+            rows_processed += len(chunk)
+            executor = pool.executors[index % pool.size]
+            in_flight.append((len(chunk), executor.submit(parse_rows, columns, chunk, vendor_id)))
+            if len(in_flight) >= pool.size * 2:
+                collect()
+        while in_flight:
+            collect()
+
+        return rows_processed, parsed
+
+    def _resolve_names(self, name_keys: set, pool: Optional[IngestionWorkerPool],
+                       vendor_id: Optional[int] = None) -> Dict[str, NameMatch]:
+        """Resolve distinct names, sending each to the worker that owns its shard"""
+        matches: Dict[str, NameMatch] = {}
+        if pool is None:
+            keys = sorted(name_keys)
+            for start in range(0, len(keys), NAME_BATCH_SIZE):
+                batch = match_names(self.db, keys[start:start + NAME_BATCH_SIZE], self._local_matches, vendor_id)
+                self._report_resolved(batch)
+                matches.update(batch)
+            return matches
+
+        shards: Dict[int, List[str]] = {}
+        for name_key in name_keys:
+            shards.setdefault(shard_for_name(name_key, pool.size), []).append(name_key)
+
+        from app.database.connection import sql_profiler
+
+        profile_sample_rate = sql_profiler.sample_rate if sql_profiler.enabled else None
+        futures: List[Future] = []
+        for shard, keys in shards.items():
+            for start in range(0, len(keys), NAME_BATCH_SIZE):
+                batch = keys[start:start + NAME_BATCH_SIZE]
+                futures.append(pool.executors[shard].submit(
+                    _worker_match_names, self._cache_owner, batch, vendor_id, profile_sample_rate
+                ))
+
+        for future in as_completed(futures):
+            batch, profile = future.result()
+            if profile:
+                sql_profiler.merge(profile, caller_prefix="ingestion worker")
+            self._report_resolved(batch)
+            matches.update(batch)
+        return matches
+
+    def _report_resolved(self, batch: Dict[str, NameMatch]):
+        tiers: Dict[str, int] = {}
+        for match in batch.values():
+            tier = resolution_tier(match)
+            tiers[tier] = tiers.get(tier, 0) + 1
+        for tier, count in tiers.items():
+            self.progress.names_resolved(tier, count)
+
+    def _insert_transactions(self, parsed: List[ParsedRow], matches: Dict[str, NameMatch],
+                             pos_report_id: int, vendor_id: int) -> int:
+        for start in range(0, len(parsed), self.chunk_size):
+            batch = [
+                {
+                    "pos_report_id": pos_report_id,
+                    "transaction_date": transaction_date,
+                    "product_sku": sku,
+                    "quantity": quantity,
+                    "sale_amount": amount,
+                    "account_id": matches[name_key][0] if matches.get(name_key) else None,
+                    "vendor_id": vendor_id,
+                    "original_customer_name": raw_name,
+                    "row_hash": row_hash,
+                }
+                for transaction_date, sku, quantity, amount, raw_name, name_key, row_hash
+                in parsed[start:start + self.chunk_size]
+            ]
+            self.db.execute(insert(transactions_table), batch)
+        return len(parsed)
+
+    def _learn_aliases(self, rows: List[ParsedRow], matches: Dict[str, NameMatch]) -> int:
+        """Record each raw spelling that resolved through fuzzy search as an alias"""
+        learned: Dict[str, LearnedAlias] = {}
+        for row in rows:
+            match = matches.get(row.name_key)
+            if resolution_tier(match) != "fuzzy":
+                continue
+            learned.setdefault(row.original_customer_name, LearnedAlias(
+                raw_name=row.original_customer_name,
+                account_id=match[0],
+                source=SOURCE_FUZZY,
+                confidence=match[2],
+            ))
+        return AliasLearningService(self.db).record_aliases(list(learned.values()))
+
+    def _delete_transactions(self, pos_report_id: int, row_hashes: Set[str]) -> int:
+        hashes = sorted(row_hashes)
+        deleted = 0
+        for start in range(0, len(hashes), self.chunk_size):
+            deleted += self.db.execute(text("""
+                DELETE FROM transactions
+                WHERE pos_report_id = :pos_report_id AND row_hash = ANY(:row_hashes)
+            """), {
+                "pos_report_id": pos_report_id,
+                "row_hashes": hashes[start:start + self.chunk_size],
+            }).rowcount
+        return deleted
+
+    def _get_or_create_vendor(self, vendor_name: str) -> int:
+        vendor = self.db.query(Vendor).filter(Vendor.vendor_name == vendor_name).first()
+        if vendor is None:
+            vendor = Vendor(vendor_name=vendor_name)
+            self.db.add(vendor)
+            self.db.flush()
+        return vendor.vendor_id
+
+    def _create_report(self, vendor_id: int, file_name: Optional[str]) -> int:
+        return self.db.execute(text("""
+            INSERT INTO pos_reports (vendor_id, file_name)
+            VALUES (:vendor_id, :file_name)
+            RETURNING pos_report_id
+        """), {"vendor_id": vendor_id, "file_name": file_name}).scalar()
+
+    def _report_belongs_to_vendor(self, pos_report_id: int, vendor_id: int) -> bool:
+        return self.db.execute(text("""
+            SELECT 1 FROM pos_reports
+            WHERE pos_report_id = :pos_report_id AND vendor_id = :vendor_id
+        """), {"pos_report_id": pos_report_id, "vendor_id": vendor_id}).first() is not None
+
+    def _existing_row_hashes(self, pos_report_id: int) -> Set[str]:
+        rows = self.db.execute(text("""
+            SELECT row_hash FROM transactions
+            WHERE pos_report_id = :pos_report_id AND row_hash IS NOT NULL
+        """), {"pos_report_id": pos_report_id})
+        return {row.row_hash for row in rows}
+
+    def _find_replaced_report(self, vendor_id: int, parsed: List[ParsedRow]) -> Optional[int]:
+        """Find the vendor's report for the same dates that already holds most of a sample of this file's rows"""
+        sample, date_span = correction_sample(parsed)
+        if not sample:
+            return None
+
+        rows = self.db.execute(text("""
+            WITH overlaps AS (
+                SELECT t.pos_report_id, COUNT(*) AS overlap
+                FROM transactions t
+                WHERE t.row_hash = ANY(:sample) AND t.vendor_id = :vendor_id
+                GROUP BY t.pos_report_id
+                ORDER BY overlap DESC
+                LIMIT :limit
+            )
+            SELECT o.pos_report_id, o.overlap, span.first_date, span.last_date
+            FROM overlaps o
+            CROSS JOIN LATERAL (
+                SELECT MIN(t.transaction_date) AS first_date, MAX(t.transaction_date) AS last_date
+                FROM transactions t
+                WHERE t.pos_report_id = o.pos_report_id
+            ) span
+        """), {"sample": sample, "vendor_id": vendor_id, "limit": REUPLOAD_CANDIDATES})
+
+        candidates = [ReportCandidate(row.pos_report_id, row.overlap, row.first_date, row.last_date) for row in rows]
+        return choose_replaced_report(candidates, len(sample), date_span)
+
+
+def benchmark(rows: int = 200000, names: int = 5000, worker_counts: Sequence[int] = (1, 2, 4),
+              file_type: str = "csv", seed: int = 0) -> dict:
+    """
+    Time the parse phase of ingestion over a synthetic POS file.
+
+    Workers decode .csv byte ranges themselves. An .xlsx file is decoded in
+    the parent, overlapping with the workers' parsing, so its parse phase
+    cannot finish faster than ``decode_rows_per_second``. Name resolution
+    and writes need a database and are not included.
+
+    Args:
+        rows: Data rows in the file
+        names: Distinct customer names
+        worker_counts: Worker process counts to time
+        file_type: 'csv' or 'xlsx'
+        seed: Random seed
+
+    Returns:
+        Decode throughput and parse throughput and speedup per worker count
+    """
+    import random
+    import tempfile
+
+    rng = random.Random(seed)
+    header = ("Transaction Date", "Product SKU", "Quantity", "Sale Amount", "End Customer Name")
+    customer_names = [f"Customer {n} - Norfolk VA" if n % 3 == 0 else f"CUSTOMER {n} CORP" for n in range(names)]
+    data = [
+        (
+            f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            f"SKU-{rng.randint(1, 500)}",
+            rng.randint(1, 50),
+            f"{rng.uniform(10, 100000):.2f}",
+            rng.choice(customer_names),
+        )
+        for _ in range(rows)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, f"benchmark.{file_type}")
+        if file_type == "csv":
+            with open(file_path, "w", newline="", encoding="utf-8") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(header)
+                writer.writerows(data)
+        else:
+            from openpyxl import Workbook
+
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet()
+            sheet.append(header)
+            for row in data:
+                sheet.append(row)
+            workbook.save(file_path)
+
+        started = time.perf_counter()
+        _, decoded = read_pos_file(file_path)
+        for _ in decoded:
+            pass
+        decode_seconds = time.perf_counter() - started
+
+        results = []
+        try:
+            for workers in worker_counts:
+                service = IngestionService(None, workers=workers)
+                pool = get_worker_pool(workers) if workers > 1 else None
+                if pool is not None:
+                    # Start the worker processes outside the timing
+                    for executor in pool.executors:
+                        executor.submit(parse_rows, {"customer_name": 0}, [("warm up",)], 0).result()
+
+                started = time.perf_counter()
+                service._parse_file(file_path, 1, pool)
+                results.append({"workers": workers, "seconds": time.perf_counter() - started})
+        finally:
+            shutdown_worker_pool()
+
+    baseline = results[0]["seconds"] if results else None
+    return {
+        "rows": rows,
+        "file_type": file_type,
+        "decode_rows_per_second": round(rows / decode_seconds),
+        "parse": [
+            {
+                "workers": result["workers"],
+                "rows_per_second": round(rows / result["seconds"]),
+                "speedup": round(baseline / result["seconds"], 2),
+            }
+            for result in results
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark how POS file parsing scales with worker processes")
+    parser.add_argument("--rows", type=int, default=200000, help="Data rows in the synthetic file")
+    parser.add_argument("--names", type=int, default=5000, help="Distinct customer names")
+    parser.add_argument("--workers", type=int, action="append", help="Worker count to time (repeatable)")
+    parser.add_argument("--file-type", choices=("csv", "xlsx"), default="csv", help="Synthetic file format")
+    args = parser.parse_args()
+
+    print(benchmark(args.rows, args.names, args.workers or (1, 2, 4), args.file_type))
+
+
+if __name__ == "__main__":
+    main()
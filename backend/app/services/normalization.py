@@ -0,0 +1,290 @@
+"""
+Customer name normalization.
+
+POS files spell the same customer many ways: "U.S. Dept. of the Navy",
+"US DEPT OF NAVY", "Dept of Navy - Norfolk VA", "Département ...". Every
+spelling is reduced to one canonical key before any cache or database lookup,
+and the same key is stored on accounts and aliases (``normalized_name``), so
+ingestion, the match caches and alias storage all agree.
+
+Normalization is column-wise: a chunk of names is factorized with pandas so
+each distinct spelling is processed once, then the rule table runs over the
+distinct values with vectorized ``.str`` operations and the keys are mapped
+back to every row with NumPy indexing. POS columns repeat the same names
+heavily, so throughput is dominated by the factorize, not the regexes.
+"""
+
+import argparse
+import re
+import time
+import unicodedata
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+
+_STATES = (
+    "AL|AK|AZ|AR|CA|CO|CT|DE|DC|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|"
+    "NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY|PR|GU|VI"
+)
+
+# Whole-word and phrase rewrites applied after punctuation is removed
+WORD_RULES: Dict[str, str] = {
+    "united states of america": "us",
+    "united states": "us",
+    "usa": "us",
+    "the": "",
+    "dept": "department",
+    "dep": "department",
+    "cmd": "command",
+    "comd": "command",
+    "admin": "administration",
+    "corp": "corporation",
+    "incorporated": "inc",
+    "co": "company",
+    "ltd": "limited",
+    "intl": "international",
+    "natl": "national",
+    "univ": "university",
+    "eng": "engineering",
+    "engr": "engineering",
+    "comms": "communications",
+    "info": "information",
+    "med": "medical",
+    "govt": "government",
+    "gov": "government",
+    "assn": "association",
+    "assoc": "association",
+    "ctr": "center",
+    "centre": "center",
+    "hq": "headquarters",
+    "svc": "services",
+    "svcs": "services",
+    "sys": "systems",
+    "mgmt": "management",
+    "tech": "technology",
+    "technologies": "technology",
+}
+
+# State codes that are also words the rule table rewrites ("Co") are never
+# treated as locations
+_STATE_CODES = "|".join(code for code in _STATES.split("|") if code.lower() not in WORD_RULES)
+_CITY = r"[A-Z][\w.'’]*(?:\s+[A-Z][\w.'’]*){0,3}"
+_ZIP = r"\d{5}(?:-\d{4})?"
+
+# Trailing location codes, matched before casefolding so only an uppercase
+# state code after a city ("- Norfolk VA", ", San Diego, CA 92101") or with a
+# ZIP ("- VA 22202") counts, plus "(TX)" and store numbers ("#1234")
+_LOCATION = re.compile(
+    rf"(?:\s*[-–,]\s*(?:{_CITY},?\s+(?:{_STATE_CODES})(?:\s+{_ZIP})?|(?:{_STATE_CODES})\s+{_ZIP})"
+    rf"|\s*\((?:{_STATE_CODES}|\d+)\)|\s*#\s*\d+)+\s*$"
+)
+
+# (pattern, replacement) applied in order to casefolded, accent-stripped names
+_RULES = [
+    # Apostrophes join words: "Dep't" -> "dept", "O'Brien" -> "obrien"
+    (re.compile(r"['’`]"), ""),
+    # Dotted initials: "U.S." / "U. S. A." -> "us" / "usa"
+    (re.compile(r"\b(?:[a-z]\.\s?){2,}"), lambda match: match.group(0).replace(".", "").replace(" ", "") + " "),
+    (re.compile(r"&"), " and "),
+    (re.compile(r"[^\w\s]|_"), " "),
+]
+
+# Longest phrases first so "united states of america" wins over "united states"
+_WORD_RULE_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(key) for key in sorted(WORD_RULES, key=len, reverse=True)) + r")\b"
+)
+
+_COMBINING_MARKS = re.compile(r"[\u0300-\u036f]")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _rewrite_words(match: re.Match) -> str:
+    return WORD_RULES[match.group(0)]
+
+
+def normalize_name(raw_name: str) -> str:
+    """
+    Canonical key for a single customer name.
+
+    Applies the same rule table as ``normalize_names``; use that for
+    chunks of names.
+    """
+    value = unicodedata.normalize("NFKD", raw_name or "")
+    value = _LOCATION.sub("", _COMBINING_MARKS.sub("", value)).casefold()
+    for pattern, replacement in _RULES:
+        value = pattern.sub(replacement, value)
+    value = _WHITESPACE.sub(" ", _WORD_RULE_RE.sub(_rewrite_words, value)).strip()
+    return value or _WHITESPACE.sub(" ", (raw_name or "").casefold()).strip()
+
+
+def normalize_names(raw_names: Sequence[str]) -> List[str]:
+    """
+    Canonical keys for a chunk of customer names.
+
+    Args:
+        raw_names: Customer names as they appear in POS files
+
+    Returns:
+        Keys in the same order; names that normalize to nothing fall back
+        to their casefolded text so they never collide on an empty key
+    """
+    if len(raw_names) == 0:
+        return []
+
+    codes, distinct = pd.factorize(pd.Series(raw_names, dtype=object).fillna(""), sort=False)
+    raw = pd.Series(distinct, dtype=object)
+
+    keys = raw.str.normalize("NFKD").str.replace(_COMBINING_MARKS, "", regex=True)
+    keys = keys.str.replace(_LOCATION, "", regex=True).str.casefold()
+    for pattern, replacement in _RULES:
+        keys = keys.str.replace(pattern, replacement, regex=True)
+    keys = keys.str.replace(_WORD_RULE_RE, _rewrite_words, regex=True)
+    keys = keys.str.replace(_WHITESPACE, " ", regex=True).str.strip()
+
+    empty = keys == ""
+    if empty.any():
+        keys[empty] = raw[empty].str.casefold().str.replace(_WHITESPACE, " ", regex=True).str.strip()
+
+    return keys.to_numpy(dtype=object)[codes].tolist()
+
+
+# Tables whose names carry a normalized_name key: (table, id column, name column)
+NORMALIZED_TABLES = (
+    ("accounts", "account_id", "account_name"),
+    ("customer_name_aliases", "alias_id", "raw_name"),
+)
+
+
+def backfill_normalized_names(db, only_missing: bool = True, batch_size: int = 10000) -> int:
+    """
+    Fill ``normalized_name`` on accounts and aliases.
+
+    Rows written without a key (ORM inserts, COPY loads) are picked up here.
+    The caller owns the transaction.
+
+    Args:
+        db: Session or connection
+        only_missing: Only rows whose key is NULL; False recomputes every key after a rule change
+        batch_size: Rows normalized and updated per round trip
+
+    Returns:
+        Number of rows updated
+    """
+    updated = 0
+    for table_name, id_column, name_column in NORMALIZED_TABLES:
+        condition = "AND normalized_name IS NULL" if only_missing else ""
+        last_id = 0
+        while True:
+            rows = db.execute(text(f"""
+                SELECT {id_column} AS row_id, {name_column} AS name
+                FROM {table_name}
+                WHERE {id_column} > :last_id {condition}
+                ORDER BY {id_column}
+                LIMIT :batch_size
+            """), {"last_id": last_id, "batch_size": batch_size}).fetchall()
+            if not rows:
+                break
+
+            ids = [row.row_id for row in rows]
+            db.execute(text(f"""
+                UPDATE {table_name} t
+                SET normalized_name = v.normalized_name
+                FROM unnest(CAST(:ids AS integer[]), CAST(:keys AS varchar[])) AS v(row_id, normalized_name)
+                WHERE t.{id_column} = v.row_id
+                  AND t.normalized_name IS DISTINCT FROM v.normalized_name
+            """), {"ids": ids, "keys": [key[:255] for key in normalize_names([row.name for row in rows])]})
+            updated += len(ids)
+            last_id = ids[-1]
+    return updated
+
+
+def benchmark(total: int = 5000000, distinct: int = 20000, seed: int = 0) -> dict:
+    """
+    Time ``normalize_names`` over a synthetic POS name column.
+
+    Args:
+        total: Names in the column
+        distinct: Distinct base names before noise is added
+        seed: Random seed
+
+    Returns:
+        Throughput and how many raw spellings collapsed into each key
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array([
+        "Naval", "Sea", "Systems", "Command", "Department", "Navy", "Air", "Force", "Army",
+        "Veterans", "Affairs", "Defense", "Logistics", "Agency", "Lockheed", "Martin", "Corporation",
+        "International", "Technologies", "National", "Laboratory", "Medical", "Center", "University",
+    ])
+    bases = [" ".join(rng.choice(words, size=rng.integers(2, 5))) for _ in range(distinct)]
+    noise = [
+        lambda name: name,
+        lambda name: name.upper(),
+        lambda name: f"U.S. {name}",
+        lambda name: name.replace("Department", "Dept.").replace("Command", "Cmd"),
+        lambda name: f"{name} - Norfolk VA",
+        lambda name: f"{name} (TX)",
+        lambda name: name.replace("e", "é", 1),
+        lambda name: f"  {name.lower()}  ",
+    ]
+    base_index = rng.integers(0, distinct, size=total)
+    noise_index = rng.integers(0, len(noise), size=total)
+    variants: Dict[tuple, str] = {}
+    names = []
+    for base, style in zip(base_index.tolist(), noise_index.tolist()):
+        name = variants.get((base, style))
+        if name is None:
+            name = variants[(base, style)] = noise[style](bases[base])
+        names.append(name)
+
+    started = time.perf_counter()
+    keys = normalize_names(names)
+    elapsed = time.perf_counter() - started
+
+    distinct_raw = len(set(names))
+    distinct_keys = len(set(keys))
+    return {
+        "names": total,
+        "distinct_raw_names": distinct_raw,
+        "distinct_keys": distinct_keys,
+        "collapse_ratio": round(distinct_raw / distinct_keys, 2) if distinct_keys else None,
+        "elapsed_seconds": round(elapsed, 3),
+        "names_per_second": round(total / elapsed) if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark customer name normalization or recompute stored keys")
+    parser.add_argument("--names", type=int, default=5000000, help="Names in the benchmark column")
+    parser.add_argument("--distinct", type=int, default=20000, help="Distinct base names in the benchmark")
+    parser.add_argument("--reindex", action="store_true",
+                        help="Recompute normalized_name on accounts and aliases, and the transaction row hashes built from it")
+    args = parser.parse_args()
+
+    if not args.reindex:
+        print(benchmark(args.names, args.distinct))
+        return
+
+    from app.database.connection import SessionLocal
+    from app.services.ingestion import rehash_transactions
+
+    db = SessionLocal()
+    try:
+        updated = backfill_normalized_names(db, only_missing=False)
+        # Row hashes embed the name key; stale ones would stop corrections matching their report
+        rehashed = rehash_transactions(db)
+        db.commit()
+        print({"rows_normalized": updated, "transactions_rehashed": rehashed})
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
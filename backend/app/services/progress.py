@@ -0,0 +1,221 @@
+"""
+In-process event bus for ingestion job progress.
+
+Ingestion runs in a worker thread and publishes progress snapshots; API
+clients subscribe and receive them over Server-Sent Events. The bus only ever
+holds the latest snapshot per job, and each subscriber is woken rather than
+queued, so a slow client skips intermediate updates instead of building up a
+backlog.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Dict, Optional, Set
+
+# Resolution tiers reported per job
+RESOLUTION_TIERS = ("exact", "fuzzy", "vector", "researched", "unresolved")
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+# Finished jobs kept for late subscribers and polling
+MAX_FINISHED_JOBS = 200
+
+# Minimum seconds between snapshots published by a tracker (phase changes always publish)
+PUBLISH_INTERVAL = 0.2
+
+
+@dataclass
+class IngestionProgress:
+    """Snapshot of an ingestion job"""
+    job_id: str
+    status: str = "queued"  # 'queued', 'running', 'completed' or 'failed'
+    phase: str = "queued"  # 'parsing', 'resolving', 'writing', 'done'
+    rows_total: Optional[int] = None
+    rows_processed: int = 0
+    names_total: int = 0
+    names_resolved: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(RESOLUTION_TIERS, 0))
+    rows_per_second: float = 0.0
+    names_per_second: float = 0.0
+    eta_seconds: Optional[float] = None  # estimate for the current phase
+    elapsed_seconds: float = 0.0
+    version: int = 0
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _Subscription:
+    """A subscriber's wake-up signal, set from any thread"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.event = asyncio.Event()
+
+    def notify(self):
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            # Event loop already closed; the subscriber is gone
+            pass
+
+
+class ProgressBus:
+    """Latest-value publish/subscribe channel keyed by job id"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest: "OrderedDict[str, IngestionProgress]" = OrderedDict()
+        self._subscribers: Dict[str, Set[_Subscription]] = {}
+
+    def publish(self, progress: IngestionProgress):
+        with self._lock:
+            self._latest[progress.job_id] = progress
+            self._latest.move_to_end(progress.job_id)
+            self._evict_finished()
+            subscribers = list(self._subscribers.get(progress.job_id, ()))
+        for subscription in subscribers:
+            subscription.notify()
+
+    def latest(self, job_id: str) -> Optional[IngestionProgress]:
+        with self._lock:
+            return self._latest.get(job_id)
+
+    async def subscribe(self, job_id: str, min_interval: float = 0.5,
+                        heartbeat: float = 15.0) -> AsyncIterator[Optional[IngestionProgress]]:
+        """
+        Yield snapshots for a job until it finishes.
+
+        At most one snapshot is sent per ``min_interval``; anything published
+        in between is coalesced into the newest snapshot. ``None`` is yielded
+        when nothing changed for ``heartbeat`` seconds so callers can keep
+        the connection alive.
+        """
+        subscription = _Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add(subscription)
+
+        try:
+            sent_version = -1
+            while True:
+                subscription.event.clear()
+                progress = self.latest(job_id)
+                if progress is not None and progress.version != sent_version:
+                    sent_version = progress.version
+                    yield progress
+                    if progress.status in TERMINAL_STATUSES:
+                        return
+                    await asyncio.sleep(min_interval)
+                    continue
+
+                try:
+                    await asyncio.wait_for(subscription.event.wait(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(job_id)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[job_id]
+
+    def _evict_finished(self):
+        finished = [
+            job_id for job_id, progress in self._latest.items()
+            if progress.status in TERMINAL_STATUSES
+        ]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._latest[job_id]
+
+
+# Process-wide bus used by the upload API
+progress_bus = ProgressBus()
+
+
+class IngestionProgressTracker:
+    """
+    Accumulates progress for one ingestion job and publishes throttled snapshots.
+
+    Without a bus the tracker only counts, so services can always report progress.
+    """
+
+    def __init__(self, job_id: str, bus: Optional[ProgressBus] = None):
+        self.bus = bus
+        self.progress = IngestionProgress(job_id=job_id)
+        self._started = time.perf_counter()
+        self._phase_started = self._started
+        self._last_publish = 0.0
+        self._publish(force=True)
+
+    def start(self, rows_total: Optional[int] = None):
+        self.progress.status = "running"
+        self.progress.rows_total = rows_total
+        self.set_phase("parsing")
+
+    def set_phase(self, phase: str):
+        self.progress.phase = phase
+        self._phase_started = time.perf_counter()
+        self._publish(force=True)
+
+    def rows_parsed(self, count: int):
+        self.progress.rows_processed += count
+        self._publish()
+
+    def names_queued(self, count: int):
+        self.progress.names_total += count
+
+    def names_resolved(self, tier: str, count: int = 1):
+        self.progress.names_resolved[tier] = self.progress.names_resolved.get(tier, 0) + count
+        self._publish()
+
+    def complete(self, result: dict):
+        self.progress.status = "completed"
+        self.progress.phase = "done"
+        self.progress.result = result
+        self.progress.eta_seconds = 0.0
+        self._publish(force=True)
+
+    def fail(self, error: str):
+        self.progress.status = "failed"
+        self.progress.error = error
+        self._publish(force=True)
+
+    def _publish(self, force: bool = False):
+        now = time.perf_counter()
+        if not force and now - self._last_publish < PUBLISH_INTERVAL:
+            return
+        self._last_publish = now
+
+        progress = self.progress
+        elapsed = now - self._started
+        phase_elapsed = now - self._phase_started
+        names_done = sum(progress.names_resolved.values())
+
+        progress.elapsed_seconds = round(elapsed, 2)
+        if elapsed > 0:
+            progress.rows_per_second = round(progress.rows_processed / elapsed, 1)
+            progress.names_per_second = round(names_done / elapsed, 1)
+
+        if progress.phase == "parsing" and progress.rows_total and progress.rows_processed:
+            rate = progress.rows_processed / phase_elapsed if phase_elapsed > 0 else 0
+            remaining = max(0, progress.rows_total - progress.rows_processed)
+            progress.eta_seconds = round(remaining / rate, 1) if rate else None
+        elif progress.phase == "resolving" and progress.names_total and names_done:
+            rate = names_done / phase_elapsed if phase_elapsed > 0 else 0
+            remaining = max(0, progress.names_total - names_done)
+            progress.eta_seconds = round(remaining / rate, 1) if rate else None
+        elif progress.status not in TERMINAL_STATUSES:
+            progress.eta_seconds = None
+
+        progress.version += 1
+        if self.bus is not None:
+            # Publish a copy so subscribers never observe a half-updated snapshot
+            self.bus.publish(IngestionProgress(**{
+                **progress.to_dict(),
+                "names_resolved": dict(progress.names_resolved),
+            }))
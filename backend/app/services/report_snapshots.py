@@ -0,0 +1,134 @@
+"""
+Versioned snapshots of report views.
+
+Report data only changes when an ingestion commits, so each rendered view is
+kept as a snapshot keyed by its parameters and the current data version.
+The data version is derived from ``pos_reports`` (every ingestion creates or
+updates a row there), which makes it, and therefore each view's ETag,
+identical across API processes. ETags are computed from the key and version
+alone, so a matching ``If-None-Match`` is answered without touching the
+database even after the snapshot itself has been evicted.
+
+The version is cached in memory. Ingestion in this process invalidates it
+immediately; changes committed by other processes are picked up when the
+cached version is revalidated, at most once per revalidation interval.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+from app.config import settings
+
+
+@dataclass
+class ReportSnapshot:
+    """A rendered report view"""
+    etag: str
+    body: bytes
+    data_version: str
+    created_at: float
+
+
+def load_data_version() -> str:
+    """Fingerprint of the ingested POS reports"""
+    from app.database.connection import SessionLocal
+
+    db = SessionLocal()
+    try:
+        row = db.execute(text("""
+            SELECT COUNT(*) AS report_count,
+                   COALESCE(MAX(pos_report_id), 0) AS last_report_id,
+                   MAX(GREATEST(uploaded_at, updated_at)) AS last_change
+            FROM pos_reports
+        """)).one()
+        return f"{row.report_count}.{row.last_report_id}.{row.last_change.timestamp() if row.last_change else 0}"
+    finally:
+        db.close()
+
+
+class ReportSnapshotCache:
+    """LRU cache of report snapshots for the current data version"""
+
+    def __init__(self, max_entries: int = 500, revalidate_seconds: float = 30.0,
+                 version_loader: Callable[[], str] = load_data_version):
+        """
+        Initialize the snapshot cache
+
+        Args:
+            max_entries: Snapshots kept before the least recently used is dropped
+            revalidate_seconds: How long the cached data version is trusted
+            version_loader: Reads the data version from the database
+        """
+        self.max_entries = max_entries
+        self.revalidate_seconds = revalidate_seconds
+        self._version_loader = version_loader
+        self._lock = threading.Lock()
+        self._snapshots: "OrderedDict[str, ReportSnapshot]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._version_checked_at = 0.0
+
+    @property
+    def data_version(self) -> str:
+        """Current data version; reloaded when invalidated or older than the revalidation interval"""
+        with self._lock:
+            if self._version is not None and time.monotonic() - self._version_checked_at < self.revalidate_seconds:
+                return self._version
+
+        version = self._version_loader()
+        with self._lock:
+            if version != self._version:
+                self._snapshots.clear()
+            self._version = version
+            self._version_checked_at = time.monotonic()
+        return version
+
+    def invalidate(self):
+        """Evict every snapshot and re-read the data version on next use (called after ingestion commits)"""
+        with self._lock:
+            self._snapshots.clear()
+            self._version = None
+
+    @staticmethod
+    def etag(key: str, data_version: str) -> str:
+        digest = hashlib.sha256(f"{data_version}\x1f{key}".encode("utf-8")).hexdigest()[:32]
+        return f'"{digest}"'
+
+    def get(self, key: str, data_version: str) -> Optional[ReportSnapshot]:
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None or snapshot.data_version != data_version:
+                return None
+            self._snapshots.move_to_end(key)
+            return snapshot
+
+    def put(self, key: str, data_version: str, body: bytes) -> ReportSnapshot:
+        snapshot = ReportSnapshot(self.etag(key, data_version), body, data_version, time.time())
+        with self._lock:
+            # An ingestion may have invalidated the version while this view was rendering
+            if self._version == data_version:
+                self._snapshots[key] = snapshot
+                self._snapshots.move_to_end(key)
+                while len(self._snapshots) > self.max_entries:
+                    self._snapshots.popitem(last=False)
+        return snapshot
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "snapshots": len(self._snapshots),
+                "max_entries": self.max_entries,
+                "data_version": self._version,
+            }
+
+
+# Process-wide snapshot cache
+report_snapshots = ReportSnapshotCache(
+    max_entries=settings.report_snapshot_max_entries,
+    revalidate_seconds=settings.report_snapshot_revalidate_seconds,
+)
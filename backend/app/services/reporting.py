@@ -0,0 +1,309 @@
+"""
+Reporting service for the Account Team, Partner (Vendor) Team and Executive
+Roll-up views.
+
+Every view is a ``ReportScope`` (a transaction filter) plus a set of
+aggregations. The JSON views return the top rows of each aggregation; the
+Excel export streams every row from a server-side cursor into an openpyxl
+write-only workbook, so peak memory does not depend on report size.
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+HIERARCHY_LEVELS = (1, 2, 3, 4)
+
+# Rows fetched per round trip from server-side cursors
+STREAM_BATCH_SIZE = 5000
+
+# Rows per worksheet, header included; write-only mode doesn't enforce Excel's limit
+EXCEL_MAX_ROWS = 1048576
+
+_MEASURES = """
+    SUM(t.sale_amount) AS total_sales,
+    SUM(t.quantity) AS total_quantity,
+    COUNT(*) AS transaction_count
+"""
+
+_FROM = """
+    FROM transactions t
+    LEFT JOIN accounts a ON a.account_id = t.account_id
+    LEFT JOIN hierarchies h ON h.hierarchy_id = a.hierarchy_id
+"""
+
+
+@dataclass
+class ReportScope:
+    """Which transactions a report covers"""
+    conditions: List[str] = field(default_factory=list)
+    params: Dict[str, object] = field(default_factory=dict)
+
+    @classmethod
+    def for_account(cls, account_id: int, start_date: date = None, end_date: date = None) -> "ReportScope":
+        return cls(["t.account_id = :account_id"], {"account_id": account_id}).with_dates(start_date, end_date)
+
+    @classmethod
+    def for_vendor(cls, vendor_id: int, start_date: date = None, end_date: date = None) -> "ReportScope":
+        return cls(["t.vendor_id = :vendor_id"], {"vendor_id": vendor_id}).with_dates(start_date, end_date)
+
+    @classmethod
+    def for_hierarchy(cls, level: int, value: Optional[str] = None,
+                      start_date: date = None, end_date: date = None) -> "ReportScope":
+        _check_level(level)
+        scope = cls(["t.account_id IS NOT NULL"])
+        if value is not None:
+            scope.conditions.append(f"h.level_{level} = :level_value")
+            scope.params["level_value"] = value
+        return scope.with_dates(start_date, end_date)
+
+    def with_dates(self, start_date: Optional[date], end_date: Optional[date]) -> "ReportScope":
+        if start_date is not None:
+            self.conditions.append("t.transaction_date >= :start_date")
+            self.params["start_date"] = start_date
+        if end_date is not None:
+            self.conditions.append("t.transaction_date <= :end_date")
+            self.params["end_date"] = end_date
+        return self
+
+    @property
+    def where(self) -> str:
+        return "WHERE " + " AND ".join(self.conditions) if self.conditions else ""
+
+
+def _check_level(level: int):
+    if level not in HIERARCHY_LEVELS:
+        raise ValueError(f"Hierarchy level must be one of {HIERARCHY_LEVELS}")
+
+
+def _row_dict(row) -> dict:
+    return {
+        key: float(value) if key == "total_sales" and value is not None else value
+        for key, value in row._mapping.items()
+    }
+
+
+class ReportService:
+    """Service for aggregating transactions into report views"""
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize reporting service
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db = db_session
+
+    # Aggregation queries: (column headers, SQL) for a scope
+
+    def _totals_sql(self, scope: ReportScope) -> str:
+        return f"""
+            SELECT {_MEASURES},
+                   COUNT(DISTINCT t.account_id) AS account_count,
+                   COUNT(DISTINCT t.vendor_id) AS vendor_count,
+                   MIN(t.transaction_date) AS first_transaction,
+                   MAX(t.transaction_date) AS last_transaction
+            {_FROM}
+            {scope.where}
+        """
+
+    def _by_level_sql(self, scope: ReportScope, level: int) -> Tuple[List[str], str]:
+        _check_level(level)
+        levels = [f"h.level_{n}" for n in range(1, level + 1)]
+        return (
+            [f"Level {n}" for n in range(1, level + 1)] + ["Total Sales", "Total Quantity", "Transactions"],
+            f"""
+                SELECT {', '.join(levels)}, {_MEASURES}
+                {_FROM}
+                {scope.where}
+                GROUP BY {', '.join(levels)}
+                ORDER BY total_sales DESC NULLS LAST
+            """
+        )
+
+    def _by_account_sql(self, scope: ReportScope) -> Tuple[List[str], str]:
+        return (
+            ["Account ID", "Account", "Account Type", "Total Sales", "Total Quantity", "Transactions"],
+            f"""
+                SELECT a.account_id, a.account_name, a.account_type, {_MEASURES}
+                {_FROM}
+                {scope.where}
+                GROUP BY a.account_id, a.account_name, a.account_type
+                ORDER BY total_sales DESC NULLS LAST
+            """
+        )
+
+    def _by_vendor_sql(self, scope: ReportScope) -> Tuple[List[str], str]:
+        return (
+            ["Vendor ID", "Vendor", "Total Sales", "Total Quantity", "Transactions"],
+            f"""
+                SELECT v.vendor_id, v.vendor_name, {_MEASURES}
+                {_FROM}
+                LEFT JOIN vendors v ON v.vendor_id = t.vendor_id
+                {scope.where}
+                GROUP BY v.vendor_id, v.vendor_name
+                ORDER BY total_sales DESC NULLS LAST
+            """
+        )
+
+    def _by_customer_name_sql(self, scope: ReportScope) -> Tuple[List[str], str]:
+        return (
+            ["Customer Name", "Account", "Total Sales", "Total Quantity", "Transactions"],
+            f"""
+                SELECT t.original_customer_name, a.account_name, {_MEASURES}
+                {_FROM}
+                {scope.where}
+                GROUP BY t.original_customer_name, a.account_name
+                ORDER BY total_sales DESC NULLS LAST
+            """
+        )
+
+    def _by_month_sql(self, scope: ReportScope) -> Tuple[List[str], str]:
+        return (
+            ["Month", "Total Sales", "Total Quantity", "Transactions"],
+            f"""
+                SELECT date_trunc('month', t.transaction_date)::date AS month, {_MEASURES}
+                {_FROM}
+                {scope.where}
+                GROUP BY month
+                ORDER BY month
+            """
+        )
+
+    def _transactions_sql(self, scope: ReportScope) -> Tuple[List[str], str]:
+        return (
+            ["Transaction ID", "Date", "SKU", "Quantity", "Sale Amount", "Customer Name", "Account",
+             "Vendor", "Level 1", "Level 2", "Level 3", "Level 4", "POS Report ID"],
+            f"""
+                SELECT t.transaction_id, t.transaction_date, t.product_sku, t.quantity, t.sale_amount,
+                       t.original_customer_name, a.account_name, v.vendor_name,
+                       h.level_1, h.level_2, h.level_3, h.level_4, t.pos_report_id
+                {_FROM}
+                LEFT JOIN vendors v ON v.vendor_id = t.vendor_id
+                {scope.where}
+                ORDER BY t.transaction_date, t.transaction_id
+            """
+        )
+
+    # JSON views
+
+    def _fetch(self, sql: str, scope: ReportScope, limit: Optional[int] = None) -> List[dict]:
+        if limit is not None:
+            sql = f"{sql} LIMIT {int(limit)}"
+        return [_row_dict(row) for row in self.db.execute(text(sql), scope.params)]
+
+    def totals(self, scope: ReportScope) -> dict:
+        return _row_dict(self.db.execute(text(self._totals_sql(scope)), scope.params).one())
+
+    def account_view(self, account_id: int, start_date: date = None, end_date: date = None,
+                     limit: int = 100) -> dict:
+        """Account Team View: sales into an account by vendor, month and raw customer name"""
+        scope = ReportScope.for_account(account_id, start_date, end_date)
+        return {
+            "totals": self.totals(scope),
+            "by_vendor": self._fetch(self._by_vendor_sql(scope)[1], scope, limit),
+            "by_month": self._fetch(self._by_month_sql(scope)[1], scope),
+            "by_customer_name": self._fetch(self._by_customer_name_sql(scope)[1], scope, limit),
+        }
+
+    def vendor_view(self, vendor_id: int, start_date: date = None, end_date: date = None,
+                    limit: int = 100) -> dict:
+        """Partner Team View: a vendor's sales by account and hierarchy"""
+        scope = ReportScope.for_vendor(vendor_id, start_date, end_date)
+        return {
+            "totals": self.totals(scope),
+            "by_account": self._fetch(self._by_account_sql(scope)[1], scope, limit),
+            "by_level_1": self._fetch(self._by_level_sql(scope, 1)[1], scope, limit),
+            "by_month": self._fetch(self._by_month_sql(scope)[1], scope),
+        }
+
+    def hierarchy_view(self, level: int, value: Optional[str] = None, start_date: date = None,
+                       end_date: date = None, limit: int = 100) -> dict:
+        """
+        Executive Roll-up View.
+
+        Without ``value`` sales are grouped by the given level; with ``value``
+        they are restricted to that node and broken down by the next level.
+        """
+        scope = ReportScope.for_hierarchy(level, value, start_date, end_date)
+        breakdown_level = min(level + 1, HIERARCHY_LEVELS[-1]) if value is not None else level
+        return {
+            "level": level,
+            "value": value,
+            "totals": self.totals(scope),
+            "breakdown_level": breakdown_level,
+            "breakdown": self._fetch(self._by_level_sql(scope, breakdown_level)[1], scope, limit),
+            "by_month": self._fetch(self._by_month_sql(scope)[1], scope),
+        }
+
+    # Excel export
+
+    def export_sheets(self, scope: ReportScope) -> List[Tuple[str, List[str], str]]:
+        """(sheet title, headers, SQL) for every sheet of an export"""
+        sheets = [
+            (f"Level {level}", *self._by_level_sql(scope, level))
+            for level in HIERARCHY_LEVELS
+        ]
+        sheets += [
+            ("Accounts", *self._by_account_sql(scope)),
+            ("Vendors", *self._by_vendor_sql(scope)),
+            ("Customer Names", *self._by_customer_name_sql(scope)),
+            ("Monthly", *self._by_month_sql(scope)),
+            ("Transactions", *self._transactions_sql(scope)),
+        ]
+        return sheets
+
+    def _stream(self, sql: str, scope: ReportScope) -> Iterator[Sequence]:
+        """Rows from a server-side cursor, fetched in batches"""
+        result = self.db.execute(
+            text(sql),
+            scope.params,
+            execution_options={"stream_results": True, "yield_per": STREAM_BATCH_SIZE}
+        )
+        try:
+            for row in result:
+                yield tuple(row)
+        finally:
+            result.close()
+
+    def write_workbook(self, scope: ReportScope, max_rows: int = EXCEL_MAX_ROWS) -> str:
+        """
+        Write an export workbook to a temporary file and return its path.
+
+        openpyxl write-only mode serializes each row as it is appended, so
+        only the current batch of rows is ever held in memory. A sheet that
+        reaches ``max_rows`` continues on "Title (2)", "Title (3)" and so on.
+        The caller deletes the file.
+        """
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        for title, headers, sql in self.export_sheets(scope):
+            part = 1
+            sheet = workbook.create_sheet(title=title)
+            sheet.append(headers)
+            sheet_rows = 1
+            for row in self._stream(sql, scope):
+                if sheet_rows >= max_rows:
+                    part += 1
+                    sheet = workbook.create_sheet(title=f"{title} ({part})")
+                    sheet.append(headers)
+                    sheet_rows = 1
+                sheet.append(row)
+                sheet_rows += 1
+
+        handle, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(handle)
+        try:
+            workbook.save(path)
+        except Exception:
+            os.unlink(path)
+            raise
+        return path
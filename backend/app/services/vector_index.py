@@ -0,0 +1,522 @@
+"""
+Local CPU vector-similarity index over account names, aliases and profiles.
+
+Sits between Step A fuzzy search and Step B web research: many unresolved
+names ("Naval Sea Systems Cmd", "Stennis CVN-74") share words and
+abbreviations with a known account without being trigram-close to it.
+
+Texts are embedded with signed feature hashing of character trigrams, words
+and acronyms (pure NumPy, no model download) and L2-normalized, so cosine
+similarity is a dot product. Queries run as batched matrix multiplies over
+blocks of the index. The index is persisted as .npy files and memory-mapped
+on load, so every ingestion worker shares the same pages; additions go to a
+small delta that is persisted separately and periodically compacted.
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.normalization import normalize_names
+
+
+KIND_NAME = 0
+KIND_ALIAS = 1
+KIND_PROFILE = 2
+KIND_LABELS = {KIND_NAME: "account_name", KIND_ALIAS: "alias", KIND_PROFILE: "profile"}
+
+# Profile text (products/capabilities) is a weaker signal than a name
+PROFILE_WEIGHT = 0.85
+
+# Index rows scored per matrix multiply
+QUERY_BLOCK_SIZE = 16384
+
+# Texts embedded per batch while building
+BUILD_BATCH_SIZE = 10000
+
+# Delta rows accumulated before they are merged into the base files
+COMPACT_THRESHOLD = 50000
+
+_TOKEN_RE = re.compile(r"[a-z]+|[0-9]+")
+
+
+def _features(value: str) -> List[Tuple[str, float]]:
+    words = _TOKEN_RE.findall(value.lower())
+    if not words:
+        return []
+    padded = f" {' '.join(words)} "
+    features = [(padded[i:i + 3], 1.0) for i in range(len(padded) - 2)]
+    features += [(f"w:{word}", 2.0) for word in words]
+    if len(words) > 1:
+        features.append((f"a:{''.join(word[0] for word in words if word.isalpha())}", 2.0))
+    return features
+
+
+def embed(texts: Sequence[str], dim: int) -> np.ndarray:
+    """
+    Embed texts as L2-normalized hashed n-gram vectors.
+
+    Texts are reduced to canonical name keys first, so abbreviations and
+    punctuation in indexed names and in queries embed the same way.
+
+    Args:
+        texts: Texts to embed
+        dim: Vector width (a power of two)
+
+    Returns:
+        float32 array of shape (len(texts), dim)
+    """
+    rows, cols, values = [], [], []
+    for row, value in enumerate(normalize_names(texts)):
+        for feature, weight in _features(value or ""):
+            digest = zlib.crc32(feature.encode("utf-8"))
+            rows.append(row)
+            cols.append(digest & (dim - 1))
+            values.append(weight if digest & 0x80000000 else -weight)
+
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    if rows:
+        np.add.at(vectors, (np.array(rows), np.array(cols)), np.array(values, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+@contextmanager
+def _writer_lock(path: Path):
+    """
+    Exclusive lock serializing index writers across processes.
+
+    The lock file sits beside the index directory because the directory
+    itself is swapped out on every compaction.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+@dataclass
+class VectorMatch:
+    """Nearest-neighbour hit for a query"""
+    account_id: int
+    matched_text: str
+    kind: str  # 'account_name', 'alias' or 'profile'
+    score: float
+
+
+class VectorIndex:
+    """Dense nearest-neighbour index with memory-mapped base files and an in-memory delta"""
+
+    def __init__(self, path: str, dim: int):
+        self.path = Path(path)
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._version = None
+        # Rows added with persist=False, replayed over every reload until written
+        self._unsaved: List[Tuple[Sequence[int], Sequence[str], np.ndarray, np.ndarray]] = []
+        self._empty_base()
+        self._empty_delta()
+
+    # Storage
+
+    def _empty_base(self):
+        self.vectors = np.zeros((0, self.dim), dtype=np.float16)
+        self.account_ids = np.zeros(0, dtype=np.int32)
+        self.kinds = np.zeros(0, dtype=np.int8)
+        self.text_offsets = np.zeros(1, dtype=np.int64)
+        self.text_blob = np.zeros(0, dtype=np.uint8)
+
+    def _empty_delta(self):
+        self.delta_vectors = np.zeros((0, self.dim), dtype=np.float16)
+        self.delta_account_ids = np.zeros(0, dtype=np.int32)
+        self.delta_kinds = np.zeros(0, dtype=np.int8)
+        self.delta_texts: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.account_ids) + len(self.delta_account_ids)
+
+    @classmethod
+    def load(cls, path: str, dim: int = None) -> "VectorIndex":
+        """Open a persisted index, memory-mapping its base files"""
+        manifest = json.loads((Path(path) / "manifest.json").read_text())
+        index = cls(path, manifest["dim"])
+        if dim is not None and dim != index.dim:
+            raise ValueError(f"Vector index at {path} has dim {index.dim}, expected {dim}")
+        index._load_files()
+        return index
+
+    def _manifest_version(self) -> Optional[str]:
+        # Every write replaces the file, so the inode changes even within one mtime tick
+        try:
+            manifest = (self.path / "manifest.json").stat()
+        except FileNotFoundError:
+            return None
+        try:
+            delta = (self.path / "delta.npz").stat()
+            delta_version = f"{delta.st_ino}:{delta.st_mtime_ns}"
+        except FileNotFoundError:
+            delta_version = "0"
+        return f"{manifest.st_ino}:{manifest.st_mtime_ns}:{delta_version}"
+
+    def _load_files(self):
+        with self._lock:
+            self._version = self._manifest_version()
+            self.vectors = np.load(self.path / "vectors.npy", mmap_mode="r")
+            self.account_ids = np.load(self.path / "account_ids.npy", mmap_mode="r")
+            self.kinds = np.load(self.path / "kinds.npy", mmap_mode="r")
+            self.text_offsets = np.load(self.path / "text_offsets.npy", mmap_mode="r")
+            self.text_blob = np.load(self.path / "texts.npy", mmap_mode="r")
+
+            delta_path = self.path / "delta.npz"
+            if delta_path.exists():
+                with np.load(delta_path) as delta:
+                    self.delta_vectors = delta["vectors"]
+                    self.delta_account_ids = delta["account_ids"]
+                    self.delta_kinds = delta["kinds"]
+                    self.delta_texts = delta["texts"].tolist()
+            else:
+                self._empty_delta()
+
+    def reload_if_changed(self):
+        """Pick up additions persisted by another process"""
+        with self._lock:
+            version = self._manifest_version()
+            if version is not None and version != self._version:
+                self._load_files()
+                for rows in self._unsaved:
+                    self._append(*rows)
+
+    def save(self):
+        """Write base and delta as a fresh base, then swap it in atomically"""
+        with self._lock, _writer_lock(self.path):
+            self.reload_if_changed()
+            self._compact()
+
+    def _compact(self):
+        with self._lock:
+            vectors = np.concatenate((np.asarray(self.vectors), self.delta_vectors))
+            account_ids = np.concatenate((np.asarray(self.account_ids), self.delta_account_ids))
+            kinds = np.concatenate((np.asarray(self.kinds), self.delta_kinds))
+            encoded = [self._text(row).encode("utf-8") for row in range(len(self.account_ids))]
+            encoded += [value.encode("utf-8") for value in self.delta_texts]
+            self._write(vectors, account_ids, kinds, encoded)
+            self._unsaved.clear()
+            self._load_files()
+
+    def _write(self, vectors: np.ndarray, account_ids: np.ndarray, kinds: np.ndarray, encoded: List[bytes]):
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        staging = self.path.with_name(self.path.name + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        np.save(staging / "vectors.npy", vectors.astype(np.float16, copy=False))
+        np.save(staging / "account_ids.npy", account_ids.astype(np.int32, copy=False))
+        np.save(staging / "kinds.npy", kinds.astype(np.int8, copy=False))
+        np.save(staging / "text_offsets.npy", offsets)
+        np.save(staging / "texts.npy", blob)
+        (staging / "manifest.json").write_text(json.dumps({
+            "dim": self.dim,
+            "count": int(len(account_ids)),
+            "built_at": time.time(),
+        }))
+
+        # Open memory maps keep reading the replaced files until they are reloaded
+        retired = self.path.with_name(self.path.name + ".old")
+        shutil.rmtree(retired, ignore_errors=True)
+        if self.path.exists():
+            os.replace(self.path, retired)
+        os.replace(staging, self.path)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    def _save_delta(self):
+        delta_path = self.path / "delta.npz"
+        staging = self.path / f"delta.{os.getpid()}.tmp.npz"
+        np.savez(
+            staging,
+            vectors=self.delta_vectors,
+            account_ids=self.delta_account_ids,
+            kinds=self.delta_kinds,
+            texts=np.array(self.delta_texts, dtype=str),
+        )
+        os.replace(staging, delta_path)
+        self._unsaved.clear()
+        self._version = self._manifest_version()
+
+    # Updates
+
+    def add(self, account_ids: Sequence[int], texts: Sequence[str], kinds: Sequence[int], persist: bool = True):
+        """
+        Add texts for accounts without rebuilding the index.
+
+        Args:
+            account_ids: Account for each text
+            texts: Account names, aliases or profile text
+            kinds: KIND_NAME, KIND_ALIAS or KIND_PROFILE for each text
+            persist: Write the delta (or compact) so other processes see it
+        """
+        if not texts:
+            return
+        vectors = embed(texts, self.dim)
+        kinds = np.asarray(kinds, dtype=np.int8)
+        vectors[kinds == KIND_PROFILE] *= PROFILE_WEIGHT
+
+        if not persist:
+            with self._lock:
+                self._append(account_ids, texts, kinds, vectors)
+                self._unsaved.append((account_ids, texts, kinds, vectors))
+            return
+
+        # Writers in other processes may have persisted rows this instance has
+        # not seen; start from the files on disk so they are not overwritten
+        with self._lock, _writer_lock(self.path):
+            self.reload_if_changed()
+            self._append(account_ids, texts, kinds, vectors)
+            self.path.mkdir(parents=True, exist_ok=True)
+            if len(self.delta_texts) >= COMPACT_THRESHOLD or not (self.path / "manifest.json").exists():
+                self._compact()
+            else:
+                self._save_delta()
+
+    def _append(self, account_ids: Sequence[int], texts: Sequence[str], kinds: np.ndarray, vectors: np.ndarray):
+        self.delta_vectors = np.concatenate((self.delta_vectors, vectors.astype(np.float16)))
+        self.delta_account_ids = np.concatenate((self.delta_account_ids, np.asarray(account_ids, dtype=np.int32)))
+        self.delta_kinds = np.concatenate((self.delta_kinds, kinds))
+        self.delta_texts.extend(texts)
+
+    # Queries
+
+    def _text(self, row: int) -> str:
+        base_count = len(self.account_ids)
+        if row >= base_count:
+            return self.delta_texts[row - base_count]
+        start, end = self.text_offsets[row], self.text_offsets[row + 1]
+        return bytes(self.text_blob[start:end]).decode("utf-8")
+
+    def search(self, queries: Sequence[str], k: int = 5) -> List[List[VectorMatch]]:
+        """
+        Nearest accounts for each query, best first.
+
+        Args:
+            queries: Customer names to look up
+            k: Accounts returned per query (best-scoring row per account)
+
+        Returns:
+            One list of VectorMatch per query
+        """
+        if not queries:
+            return []
+        with self._lock:
+            if len(self) == 0:
+                return [[] for _ in queries]
+
+            query_vectors = embed(queries, self.dim).T  # dim x queries
+            pool = k * 4  # extra rows so several rows of one account don't crowd out others
+            best_scores = np.full((0, len(queries)), -np.inf, dtype=np.float32)
+            best_rows = np.zeros((0, len(queries)), dtype=np.int64)
+
+            blocks = [
+                (start, self.vectors[start:start + QUERY_BLOCK_SIZE])
+                for start in range(0, len(self.account_ids), QUERY_BLOCK_SIZE)
+            ]
+            if len(self.delta_account_ids):
+                blocks.append((len(self.account_ids), self.delta_vectors))
+
+            for start, block in blocks:
+                scores = np.asarray(block, dtype=np.float32) @ query_vectors
+                # Only the block's top rows per query are kept, never a row id per score
+                if len(scores) > pool:
+                    rows = np.argpartition(-scores, pool, axis=0)[:pool]
+                    scores = np.take_along_axis(scores, rows, axis=0)
+                else:
+                    rows = np.broadcast_to(np.arange(len(scores))[:, None], scores.shape)
+                best_scores = np.concatenate((best_scores, scores))
+                best_rows = np.concatenate((best_rows, start + rows))
+                if len(best_scores) > pool:
+                    keep = np.argpartition(-best_scores, pool, axis=0)[:pool]
+                    best_scores = np.take_along_axis(best_scores, keep, axis=0)
+                    best_rows = np.take_along_axis(best_rows, keep, axis=0)
+
+            results = []
+            for column in range(len(queries)):
+                order = np.argsort(-best_scores[:, column])
+                matches: List[VectorMatch] = []
+                seen = set()
+                for position in order:
+                    row = int(best_rows[position, column])
+                    account_id, kind = self._row_meta(row)
+                    if account_id in seen:
+                        continue
+                    seen.add(account_id)
+                    matches.append(VectorMatch(
+                        account_id=account_id,
+                        matched_text=self._text(row),
+                        kind=KIND_LABELS[kind],
+                        score=round(min(float(best_scores[position, column]), 1.0), 4),
+                    ))
+                    if len(matches) >= k:
+                        break
+                results.append(matches)
+            return results
+
+    def _row_meta(self, row: int) -> Tuple[int, int]:
+        base_count = len(self.account_ids)
+        if row >= base_count:
+            return int(self.delta_account_ids[row - base_count]), int(self.delta_kinds[row - base_count])
+        return int(self.account_ids[row]), int(self.kinds[row])
+
+
+def _account_texts(db: Session, account_ids: Optional[Sequence[int]] = None) -> Iterable[Tuple[int, str, int]]:
+    """(account_id, text, kind) for account names, profiles and aliases"""
+    condition = "WHERE a.account_id = ANY(:account_ids)" if account_ids is not None else ""
+    params = {"account_ids": list(account_ids)} if account_ids is not None else {}
+    options = {"stream_results": True, "yield_per": BUILD_BATCH_SIZE}
+
+    accounts = db.execute(text(f"""
+        SELECT a.account_id, a.account_name,
+               NULLIF(concat_ws(' ', a.products, a.capabilities), '') AS profile
+        FROM accounts a
+        {condition}
+    """), params, execution_options=options)
+    for row in accounts:
+        yield row.account_id, row.account_name, KIND_NAME
+        if row.profile:
+            yield row.account_id, row.profile, KIND_PROFILE
+
+    aliases = db.execute(text(f"""
+        SELECT c.account_id, c.raw_name
+        FROM customer_name_aliases c
+        JOIN accounts a ON a.account_id = c.account_id
+        {condition}
+    """), params, execution_options=options)
+    for row in aliases:
+        yield row.account_id, row.raw_name, KIND_ALIAS
+
+
+def build_vector_index(db: Session, path: str = None, dim: int = None) -> VectorIndex:
+    """Embed every account, profile and alias and write a fresh index"""
+    index = VectorIndex(path or settings.vector_index_path, dim or settings.vector_index_dim)
+    vectors, account_ids, kinds, encoded = [], [], [], []
+
+    batch: List[Tuple[int, str, int]] = []
+
+    def flush():
+        batch_vectors = embed([value for _, value, _ in batch], index.dim)
+        batch_kinds = np.array([kind for _, _, kind in batch], dtype=np.int8)
+        batch_vectors[batch_kinds == KIND_PROFILE] *= PROFILE_WEIGHT
+        vectors.append(batch_vectors.astype(np.float16))
+        account_ids.append(np.array([account_id for account_id, _, _ in batch], dtype=np.int32))
+        kinds.append(batch_kinds)
+        encoded.extend(value.encode("utf-8") for _, value, _ in batch)
+        batch.clear()
+
+    for item in _account_texts(db):
+        batch.append(item)
+        if len(batch) >= BUILD_BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+
+    with _writer_lock(index.path):
+        index._write(
+            np.concatenate(vectors) if vectors else np.zeros((0, index.dim), dtype=np.float16),
+            np.concatenate(account_ids) if account_ids else np.zeros(0, dtype=np.int32),
+            np.concatenate(kinds) if kinds else np.zeros(0, dtype=np.int8),
+            encoded,
+        )
+        index._load_files()
+    return index
+
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_vector_index() -> Optional[VectorIndex]:
+    """Process-wide index, loaded lazily; None until one has been built"""
+    global _index
+    with _index_lock:
+        if not (Path(settings.vector_index_path) / "manifest.json").exists():
+            _index = None
+        elif _index is None:
+            _index = VectorIndex.load(settings.vector_index_path)
+        else:
+            _index.reload_if_changed()
+        return _index
+
+
+def rebuild_vector_index(db: Session) -> VectorIndex:
+    """Rebuild the configured index from the database and make it current"""
+    global _index
+    index = build_vector_index(db)
+    with _index_lock:
+        _index = index
+    return index
+
+
+def clear_vector_index():
+    """Delete the configured index, e.g. after all accounts were removed"""
+    global _index
+    with _index_lock, _writer_lock(Path(settings.vector_index_path)):
+        shutil.rmtree(settings.vector_index_path, ignore_errors=True)
+        _index = None
+
+
+def add_accounts_to_index(db: Session, account_ids: Sequence[int]) -> int:
+    """Index new accounts (names, profiles and aliases) incrementally"""
+    index = get_vector_index()
+    if index is None or not account_ids:
+        return 0
+    items = list(_account_texts(db, account_ids))
+    index.add([item[0] for item in items], [item[1] for item in items], [item[2] for item in items])
+    return len(items)
+
+
+def add_aliases_to_index(account_ids: Sequence[int], raw_names: Sequence[str]) -> int:
+    """Index newly recorded aliases incrementally"""
+    index = get_vector_index()
+    if index is None or not raw_names:
+        return 0
+    index.add(account_ids, raw_names, [KIND_ALIAS] * len(raw_names))
+    return len(raw_names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the account vector-similarity index")
+    parser.add_argument("--path", default=settings.vector_index_path)
+    parser.add_argument("--dim", type=int, default=settings.vector_index_dim)
+    args = parser.parse_args()
+
+    from app.database.connection import SessionLocal
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        index = build_vector_index(db, args.path, args.dim)
+        print({"rows": len(index), "path": str(index.path), "elapsed_seconds": round(time.perf_counter() - started, 2)})
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
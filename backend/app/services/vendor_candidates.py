@@ -0,0 +1,93 @@
+"""
+Per-vendor candidate account index.
+
+Distribution partners keep selling into roughly the same accounts, so the
+accounts a vendor has historically sold into are a strong prior when
+matching names from that vendor's reports. The index is the
+``vendor_account_candidates`` table, maintained incrementally by ingestion.
+"""
+
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import column, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+
+vendor_account_candidates_table = table(
+    "vendor_account_candidates",
+    column("vendor_id"),
+    column("account_id"),
+    column("transaction_count"),
+    column("last_seen"),
+)
+
+
+def record_vendor_accounts(db: Session, vendor_id: int,
+                           sales: Iterable[Tuple[int, Optional[date]]]) -> int:
+    """
+    Add newly ingested (account_id, transaction_date) sales to a vendor's candidates.
+
+    The caller owns the transaction.
+
+    Returns:
+        Number of candidate rows inserted or updated
+    """
+    counts: Counter = Counter()
+    last_seen: Dict[int, Optional[date]] = {}
+    for account_id, transaction_date in sales:
+        counts[account_id] += 1
+        current = last_seen.get(account_id)
+        if transaction_date is not None and (current is None or transaction_date > current):
+            last_seen[account_id] = transaction_date
+
+    if not counts:
+        return 0
+
+    statement = insert(vendor_account_candidates_table)
+    statement = statement.on_conflict_do_update(
+        index_elements=["vendor_id", "account_id"],
+        set_={
+            "transaction_count": vendor_account_candidates_table.c.transaction_count + statement.excluded.transaction_count,
+            "last_seen": text("GREATEST(vendor_account_candidates.last_seen, excluded.last_seen)"),
+        },
+    )
+    return db.execute(statement, [
+        {
+            "vendor_id": vendor_id,
+            "account_id": account_id,
+            "transaction_count": count,
+            "last_seen": last_seen.get(account_id),
+        }
+        for account_id, count in counts.items()
+    ]).rowcount
+
+
+def rebuild_vendor_candidates(db: Session, vendor_id: Optional[int] = None):
+    """
+    Recompute the index from transactions (after bulk loads or deletions).
+
+    Counts and last_seen dates cannot be walked back from deleted rows, so
+    re-ingestion that removes rows rebuilds just that vendor's candidates.
+
+    Args:
+        db: Session; the caller owns the transaction
+        vendor_id: Only rebuild this vendor's candidates (default: all vendors)
+    """
+    if vendor_id is None:
+        db.execute(text("TRUNCATE TABLE vendor_account_candidates"))
+    else:
+        db.execute(text("""
+            DELETE FROM vendor_account_candidates
+            WHERE vendor_id = :vendor_id
+        """), {"vendor_id": vendor_id})
+    db.execute(text("""
+        INSERT INTO vendor_account_candidates (vendor_id, account_id, transaction_count, last_seen)
+        SELECT vendor_id, account_id, COUNT(*), MAX(transaction_date)
+        FROM transactions
+        WHERE vendor_id IS NOT NULL AND account_id IS NOT NULL
+          AND (CAST(:vendor_id AS integer) IS NULL OR vendor_id = :vendor_id)
+        GROUP BY vendor_id, account_id
+    """), {"vendor_id": vendor_id})
@@ -0,0 +1,240 @@
+"""
+Tests for POS file splitting, row parsing and hashing, sharding and correction detection
+"""
+
+import csv
+import os
+import subprocess
+import sys
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from app.services.ingestion import (
+    REUPLOAD_SAMPLE_SIZE,
+    ReportCandidate,
+    choose_replaced_report,
+    correction_sample,
+    disambiguate_hashes,
+    disambiguate_row_hashes,
+    hash_row,
+    parse_csv_range,
+    parse_rows,
+    read_pos_file,
+    shard_for_name,
+    split_csv_records,
+)
+
+
+COLUMNS = {"transaction_date": 0, "product_sku": 1, "quantity": 2, "sale_amount": 3, "customer_name": 4}
+VENDOR_ID = 7
+
+
+def _subscription_lines():
+    # Recurring support contracts billed every month without a line date
+    return [(None, f"SUPPORT-{n}", 1, "99.00", f"Customer {n}") for n in range(300)]
+
+
+def _report(month: int):
+    dated = [(f"2026-{month:02d}-{day:02d}", "SKU-1", day, "10.00", "US Navy") for day in range(1, 29)]
+    return parse_rows(COLUMNS, _subscription_lines() + dated, VENDOR_ID)
+
+
+def test_sample_leaves_out_undated_rows():
+    february = _report(2)
+
+    sample, date_span = correction_sample(february)
+
+    dated_hashes = {row.row_hash for row in february if row.transaction_date is not None}
+    assert sample and set(sample) <= dated_hashes
+    assert date_span == (date(2026, 2, 1), date(2026, 2, 28))
+
+
+def test_sample_is_capped():
+    rows = parse_rows(COLUMNS, [("2026-01-05", f"SKU-{n}", 1, "1.00", "US Navy") for n in range(5000)], VENDOR_ID)
+
+    sample, _ = correction_sample(rows)
+
+    assert len(sample) == REUPLOAD_SAMPLE_SIZE
+
+
+def test_recurring_monthly_lines_do_not_replace_last_month():
+    january, february = _report(1), _report(2)
+    january_hashes = {row.row_hash for row in january}
+
+    # Most of February's rows are January's undated subscription lines...
+    shared = sum(row.row_hash in january_hashes for row in february)
+    assert shared / len(february) > 0.9
+
+    # ...but none of the sampled dated rows are, and January covers other dates anyway
+    sample, date_span = correction_sample(february)
+    overlap = sum(row_hash in january_hashes for row_hash in sample)
+    candidates = [ReportCandidate(1, len(sample), date(2026, 1, 1), date(2026, 1, 28))]
+
+    assert overlap == 0
+    assert choose_replaced_report(candidates, len(sample), date_span) is None
+
+
+def test_correction_for_the_same_dates_replaces_the_report():
+    january = _report(1)
+    sample, date_span = correction_sample(january)
+    candidates = [
+        ReportCandidate(2, len(sample), date(2025, 12, 1), date(2026, 1, 28)),
+        ReportCandidate(1, len(sample) - 3, date(2026, 1, 1), date(2026, 1, 28)),
+    ]
+
+    assert choose_replaced_report(candidates, len(sample), date_span) == 1
+
+
+def test_low_overlap_is_not_a_correction():
+    candidates = [ReportCandidate(1, 10, date(2026, 1, 1), date(2026, 1, 28))]
+
+    assert choose_replaced_report(candidates, 200, (date(2026, 1, 1), date(2026, 1, 28))) is None
+
+
+def test_undated_upload_is_never_a_correction():
+    rows = parse_rows(COLUMNS, _subscription_lines(), VENDOR_ID)
+
+    sample, date_span = correction_sample(rows)
+
+    assert sample == [] and date_span is None
+    assert choose_replaced_report([ReportCandidate(1, 300, None, None)], len(sample), date_span) is None
+
+
+def test_row_hash_depends_on_every_field():
+    base = (VENDOR_ID, date(2026, 3, 1), "SKU-1", 2, "10.00", "us navy")
+    hashes = {hash_row(*base)}
+    for position, value in enumerate((8, date(2026, 3, 2), "SKU-2", 3, "10.01", "us army")):
+        changed = list(base)
+        changed[position] = value
+        hashes.add(hash_row(*changed))
+
+    assert len(hashes) == 7
+    assert hash_row(*base) == hash_row(*base)
+
+
+def test_row_hash_keeps_empty_fields_apart():
+    # A missing SKU must not hash like the SKU shifting into the next field
+    assert hash_row(VENDOR_ID, None, "1", None, "10.00", "us navy") != hash_row(VENDOR_ID, None, None, "1", "10.00", "us navy")
+
+
+def test_parsed_rows_hash_normalized_names():
+    [first, second] = parse_rows(COLUMNS, [
+        ("2026-03-01", "SKU-1", 2, "10.00", "U.S. Dept. of the Navy"),
+        ("2026-03-01", "SKU-1", 2, "10.00", "US DEPT OF NAVY - NORFOLK VA"),
+    ], VENDOR_ID)
+
+    assert first.row_hash == second.row_hash
+
+
+def test_repeated_hashes_are_numbered_in_order():
+    hashes = disambiguate_hashes(["a", "b", "a", "a", "b"])
+
+    assert hashes[:2] == ["a", "b"]
+    assert len(set(hashes)) == 5
+    assert disambiguate_hashes(["a", "a", "a"]) == [hashes[0], hashes[2], hashes[3]]
+
+
+def test_repeat_count_changes_show_as_one_row():
+    line = ("2026-03-01", "SKU-1", 1, "10.00", "US Navy")
+    before = {row.row_hash for row in disambiguate_row_hashes(parse_rows(COLUMNS, [line] * 3, VENDOR_ID))}
+    after = {row.row_hash for row in disambiguate_row_hashes(parse_rows(COLUMNS, [line] * 2, VENDOR_ID))}
+
+    assert len(before) == 3
+    assert after < before and len(before - after) == 1
+
+
+def test_disambiguation_keeps_unique_rows():
+    parsed = _report(3)
+
+    assert disambiguate_row_hashes(parsed) == parsed
+
+
+def _write_csv(path, rows, line_terminator="\r\n", bom=True):
+    with open(path, "w", newline="", encoding="utf-8-sig" if bom else "utf-8") as handle:
+        writer = csv.writer(handle, lineterminator=line_terminator)
+        writer.writerow(("Transaction Date", "Product SKU", "Quantity", "Sale Amount", "End Customer Name"))
+        writer.writerows(rows)
+
+
+def _tricky_rows():
+    rows = []
+    for n in range(400):
+        name = f"Customer {n}"
+        if n % 7 == 0:
+            name = f'Customer "{n}"\nBuilding 2, Suite {n}'
+        elif n % 5 == 0:
+            name = f"Customer {n}, Norfolk VA"
+        rows.append((f"2026-01-{n % 28 + 1:02d}", f"SKU-{n}", n % 9, f"{n}.50", name))
+    return rows
+
+
+@pytest.mark.parametrize("line_terminator, bom", [("\r\n", True), ("\n", False)])
+@pytest.mark.parametrize("range_bytes", [1, 97, 1024, 1 << 20])
+def test_byte_ranges_parse_to_the_same_rows_as_one_reader(tmp_path, line_terminator, bom, range_bytes):
+    path = str(tmp_path / "report.csv")
+    _write_csv(path, _tricky_rows(), line_terminator, bom)
+
+    columns, rows = read_pos_file(path)
+    expected = parse_rows(columns, list(rows), VENDOR_ID)
+
+    split_columns, ranges = split_csv_records(path, range_bytes)
+    parsed = []
+    rows_processed = 0
+    for start, end in ranges:
+        range_rows, range_parsed = parse_csv_range(path, start, end, split_columns, VENDOR_ID)
+        rows_processed += range_rows
+        parsed.extend(range_parsed)
+
+    assert split_columns == columns
+    assert rows_processed == 400
+    assert parsed == expected
+    assert all(start < end for start, end in ranges)
+    assert all(previous[1] == current[0] for previous, current in zip(ranges, ranges[1:]))
+
+
+def test_header_only_file_has_no_ranges(tmp_path):
+    path = str(tmp_path / "report.csv")
+    _write_csv(path, [])
+
+    columns, ranges = split_csv_records(path)
+
+    assert "customer_name" in columns
+    assert ranges == []
+
+
+def test_split_rejects_empty_file(tmp_path):
+    path = tmp_path / "report.csv"
+    path.write_bytes(b"")
+
+    with pytest.raises(ValueError):
+        split_csv_records(str(path))
+
+
+def test_shards_are_stable_across_processes():
+    names = ["us department of navy", "lockheed martin corporation", "acme company", "naval sea systems command"]
+    script = (
+        "from app.services.ingestion import shard_for_name;"
+        f"print([shard_for_name(name, 8) for name in {names!r}])"
+    )
+
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+            env=dict(os.environ, PYTHONHASHSEED=seed), cwd=str(Path(__file__).parents[1]),
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+
+    assert outputs == {str([shard_for_name(name, 8) for name in names])}
+
+
+@pytest.mark.parametrize("shard_count", [2, 4, 8])
+def test_shards_are_evenly_spread(shard_count):
+    counts = Counter(shard_for_name(f"customer {n} corporation", shard_count) for n in range(40000))
+
+    expected = 40000 / shard_count
+    assert set(counts) == set(range(shard_count))
+    assert all(abs(count - expected) < expected * 0.05 for count in counts.values())
@@ -0,0 +1,87 @@
+"""
+Tests for customer name normalization
+"""
+
+import pytest
+
+from app.services.normalization import normalize_name, normalize_names
+
+
+@pytest.mark.parametrize("raw_name, expected", [
+    ("U.S. Dept. of the Navy", "us department of navy"),
+    ("US DEPT OF NAVY", "us department of navy"),
+    ("United States Navy", "us navy"),
+    ("United States of America Navy", "us navy"),
+    ("Département de la Défense", "departement de la defense"),
+    ("Procter & Gamble Co", "procter and gamble company"),
+    ("Dep't of Energy", "department of energy"),
+    ("  lockheed   martin corp  ", "lockheed martin corporation"),
+])
+def test_rewrites_spellings_to_one_key(raw_name, expected):
+    assert normalize_names([raw_name]) == [expected]
+
+
+@pytest.mark.parametrize("raw_name, expected", [
+    ("Dept of Navy - Norfolk VA", "department of navy"),
+    ("US DEPT OF NAVY - NORFOLK VA", "us department of navy"),
+    ("Naval Sea Systems Command, San Diego, CA 92101", "naval sea systems command"),
+    ("Boeing - St. Louis MO", "boeing"),
+    ("Acme Corp - VA 22202", "acme corporation"),
+    ("Acme Corp (TX)", "acme corporation"),
+    ("Acme Corp #1234", "acme corporation"),
+    ("Acme Corp - Norfolk VA #12", "acme corporation"),
+])
+def test_strips_trailing_locations(raw_name, expected):
+    assert normalize_names([raw_name]) == [expected]
+
+
+@pytest.mark.parametrize("raw_name, expected", [
+    # "Co" is a company suffix, never Colorado
+    ("General Dynamics - Electric Boat Co", "general dynamics electric boat company"),
+    ("GENERAL DYNAMICS - ELECTRIC BOAT CO", "general dynamics electric boat company"),
+    ("Procter, Gamble Co", "procter gamble company"),
+    ("Alpha - Omega Medical Co", "alpha omega medical company"),
+    # Lowercase two-letter words are not state codes
+    ("Lockheed Martin - Space Systems in", "lockheed martin space systems in"),
+    ("Alpha - Omega Medical de", "alpha omega medical de"),
+    ("Beta, Gamma or", "beta gamma or"),
+    # A state code needs a city or ZIP before it
+    ("Alpha - IN", "alpha in"),
+    ("Alpha - Omega", "alpha omega"),
+])
+def test_keeps_names_that_only_resemble_locations(raw_name, expected):
+    assert normalize_names([raw_name]) == [expected]
+
+
+def test_preserves_order_and_repeats():
+    names = ["US Navy", "Acme Corp", "U.S. Navy", "US Navy", None, "ACME CORP"]
+
+    assert normalize_names(names) == ["us navy", "acme corporation", "us navy", "us navy", "", "acme corporation"]
+
+
+def test_empty_input():
+    assert normalize_names([]) == []
+
+
+def test_names_that_normalize_to_nothing_keep_their_text():
+    assert normalize_names(["The", "  THE  "]) == ["the", "the"]
+
+
+def test_matches_single_name_version():
+    names = [
+        "U.S. Dept. of the Navy", "General Dynamics - Electric Boat Co", "Dept of Navy - Norfolk VA",
+        "Acme Corp (TX)", "Département de la Défense", "The", "",
+    ]
+
+    assert normalize_names(names) == [normalize_name(name) for name in names]
+
+
+def test_keys_are_stable_under_renormalization():
+    # Fuzzy search normalizes its input, which may already be a key
+    names = [
+        "U.S. Dept. of the Navy", "General Dynamics - Electric Boat Co", "Naval Sea Systems Command, San Diego, CA 92101",
+        "Procter & Gamble Co", "The", "Lockheed Martin - Space Systems in",
+    ]
+    keys = normalize_names(names)
+
+    assert normalize_names(keys) == keys
@@ -0,0 +1,110 @@
+"""
+Tests for the SQL statement profiler
+"""
+
+import random
+import statistics
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.database import profiler as profiler_module
+from app.database.profiler import RESERVOIR_SIZE, SQLProfiler, _StatementStats, fingerprint_statement
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ("SELECT * FROM accounts WHERE account_id = 42", "SELECT * FROM accounts WHERE account_id = ?"),
+    ("SELECT * FROM accounts WHERE account_name = 'O''Brien'", "SELECT * FROM accounts WHERE account_name = ?"),
+    ("SELECT * FROM t WHERE a = %(a)s AND b = %s AND c = :c AND d = $1", "SELECT * FROM t WHERE a = ? AND b = ? AND c = ? AND d = ?"),
+    ("SELECT * FROM t WHERE id IN (1, 2, 3)", "SELECT * FROM t WHERE id IN (?)"),
+    ("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)", "INSERT INTO t (a, b) VALUES (...)"),
+    ("SELECT  a\n  FROM t -- trailing note\n WHERE x > 1.5 /* hint */", "SELECT a FROM t WHERE x > ?"),
+])
+def test_fingerprint_replaces_values(statement, expected):
+    assert fingerprint_statement(statement) == expected
+
+
+def test_fingerprint_keeps_casts_and_identifiers():
+    statement = "SELECT CAST(:ids AS integer[])::text FROM table_2 WHERE col1 = :v"
+
+    assert fingerprint_statement(statement) == "SELECT CAST(? AS integer[])::text FROM table_2 WHERE col1 = ?"
+
+
+def test_reservoir_is_bounded_and_uniform():
+    stats = _StatementStats("SELECT ?")
+    rng = random.Random(3)
+    latencies = [float(value) for value in range(20000)]
+
+    for latency in latencies:
+        stats.record(latency, 1, "caller", rng)
+
+    assert stats.count == len(latencies)
+    assert len(stats.samples) == RESERVOIR_SIZE
+    assert stats.max_ms == latencies[-1]
+    # A uniform sample of 0..19999 has a median near 10000
+    assert abs(statistics.median(stats.samples) - 10000) < 1500
+    assert stats.summary()["p50_ms"] == pytest.approx(10000, abs=1500)
+
+
+def test_merge_combines_records_and_bounds_the_reservoir():
+    worker = SQLProfiler()
+    rng = random.Random(5)
+    worker_stats = _StatementStats("SELECT ?")
+    for latency in range(RESERVOIR_SIZE):
+        worker_stats.record(float(latency), 2, "app.services.ingestion:match_names", rng)
+    worker._stats["SELECT ?"] = worker_stats
+
+    api = SQLProfiler()
+    api.merge(worker.drain(), caller_prefix="ingestion worker")
+    api.merge([worker_stats.to_record()])
+
+    [summary] = api.top()
+    assert summary["count"] == 2 * RESERVOIR_SIZE
+    assert summary["rows_total"] == 4 * RESERVOIR_SIZE
+    assert {caller["caller"] for caller in summary["top_callers"]} == {
+        "ingestion worker > app.services.ingestion:match_names",
+        "app.services.ingestion:match_names",
+    }
+    assert len(api._stats["SELECT ?"].samples) == RESERVOIR_SIZE
+    assert worker.drain() == []
+
+
+def test_profiles_sampled_statements_on_an_engine():
+    engine = create_engine("sqlite://")
+    sql_profiler = SQLProfiler(sample_rate=1.0)
+    sql_profiler.install(engine)
+
+    with engine.connect() as connection:
+        for value in range(3):
+            connection.execute(text("SELECT :value"), {"value": value})
+
+    [summary] = sql_profiler.top()
+    assert summary["fingerprint"] == "SELECT ?"
+    assert summary["count"] == 3
+
+    sql_profiler.uninstall(engine)
+    assert not sql_profiler.enabled
+
+
+def test_start_time_is_not_reused_by_a_later_execution(monkeypatch):
+    sql_profiler = SQLProfiler(sample_rate=1.0)
+
+    class Context:
+        pass
+
+    class Cursor:
+        rowcount = 1
+
+    context = Context()
+    sql_profiler._before_cursor_execute(None, Cursor(), "SELECT 1", None, context, False)
+    sql_profiler._after_cursor_execute(None, Cursor(), "SELECT 1", None, context, False)
+
+    # A second execution on the same context that was not sampled
+    monkeypatch.setattr(profiler_module.time, "perf_counter", lambda: 1e9)
+    sql_profiler.sample_rate = 0.0
+    sql_profiler._before_cursor_execute(None, Cursor(), "SELECT 1", None, context, False)
+    sql_profiler._after_cursor_execute(None, Cursor(), "SELECT 1", None, context, False)
+
+    [summary] = sql_profiler.top()
+    assert summary["count"] == 1
+    assert summary["max_ms"] < 1e6
@@ -0,0 +1,154 @@
+"""
+Tests for ingestion progress publishing and the upload job endpoints
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import upload
+from app.database import get_db_session
+from app.main import app
+from app.services import progress as progress_module
+from app.services.progress import IngestionProgress, IngestionProgressTracker, ProgressBus, progress_bus
+
+
+def _snapshot(job_id, version, status="running", rows=0):
+    return IngestionProgress(job_id=job_id, status=status, rows_processed=rows, version=version)
+
+
+def test_subscriber_only_receives_the_newest_snapshot():
+    bus = ProgressBus()
+    bus.publish(_snapshot("job", 1, rows=10))
+
+    async def follow():
+        received = []
+        async for progress in bus.subscribe("job", min_interval=0.05, heartbeat=1.0):
+            received.append((progress.version, progress.rows_processed))
+            if progress.version == 1:
+                # Everything published while the subscriber is throttled collapses into one update
+                for version in range(2, 6):
+                    bus.publish(_snapshot("job", version, rows=version * 10))
+                bus.publish(_snapshot("job", 6, status="completed", rows=60))
+        return received
+
+    assert asyncio.run(follow()) == [(1, 10), (6, 60)]
+
+
+def test_subscriber_is_woken_by_a_publish_from_another_thread():
+    bus = ProgressBus()
+    bus.publish(_snapshot("job", 1))
+
+    async def follow():
+        loop = asyncio.get_running_loop()
+        received = []
+        async for progress in bus.subscribe("job", min_interval=0.0, heartbeat=5.0):
+            received.append(progress.status)
+            if progress.version == 1:
+                loop.call_later(0.05, lambda: loop.run_in_executor(
+                    None, bus.publish, _snapshot("job", 2, status="completed")
+                ))
+        return received
+
+    assert asyncio.run(asyncio.wait_for(follow(), timeout=3)) == ["running", "completed"]
+
+
+def test_heartbeat_when_nothing_changes():
+    bus = ProgressBus()
+    bus.publish(_snapshot("job", 1))
+
+    async def follow():
+        received = []
+        async for progress in bus.subscribe("job", min_interval=0.0, heartbeat=0.05):
+            received.append(progress)
+            if len(received) == 2:
+                break
+        return received
+
+    first, second = asyncio.run(follow())
+    assert first.version == 1 and second is None
+    assert bus._subscribers == {}
+
+
+def test_finished_jobs_are_evicted_oldest_first(monkeypatch):
+    monkeypatch.setattr(progress_module, "MAX_FINISHED_JOBS", 2)
+    bus = ProgressBus()
+    bus.publish(_snapshot("running", 1))
+    for job_id in ("first", "second", "third"):
+        bus.publish(_snapshot(job_id, 1, status="completed"))
+
+    assert bus.latest("first") is None
+    assert bus.latest("second") and bus.latest("third") and bus.latest("running")
+
+
+def test_tracker_throttles_counts_but_always_publishes_phase_changes():
+    bus = ProgressBus()
+    tracker = IngestionProgressTracker("job", bus)
+    tracker.start(rows_total=100)
+    started_version = bus.latest("job").version
+
+    for _ in range(50):
+        tracker.rows_parsed(1)
+    assert bus.latest("job").version == started_version
+
+    tracker.set_phase("resolving")
+    latest = bus.latest("job")
+    assert latest.phase == "resolving" and latest.rows_processed == 50
+
+    tracker.complete({"rows_inserted": 50})
+    assert bus.latest("job").status == "completed"
+    assert bus.latest("job").result == {"rows_inserted": 50}
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_db_session] = lambda: None
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_job_status_endpoint(client):
+    assert client.get("/upload/jobs/missing").status_code == 404
+
+    tracker = IngestionProgressTracker("status-job", progress_bus)
+    tracker.start(rows_total=10)
+    response = client.get("/upload/jobs/status-job")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "running"
+    assert response.json()["phase"] == "parsing"
+
+
+def test_events_endpoint_streams_until_the_job_finishes(client):
+    assert client.get("/upload/jobs/missing/events").status_code == 404
+
+    tracker = IngestionProgressTracker("events-job", progress_bus)
+    tracker.complete({"rows_inserted": 3})
+    response = client.get("/upload/jobs/events-job/events")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    [event] = [block for block in response.text.split("\n\n") if block]
+    lines = dict(line.split(": ", 1) for line in event.splitlines())
+    assert lines["event"] == "progress"
+    assert json.loads(lines["data"])["result"] == {"rows_inserted": 3}
+
+
+def test_upload_status_codes(client, monkeypatch):
+    monkeypatch.setattr(upload, "_run_ingestion", lambda *args: {"status": "created"})
+    monkeypatch.setattr(upload, "_run_ingestion_job", lambda *args: None)
+    files = {"file": ("report.csv", b"End Customer Name\nUS Navy\n", "text/csv")}
+
+    accepted = client.post("/upload/pos", files=files, data={"vendor_name": "Acme"})
+    finished = client.post("/upload/pos", files=files, data={"vendor_name": "Acme", "wait": "true"})
+    rejected = client.post("/upload/pos", files={"file": ("report.pdf", b"", "application/pdf")}, data={"vendor_name": "Acme"})
+
+    assert accepted.status_code == 202
+    assert client.get(accepted.json()["status_url"]).json()["status"] == "queued"
+    assert finished.status_code == 200
+    assert finished.json() == {"status": "created"}
+    assert rejected.status_code == 400
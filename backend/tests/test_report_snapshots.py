@@ -0,0 +1,152 @@
+"""
+Tests for versioned report snapshots and conditional report responses
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import reports
+from app.database import get_db_session
+from app.main import app
+from app.services.report_snapshots import ReportSnapshotCache
+from app.services.reporting import ReportService
+
+
+class VersionSource:
+    """Stand-in for the pos_reports fingerprint, counting reads"""
+
+    def __init__(self, version="1"):
+        self.version = version
+        self.loads = 0
+
+    def __call__(self):
+        self.loads += 1
+        return self.version
+
+
+@pytest.fixture
+def versions():
+    return VersionSource()
+
+
+@pytest.fixture
+def cache(versions):
+    return ReportSnapshotCache(max_entries=2, revalidate_seconds=3600, version_loader=versions)
+
+
+def test_etag_depends_on_key_and_version():
+    etag = ReportSnapshotCache.etag("/reports/vendor/1?", "1")
+
+    assert etag == ReportSnapshotCache.etag("/reports/vendor/1?", "1")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag != ReportSnapshotCache.etag("/reports/vendor/2?", "1")
+    assert etag != ReportSnapshotCache.etag("/reports/vendor/1?", "2")
+
+
+def test_put_and_get(cache):
+    version = cache.data_version
+    snapshot = cache.put("a", version, b"{}")
+
+    assert cache.get("a", version) is snapshot
+    assert snapshot.etag == cache.etag("a", version)
+    assert cache.get("a", "other") is None
+
+
+def test_least_recently_used_snapshot_is_evicted(cache):
+    version = cache.data_version
+    cache.put("a", version, b"a")
+    cache.put("b", version, b"b")
+    cache.get("a", version)
+    cache.put("c", version, b"c")
+
+    assert cache.get("b", version) is None
+    assert cache.get("a", version).body == b"a"
+    assert cache.get("c", version).body == b"c"
+    assert cache.stats()["snapshots"] == 2
+
+
+def test_version_is_cached_until_invalidated(cache, versions):
+    version = cache.data_version
+    cache.put("a", version, b"a")
+    assert cache.data_version == version
+    assert versions.loads == 1
+
+    versions.version = "2"
+    cache.invalidate()
+
+    assert cache.data_version == "2"
+    assert versions.loads == 2
+    assert cache.stats()["snapshots"] == 0
+
+
+def test_version_change_from_another_process_drops_snapshots(versions):
+    cache = ReportSnapshotCache(revalidate_seconds=0, version_loader=versions)
+    cache.put("a", cache.data_version, b"a")
+
+    versions.version = "2"
+
+    assert cache.data_version == "2"
+    assert cache.get("a", "1") is None
+    assert cache.stats()["snapshots"] == 0
+
+
+def test_snapshot_rendered_before_invalidation_is_not_kept(cache):
+    version = cache.data_version
+    cache.invalidate()
+
+    snapshot = cache.put("a", version, b"stale")
+
+    assert snapshot.body == b"stale"
+    assert cache.stats()["snapshots"] == 0
+
+
+@pytest.fixture
+def renders():
+    return []
+
+
+@pytest.fixture
+def client(cache, renders, monkeypatch):
+    def hierarchy_view(self, level, value=None, start_date=None, end_date=None, limit=100):
+        renders.append(level)
+        return {"level": level, "rows": []}
+
+    monkeypatch.setattr(reports, "report_snapshots", cache)
+    monkeypatch.setattr(ReportService, "hierarchy_view", hierarchy_view)
+    app.dependency_overrides[get_db_session] = lambda: None
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_matching_etag_gets_not_modified(client, renders):
+    response = client.get("/reports/hierarchy/1")
+    etag = response.headers["etag"]
+
+    assert response.status_code == 200
+    assert response.json() == {"level": 1, "rows": []}
+    assert client.get("/reports/hierarchy/1", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/reports/hierarchy/1", headers={"If-None-Match": f'"x", W/{etag}'}).status_code == 304
+    assert client.get("/reports/hierarchy/1").status_code == 200
+    assert renders == [1]
+
+
+def test_new_data_changes_the_etag(client, renders, cache, versions):
+    etag = client.get("/reports/hierarchy/1").headers["etag"]
+
+    versions.version = "2"
+    cache.invalidate()
+    response = client.get("/reports/hierarchy/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert renders == [1, 1]
+
+
+def test_query_parameter_order_shares_a_snapshot(client, renders):
+    first = client.get("/reports/hierarchy/2?limit=5&value=Navy")
+    second = client.get("/reports/hierarchy/2?value=Navy&limit=5")
+
+    assert first.headers["etag"] == second.headers["etag"]
+    assert renders == [2]
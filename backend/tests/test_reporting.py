@@ -0,0 +1,76 @@
+"""
+Tests for the streamed Excel report export
+"""
+
+import os
+
+import pytest
+from openpyxl import load_workbook
+
+from app.services.reporting import EXCEL_MAX_ROWS, ReportScope, ReportService
+
+
+HEADERS = ["customer_name", "total_sales"]
+
+
+class StubReportService(ReportService):
+    """Report service serving fixed sheets instead of querying the database"""
+
+    def __init__(self, sheets):
+        super().__init__(db_session=None)
+        self.sheets = sheets
+
+    def export_sheets(self, scope):
+        return [(title, HEADERS, title) for title in self.sheets]
+
+    def _stream(self, sql, scope):
+        yield from self.sheets[sql]
+
+
+def _rows(count):
+    return [(f"Customer {n}", n) for n in range(count)]
+
+
+@pytest.fixture
+def workbook_path():
+    paths = []
+
+    def write(sheets, **kwargs):
+        path = StubReportService(sheets).write_workbook(ReportScope.for_vendor(1), **kwargs)
+        paths.append(path)
+        return path
+
+    yield write
+    for path in paths:
+        os.unlink(path)
+
+
+def _read(path):
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return {sheet.title: list(sheet.iter_rows(values_only=True)) for sheet in workbook.worksheets}
+    finally:
+        workbook.close()
+
+
+def test_sheet_rolls_over_at_max_rows(workbook_path):
+    sheets = _read(workbook_path({"Transactions": _rows(10)}, max_rows=4))
+
+    assert list(sheets) == ["Transactions", "Transactions (2)", "Transactions (3)", "Transactions (4)"]
+    assert all(rows[0] == tuple(HEADERS) for rows in sheets.values())
+    assert [len(rows) for rows in sheets.values()] == [4, 4, 4, 2]
+    data = [row for rows in sheets.values() for row in rows[1:]]
+    assert data == _rows(10)
+
+
+def test_exactly_full_sheet_does_not_add_an_empty_one(workbook_path):
+    sheets = _read(workbook_path({"Accounts": _rows(3), "Vendors": []}, max_rows=4))
+
+    assert list(sheets) == ["Accounts", "Vendors"]
+    assert len(sheets["Accounts"]) == 4
+    assert sheets["Vendors"] == [tuple(HEADERS)]
+
+
+def test_limit_is_excels_row_count():
+    # 2**20 rows per worksheet, header included
+    assert EXCEL_MAX_ROWS == 1048576
@@ -0,0 +1,164 @@
+"""
+Tests for the local vector-similarity index
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from app.services import vector_index
+from app.services.vector_index import KIND_ALIAS, KIND_NAME, KIND_PROFILE, VectorIndex, embed
+
+
+DIM = 256
+
+ACCOUNTS = [
+    (1, "United States Navy", KIND_NAME),
+    (1, "Naval Sea Systems Command", KIND_ALIAS),
+    (2, "United States Air Force", KIND_NAME),
+    (2, "Air Force Space Command", KIND_ALIAS),
+    (3, "Lockheed Martin Corporation", KIND_NAME),
+    (3, "Aerospace, defense, arms, information technology", KIND_PROFILE),
+    (4, "Transportation Security Administration", KIND_NAME),
+]
+
+
+def _add(index, items, persist=True):
+    index.add([item[0] for item in items], [item[1] for item in items], [item[2] for item in items], persist=persist)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = VectorIndex(str(tmp_path / "index"), DIM)
+    _add(index, ACCOUNTS)
+    return index
+
+
+def test_embeddings_are_unit_length():
+    vectors = embed(["Naval Sea Systems Command", "USN", ""], DIM)
+
+    assert vectors.shape == (3, DIM)
+    assert np.allclose(np.linalg.norm(vectors[:2], axis=1), 1.0, atol=1e-5)
+    assert not vectors[2].any()
+
+
+def test_finds_account_by_alias_spelling(index):
+    [matches] = index.search(["Naval Sea Systems Cmd"], k=2)
+
+    assert matches[0].account_id == 1
+    assert matches[0].kind == "alias"
+    assert matches[0].matched_text == "Naval Sea Systems Command"
+
+
+def test_returns_best_row_once_per_account(index):
+    [matches] = index.search(["Air Force"], k=5)
+
+    account_ids = [match.account_id for match in matches]
+    assert account_ids[0] == 2
+    assert len(account_ids) == len(set(account_ids))
+    assert [match.score for match in matches] == sorted((match.score for match in matches), reverse=True)
+
+
+def test_empty_index_and_queries(tmp_path):
+    index = VectorIndex(str(tmp_path / "index"), DIM)
+
+    assert index.search(["anything"]) == [[]]
+    assert index.search([]) == []
+
+
+def test_block_search_matches_brute_force(tmp_path, monkeypatch):
+    rng = np.random.default_rng(7)
+    words = ["naval", "air", "space", "command", "systems", "security", "martin", "force", "sea", "army"]
+    texts = [" ".join(rng.choice(words, size=3)) + f" {row}" for row in range(500)]
+    index = VectorIndex(str(tmp_path / "index"), DIM)
+    index.add(list(range(500)), texts, [KIND_NAME] * 500)
+    index.save()
+    index.add([1000, 1001], ["naval air systems", "army space force"], [KIND_NAME, KIND_NAME])
+    monkeypatch.setattr(vector_index, "QUERY_BLOCK_SIZE", 64)
+
+    queries = ["naval systems command", "air force space", "security army"]
+    results = index.search(queries, k=3)
+
+    all_texts = texts + ["naval air systems", "army space force"]
+    expected = embed(all_texts, DIM).astype(np.float16).astype(np.float32) @ embed(queries, DIM).T
+    for column, matches in enumerate(results):
+        assert [match.score for match in matches] == pytest.approx(np.sort(expected[:, column])[::-1][:3], abs=1e-3)
+
+
+def test_delta_survives_reload(index, tmp_path):
+    _add(index, [(5, "Department of Homeland Security", KIND_NAME)])
+
+    reopened = VectorIndex.load(str(tmp_path / "index"))
+
+    assert len(reopened) == len(ACCOUNTS) + 1
+    assert reopened.search(["Homeland Security Dept"], k=1)[0][0].account_id == 5
+
+
+def test_compaction_keeps_every_row(index, tmp_path):
+    _add(index, [(5, "Department of Homeland Security", KIND_NAME)])
+    index.save()
+
+    reopened = VectorIndex.load(str(tmp_path / "index"))
+
+    assert len(reopened.delta_account_ids) == 0
+    assert len(reopened) == len(ACCOUNTS) + 1
+    assert reopened._text(len(ACCOUNTS)) == "Department of Homeland Security"
+
+
+def test_reload_picks_up_other_instance_writes(index, tmp_path):
+    other = VectorIndex.load(str(tmp_path / "index"))
+    _add(index, [(5, "Department of Homeland Security", KIND_NAME)])
+
+    other.reload_if_changed()
+
+    assert other.search(["Homeland Security Dept"], k=1)[0][0].account_id == 5
+
+
+def test_load_rejects_other_dimension(index, tmp_path):
+    with pytest.raises(ValueError):
+        VectorIndex.load(str(tmp_path / "index"), dim=DIM * 2)
+
+
+def test_writers_on_one_directory_keep_each_others_rows(index, tmp_path):
+    other = VectorIndex.load(str(tmp_path / "index"))
+
+    _add(index, [(5, "Department of Homeland Security", KIND_NAME)])
+    _add(other, [(6, "Defense Logistics Agency", KIND_NAME)])
+    _add(index, [(7, "Missile Defense Agency", KIND_ALIAS)])
+
+    reopened = VectorIndex.load(str(tmp_path / "index"))
+    assert len(reopened) == len(ACCOUNTS) + 3
+    assert sorted(reopened.delta_account_ids.tolist()) == [5, 6, 7]
+
+
+def test_concurrent_writers_lose_no_rows(index, tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "COMPACT_THRESHOLD", 25)
+    writers = [VectorIndex.load(str(tmp_path / "index")) for _ in range(2)]
+
+    def write(writer, offset):
+        for row in range(20):
+            writer.add([offset + row], [f"Account {offset + row}"], [KIND_NAME])
+
+    threads = [threading.Thread(target=write, args=(writer, 100 * (n + 1))) for n, writer in enumerate(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reopened = VectorIndex.load(str(tmp_path / "index"))
+    assert len(reopened) == len(ACCOUNTS) + 40
+    stored = set(np.asarray(reopened.account_ids).tolist()) | set(reopened.delta_account_ids.tolist())
+    assert set(range(100, 120)) | set(range(200, 220)) <= stored
+
+
+def test_unsaved_rows_survive_reload(index, tmp_path):
+    other = VectorIndex.load(str(tmp_path / "index"))
+    _add(index, [(5, "Department of Homeland Security", KIND_NAME)], persist=False)
+    _add(other, [(6, "Defense Logistics Agency", KIND_NAME)])
+
+    index.reload_if_changed()
+    assert sorted(index.delta_account_ids.tolist()) == [5, 6]
+
+    index.save()
+    assert len(VectorIndex.load(str(tmp_path / "index"))) == len(ACCOUNTS) + 2